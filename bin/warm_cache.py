@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prefetch |NUTS| and countries datasets from |GISCO| into the local cache, *e.g.*
+when provisioning a node, so that production traffic never hits a cold cache.
+
+    $ python warm_cache.py nuts country --year 2013 2016 --scale 01m 60m \
+          --proj 4326 3035 --level 0 1 2 3 --vector RG BN --budget 2G
+
+Run with :literal:`--help` for the list of options.
+"""
+
+import sys
+import argparse
+
+from happygisco import services
+from happygisco import happyError
+
+UNITS       = {'K': 2**10, 'M': 2**20, 'G': 2**30, 'T': 2**40}
+
+def parse_size(size):
+    # parse a number of bytes, possibly with a unit suffix: 500M, 2G, ...
+    size = size.strip().upper().rstrip('B')
+    if size and size[-1] in UNITS:
+        return int(float(size[:-1]) * UNITS[size[-1]])
+    return int(size)
+
+def parse_int(value):
+    # parse integer dimensions (years, projections, levels) as integers
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Prefetch GISCO datasets into the local cache.')
+    parser.add_argument('data', nargs='*', metavar='{nuts,country}',
+                        help='type(s) of datasets to prefetch (default: both)')
+    parser.add_argument('--source', help='source of the datasets, e.g. NUTS, BULK, INFO or NUTS2JSON')
+    parser.add_argument('--year', nargs='+', type=int, help='year(s) of the datasets')
+    parser.add_argument('--scale', nargs='+', help='scale(s) of the datasets, e.g. 01m 60m')
+    parser.add_argument('--proj', nargs='+', type=parse_int, help='projection(s) of the datasets, e.g. 4326 3035')
+    parser.add_argument('--level', nargs='+', type=parse_int, help='NUTS level(s) of the datasets')
+    parser.add_argument('--vector', nargs='+', help='vector type(s) of the datasets, e.g. RG BN LB')
+    parser.add_argument('--ifmt', nargs='+', help='format(s) of the datasets, e.g. geojson shp')
+    parser.add_argument('--cache', help='cache directory (default: the cache of the package)')
+    parser.add_argument('--budget', type=parse_size, help='maximum volume downloaded, e.g. 500M or 2G')
+    parser.add_argument('--workers', type=int, help='number of concurrent downloads')
+    parser.add_argument('--force', action='store_true', help='download the datasets even when they are cached')
+    args = parser.parse_args(argv)
+    # the types are checked here: argparse checks an empty positional list (or
+    # its default) against the choices, and would reject it
+    args.data = args.data or ['nuts', 'country']
+    if not set(args.data).issubset(('nuts', 'country')):
+        parser.error('invalid type(s) of datasets: %s' % ' '.join(args.data))
+
+    kwargs = {'cache_store': args.cache or True,
+              'budget': args.budget,
+              '_force_download_': args.force}
+    for dim in ('source', 'year', 'scale', 'proj', 'level', 'vector', 'ifmt'):
+        if getattr(args, dim) is not None:
+            kwargs.update({dim: getattr(args, dim)})
+    def progress(done, total, url, nbytes):
+        print('[%s/%s] %s (%s bytes)' % (done, total, url, nbytes))
+    kwargs.update({'progress': progress})
+
+    serv = services.GISCOService(**({'max_workers': args.workers} if args.workers else {}))
+    try:
+        report = serv.warm_cache(*args.data, **kwargs)
+    except happyError as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        serv.close()
+    print('\n%s fetched (%s bytes), %s already cached, %s failed, %s skipped' %        \
+          (len(report['fetched']), report['bytes'], len(report['cached']),
+           len(report['failed']), len(report['skipped'])))
+    for url in report['failed']:
+        print('failed: %s' % url, file=sys.stderr)
+    return 0 if report['failed'] == [] else 2
+
+if __name__ == '__main__':
+    sys.exit(main())
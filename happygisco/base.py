@@ -48,7 +48,7 @@ sake of an exhaustive documentation.
 
 **Dependencies**
 
-*require*:      :mod:`os`, :mod:`sys`, :mod:`io`, :mod:`asyncio`, :mod:`itertools`, :mod:`functools`, :mod:`collections`, :mod:`time`, :mod:`hashlib`, :mod:`zipfile`, :mod:`copy`, :mod:`json`
+*require*:      :mod:`os`, :mod:`sys`, :mod:`io`, :mod:`asyncio`, :mod:`threading`, :mod:`contextlib`, :mod:`weakref`, :mod:`concurrent.futures`, :mod:`itertools`, :mod:`functools`, :mod:`collections`, :mod:`bisect`, :mod:`time`, :mod:`random`, :mod:`hashlib`, :mod:`email`, :mod:`tarfile`, :mod:`zipfile`, :mod:`copy`, :mod:`pickle`, :mod:`mmap`, :mod:`json`
 
 *optional*:     :mod:`datetime`, :mod:`requests`,  :mod:`requests_cache`,  :mod:`cachecontrol`, :mod:`aiohttp`, :mod:`aiofiles`, :mod:`chardet`, :mod:`zipstream` 
 
@@ -69,16 +69,26 @@ __all__         = ['_Service', '_Feature', '_Tool', '_Decorator', '_NestedDict']
 
 # import modules from Python Standard Library
 import os, sys, io
-import itertools, functools, collections
+import itertools, functools, collections, bisect
 import inspect
 import asyncio
+import threading, contextlib, weakref
+import concurrent.futures
 
-import time
+import time, random
 import hashlib, urllib
-import shutil
+import email.utils
+import shutil, tempfile, mmap, tarfile
 import copy, zipfile
+import pickle
 #import abc
 
+try:
+    import fcntl
+except ImportError:
+    # no lock between processes on non-POSIX systems
+    fcntl = None
+
 # local (absolute) imports
 from happygisco import happyVerbose, happyWarning, happyError, happyType, happyDeprecated
 from happygisco import REDUCE_ANSWER, EXCLUSIVE_ARGUMENTS
@@ -99,13 +109,17 @@ try:
     import aiohttp
 except:
     ASYNCIO_AVAILABLE = False
+    AIOHTTP_INSTALLED = False
     happyWarning("missing AIOHTTP package (visit https://github.com/aio-libs/aiohttp)", ImportWarning)
     class aiohttp():
         class ClientResponse():
             pass
+        class ClientSession():
+            pass
 else:
     SERVICE_AVAILABLE = True                
     ASYNCIO_AVAILABLE = True
+    AIOHTTP_INSTALLED = True
     happyVerbose('AIOHTTP help: https://aiohttp.readthedocs.io/en/latest/')
     try:
         import aiofiles
@@ -114,6 +128,8 @@ else:
     else:
         happyWarning("missing AIOFILES package (visit https://pypi.org/project/aiofiles/)", ImportWarning)
   
+# requests are sent with requests by default; the asynchronous implementation 
+# is selected per service (see _Service.asynchronous) when aiohttp is installed
 ASYNCIO_AVAILABLE = False
 
 try:                
@@ -184,6 +200,14 @@ else:
     CHARDET_INSTALLED = True
     happyVerbose('CHARDET help: https://chardet.readthedocs.io/en/latest')
 
+try:                                
+    import sqlite3
+except ImportError:  
+    SQLITE_INSTALLED = False
+    happyWarning("missing SQLITE3 module in Python Standard Library", ImportWarning)
+else:
+    SQLITE_INSTALLED = True
+
 #%%
 #==============================================================================
 # CLASS _Decorator
@@ -199,6 +223,22 @@ class _Decorator(object):
     
     # session/service parameters
     KW_SESSION      = 'session'
+    KW_IN_FLIGHT    = 'max_in_flight'
+    KW_PER_HOST     = 'max_per_host'
+    KW_RATE_LIMIT   = 'rate_limit'
+    KW_WORKERS      = 'max_workers'
+    KW_ASYNC        = 'asynchronous'
+    KW_RETRY        = 'retry'
+    KW_BACKOFF      = 'backoff'
+    KW_HEDGE        = 'hedge'
+    KW_CACHE_SIZE   = 'max_cache_size'
+    KW_CACHE_ENTRIES= 'max_cache_entries'
+    KW_DECODED      = 'cache_decoded'
+    KW_STALE        = 'stale_while_revalidate'
+    KW_NEGATIVE     = 'expire_negative'
+    KW_BUDGET       = 'budget'
+    KW_PROGRESS     = 'progress'
+    KW_PREFETCH     = 'prefetch'
     KW_CACHING      = '_caching_'
     KW_CACHE        = 'cache_store'
     KW_EXPIRE       = 'expire_after'
@@ -1960,483 +2000,3374 @@ class _Decorator(object):
 
 #%%
 #==============================================================================
-# CLASS _CachedResponse
-#==============================================================================
-
-try:
-    assert SERVICE_AVAILABLE is True
-except:
-    class _CachedResponse(object):
-        #doc-ignore
-        pass 
-else:
-    class _CachedResponse(requests.Response):
-        """Generic class used for representing a cached response.
-            
-            >>> resp = base._CachedResponse(resp, url, path='')
-        """ 
-        # why not derive this class from aiohttp.ClientResponse in the case
-        # ASYNCIO_AVAILABLE is True? actually, we refer here to aiohttp doc,
-        # namely http://docs.aiohttp.org/en/stable/client_reference.html:
-        #   "User never creates the instance of ClientResponse class but gets 
-        #   it from API calls"
-        __attrs__ = requests.Response.__attrs__ + ['_cache_path', 'cache_store']
-        def __init__(self, *args, **kwargs):
-            r, url = args
-            path = kwargs.pop('path','')
-            try:
-                assert happyType.isstring(url) and happyType.isstring(path) \
-                    and isinstance(r,(bytes,requests.Response,aiohttp.ClientResponse))
-            except:
-                raise happyError('parsed initialising parameters not recognised')
-            super(_CachedResponse,self).__init__()
-            self.url = url
-            self._cache_path = self.cache_store = path
-            if isinstance(r,bytes):
-                self.reason, self.status_code = "OK", 200
-                self._content, self._content_consumed = r, True           
-            elif isinstance(r,(requests.Response,aiohttp.ClientResponse)):
-                # self.__response = r
-                for attr in r.__dict__:
-                    setattr(self, attr, getattr(r, attr))
-            # self._encoding = ?
-        def __repr__(self):
-            return '<Response [%s]>' % (self.status_code)
-                 
-#%%
-#==============================================================================
-# CLASS _Service
+# CLASS _Scheduler
 #==============================================================================
 
-class _Service(object):
-    """Base class for web-based geospatial services.
+class _Scheduler(object):
+    """Class used to schedule the requests sent by a web-service so as to limit
+    the concurrency and the rate of the requests.
     
-    This class is used to defined a web-session and simple connection operations 
-    called by a web-service. 
+        >>> sched = base._Scheduler(**kwargs)
+            
+    Keyword arguments
+    -----------------
+    max_in_flight : int
+        maximum number of requests simultaneously in flight, whatever the host;
+        default: :data:`settings.DEF_MAX_IN_FLIGHT`; when set to :data:`None`
+        or 0, no limit is applied.
+    max_per_host : int
+        maximum number of concurrent requests sent to a same host; default: 
+        :data:`settings.DEF_MAX_PER_HOST`; when set to :data:`None` or 0, no
+        limit is applied.
+    rate_limit : float,dict
+        maximum number of requests per second sent to any host, or dictionary
+        of such rates indexed by host names; default: :data:`settings.HOST_RATE_LIMITS`.
+    burst : int
+        number of requests that can be sent at once to a rate limited host;
+        default: :data:`settings.DEF_RATE_BURST`.
         
-       >>> serv = base._Service()        
+    Note
+    ----
+    Rate limits are implemented through token buckets: every request consumes 
+    a token and the tokens are refilled at the rate of the host.
     """
     
-    RESPONSE_FORMATS = ['resp', 'zip', 'raw', 'text', 'stringio', 'content', 'bytes', 'bytesio', 'json']
-    ZIP_OPERATIONS  = ['extract', 'extractall', 'getinfo', 'namelist', 'read', 'infolist']
-    
     #/************************************************************************/
     def __init__(self, **kwargs):
-        self.__session           = None
-        self.__cache_store       = True
-        self.__expire_after      = None # datetime.deltatime(0)
-        self.__cache_backend     = None
-        # update with keyword arguments passed
-        if kwargs != {}:
-            attrs = (_Decorator.KW_CACHE,_Decorator.KW_EXPIRE,_Decorator.KW_FORCE)
-            for attr in list(set(attrs).intersection(kwargs.keys())):
-                setattr(self, '%s' % attr, kwargs.pop(attr))
-        # determine appropriate setting for a given session, taking into account
-        # the explicit setting on that request, and the setting in the session. 
-        self.__cache_backend = 'File'
-        if isinstance(self.__cache_store, bool):
-            self.__cache_store = self.__default_cache() if self.cache_store else None
-        # determine appropriate setting for a given session, taking into account
-        # the explicit setting on that request, and the setting in the session.
-        if ASYNCIO_AVAILABLE is False:            
-            try:
-                # whether requests_cache is defined or not, no matter
-                self.__session = requests.Session()
-                # session = requests.session(**kwargs)
-            except:
-                raise happyError('wrong requests setting - SESSION not initialised')
-            if CACHECONTROL_INSTALLED is True and self.cache_store is not None:
-                try:
-                    if self.expire_after is None or int(self.expire_after) > 0:
-                        cache_store = FileCache(os.path.abspath(self.cache_store))  
-                    else:
-                        cache_store = FileCache(os.path.abspath(self.cache_store), forever=True)
-                except:
-                    pass
-                else:
-                    self.__session = CacheControl(self.session, cache_store)
-            try:
-                assert self.session is not None
-            except:
-                raise happyError('wrong definition for SESSION parameters - SESSION not initialised')
-        else:
-            self.__session = None
-        
+        self.__max_in_flight    = kwargs.pop(_Decorator.KW_IN_FLIGHT, settings.DEF_MAX_IN_FLIGHT) or 0
+        self.__max_per_host     = kwargs.pop(_Decorator.KW_PER_HOST, settings.DEF_MAX_PER_HOST) or 0
+        self.__rate_limit       = kwargs.pop(_Decorator.KW_RATE_LIMIT, settings.HOST_RATE_LIMITS) or {}
+        self.__burst            = kwargs.pop('burst', settings.DEF_RATE_BURST) or 1
+        try:
+            assert all([isinstance(n, int) and n >= 0 for n in (self.__max_in_flight, self.__max_per_host, self.__burst)])
+        except:
+            raise happyError('wrong value for %s or %s parameters' % (_Decorator.KW_IN_FLIGHT.upper(),_Decorator.KW_PER_HOST.upper()))
+        try:
+            assert isinstance(self.__rate_limit, (int, float)) or happyType.ismapping(self.__rate_limit)
+        except:
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_RATE_LIMIT.upper())
+        self.__lock             = threading.Lock()
+        self.__in_flight        = threading.BoundedSemaphore(self.__max_in_flight) if self.__max_in_flight else None
+        self.__per_host         = {}
+        self.__buckets          = {}
+        # asynchronous semaphores are bound to the loop they are used in
+        self.__aio_semaphores   = weakref.WeakKeyDictionary()
+
     #/************************************************************************/
     @property
-    def session(self):
-        """Session property (:data:`getter`/:data:`setter`) of an instance of
-        a class :class:`_Service`. :data:`session` is itself an instance of a
-        :class:`requests.session.Session` class.
-        """ # A session type is :class:`requests.session.Session`.
-        return self.__session
-    @session.setter#analysis:ignore
-    def session(self, session):
-        if session is not None and not isinstance(session, requests.sessions.Session, aiohttp.client.ClientSession):
-            raise happyError('wrong type for SESSION parameter')
-        self.__session = session
+    def max_in_flight(self):
+        """Maximum number of requests simultaneously in flight.
+        """
+        return self.__max_in_flight
     
-    #/************************************************************************/
     @property
-    def cache_store(self):
-        """Cache property (:data:`getter`/:data:`setter`) of an instance of
-        a class :class:`_Service`. :data:`cache_store` is set to the physical 
-        location (*i.e.* on the drive) of the repository used to cache the 
-        downloaded datasets/responses.
+    def max_per_host(self):
+        """Maximum number of concurrent requests sent to a same host.
         """
-        return self.__cache_store
-    @cache_store.setter
-    def cache_store(self, cache_store):
-        if not(cache_store is None or isinstance(cache_store, (str,bool))):
-            raise happyError('wrong type for %s parameter' % _Decorator.KW_CACHE.upper())
-        else:
-            #if cache_store not in (False,'',None) and requests_cache is None and CACHECONTROL_INSTALLED is False:
-            #    raise happyError('caching not supported in the absence of modules requests_cache and cachecontrol')                
-            pass
-        self.__cache_store = cache_store
+        return self.__max_per_host
+
+    #/************************************************************************/
+    @staticmethod
+    def host(url):
+        """Return the host (network location) targeted by a URL.
+        
+            >>> host = _Scheduler.host(url)
+        """
+        try:
+            return urllib.parse.urlsplit(url).netloc.lower()
+        except:
+            return ''
+        
+    #/************************************************************************/
+    def rate(self, host):
+        """Return the maximum number of requests per second allowed on a host, 
+        or :data:`None` when requests to the host are not rate limited.
+        
+            >>> rate = sched.rate(host)
+        """
+        if isinstance(self.__rate_limit, (int, float)):
+            return self.__rate_limit or None
+        return self.__rate_limit.get(host) or self.__rate_limit.get(host.split(':')[0]) or None
+
+    #/************************************************************************/
+    def __reserve(self, host):
+        # consume a token in the bucket of the host and return the time to wait
+        # before the request can be sent; the bucket is allowed to go negative 
+        # so that concurrent callers are queued in order of arrival
+        rate = self.rate(host)
+        if rate is None:
+            return 0
+        with self.__lock:
+            now = time.time()
+            tokens, last = self.__buckets.get(host, (self.__burst, now))
+            tokens = min(self.__burst, tokens + (now - last) * rate) - 1
+            self.__buckets[host] = (tokens, now)
+        return 0 if tokens >= 0 else - tokens / rate
+
+    #/************************************************************************/
+    def __host_semaphore(self, host):
+        if not self.__max_per_host:
+            return None
+        with self.__lock:
+            if host not in self.__per_host:
+                self.__per_host[host] = threading.BoundedSemaphore(self.__max_per_host)
+            return self.__per_host[host]
     
     #/************************************************************************/
-    @property
-    def cache_backend(self):
-        return self.__cache_backend
-    # note: no setter ... 
+    @contextlib.contextmanager
+    def slot(self, url):
+        """Context manager that blocks until a request to a given URL can be sent
+        according to the concurrency and rate limits of the scheduler.
+        
+            >>> with sched.slot(url):
+                    response = session.get(url)
+        """
+        host = self.host(url)
+        semaphores = [sem for sem in (self.__in_flight, self.__host_semaphore(host)) if sem is not None]
+        for sem in semaphores:
+            sem.acquire()
+        try:
+            delay = self.__reserve(host)
+            if delay > 0:
+                happyVerbose('request to %s delayed by %.3fs (rate limit)' % (host, delay))
+                time.sleep(delay)
+            yield
+        finally:
+            for sem in semaphores[::-1]:
+                sem.release()
+    
+    #/************************************************************************/
+    def __aio_host_semaphores(self, host):
+        loop = asyncio.get_event_loop()
+        if loop not in self.__aio_semaphores:
+            self.__aio_semaphores[loop] = (asyncio.Semaphore(self.__max_in_flight) if self.__max_in_flight else None, {})
+        in_flight, per_host = self.__aio_semaphores[loop]
+        if self.__max_per_host and host not in per_host:
+            per_host[host] = asyncio.Semaphore(self.__max_per_host)
+        return [sem for sem in (in_flight, per_host.get(host)) if sem is not None]
 
     #/************************************************************************/
-    @property
-    def expire_after(self):
-        """Expiration property (:data:`getter`/:data:`setter`) of an instance of
-        a class :class:`_Service`. :data:`expire_after` represents the time after
-        which datasets downloaded and cached through this instance shall be 
-        downloaded again.
+    @contextlib.asynccontextmanager
+    async def aslot(self, url):
+        """Asynchronous version of :meth:`~_Scheduler.slot`.
+        
+            >>> async with sched.aslot(url):
+                    response = await session.get(url)
         """
-        return self.__expire_after
-    @expire_after.setter
-    def expire_after(self, expire_after):
-        if expire_after is None or isinstance(expire_after, (int, datetime.timedelta)) \
-                and (int(expire_after)>=0 or expire_after==-1):
-            self.__expire_after = expire_after
-        elif not isinstance(expire_after, (int, datetime.timedelta)):
-            raise happyError('wrong type for %s parameter' % _Decorator.KW_EXPIRE.upper())
-        #elif isinstance(expire_after, int) and expire_after<0:
-        #    raise happyError('wrong time setting for %s parameter' % _Decorator.KW_EXPIRE.upper())
+        host = self.host(url)
+        semaphores = self.__aio_host_semaphores(host)
+        for sem in semaphores:
+            await sem.acquire()
+        try:
+            delay = self.__reserve(host)
+            if delay > 0:
+                happyVerbose('request to %s delayed by %.3fs (rate limit)' % (host, delay))
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            for sem in semaphores[::-1]:
+                sem.release()
+
+#%%
+#==============================================================================
+# CLASS _Retry
+#==============================================================================
+
+class _Retry(object):
+    """Class used to define the policy applied when retrying the requests sent
+    by a web-service that failed transiently, and when hedging slow requests.
+    
+        >>> retry = base._Retry(**kwargs)
+            
+    Keyword arguments
+    -----------------
+    retry : int,dict,bool
+        maximum number of retries, indexed by HTTP status codes and exception
+        classes (or names of exception classes); when an integer is passed, it
+        is used for all statuses and exceptions of the default policy; when set
+        to :data:`False`, 0 or :data:`None`, requests are never retried; default:
+        :data:`settings.RETRY_POLICY`.
+    backoff : float
+        base delay (in seconds) of the exponential backoff between retries; 
+        default: :data:`settings.DEF_RETRY_BACKOFF`.
+    max_backoff : float
+        maximum delay (in seconds) between two retries; default: 
+        :data:`settings.DEF_RETRY_MAX_BACKOFF`.
+    hedge : bool
+        flag set to send a duplicate of the requests that are not answered after
+        the :data:`settings.HEDGE_QUANTILE` latency observed on their host; 
+        default: :data:`settings.DEF_HEDGE`.
         
-    #/************************************************************************/   
-    def __get_status(self, url):
-        # sequential implementation of get_status
+    Note
+    ----
+    The delay before the :literal:`n`-th retry is drawn uniformly between 0 and
+    :literal:`min(max_backoff, backoff * 2**n)` (*i.e.*, exponential backoff with
+    full jitter), unless the server specifies a :literal:`Retry-After` delay.
+    """
+    
+    #/************************************************************************/
+    def __init__(self, **kwargs):
+        policy                  = kwargs.pop(_Decorator.KW_RETRY, settings.RETRY_POLICY) 
+        if policy is True:
+            policy = settings.RETRY_POLICY
+        elif policy in (False,None):
+            policy = {}
+        elif isinstance(policy, int):
+            policy = {k: policy for k in settings.RETRY_POLICY}
+        self.__backoff          = kwargs.pop(_Decorator.KW_BACKOFF, settings.DEF_RETRY_BACKOFF)
+        self.__max_backoff      = kwargs.pop('max_backoff', settings.DEF_RETRY_MAX_BACKOFF)
+        self.__hedge            = kwargs.pop(_Decorator.KW_HEDGE, settings.DEF_HEDGE)
         try:
-            response = self.session.head(url)
-        except requests.ConnectionError:
-            raise happyError('connection failed - a Connection error occurred')  
-        except requests.HTTPError:
-            raise happyError('request failed - an HTTP error occurred.')  
-        else:
-            status = response.status_code
+            assert happyType.ismapping(policy) \
+                and all([isinstance(n, int) and n >= 0 for n in policy.values()])
+        except:
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_RETRY.upper())
         try:
-            name = settings.HTTP_ERROR_STATUS[status]['name']
-            desc = settings.HTTP_ERROR_STATUS[status]['desc']
-        except KeyError:
-            name = desc = 'Unknown error'#analysis:ignore
-        happyVerbose('response status from web-service: %s ("%s")' % (status,name))
+            assert all([isinstance(t, (int,float)) and t >= 0 for t in (self.__backoff, self.__max_backoff)])
+        except:
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_BACKOFF.upper())
         try:
-            response.raise_for_status()
+            assert isinstance(self.__hedge, bool)
         except:
-            raise happyError('wrong request - %s status ("%s") returned' % (status,name))  
-        else:
-            response.close()
-        return status
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_HEDGE.upper())
+        self.__statuses         = {k: n for (k,n) in policy.items() if isinstance(k, int)}
+        self.__exceptions       = {k: n for (k,n) in policy.items() if not isinstance(k, int)}
+        self.__lock             = threading.Lock()
+        self.__latencies        = {}
 
     #/************************************************************************/
-    async def __aio_get_status(self, session, url):
-        # asynchronous implementation of get_status
+    @property
+    def hedge(self):
+        """Flag set to hedge slow requests.
+        """
+        return self.__hedge
+
+    #/************************************************************************/
+    def retries(self, cause):
+        """Return the maximum number of retries allowed for a given cause of 
+        failure, *i.e.* either an HTTP status code or an exception.
+        
+            >>> n = retry.retries(cause)
+        """
+        if isinstance(cause, int):
+            return self.__statuses.get(cause, 0)
+        for exc, n in self.__exceptions.items():
+            if (isinstance(exc, type) and isinstance(cause, exc))           \
+                    or any([c.__name__ == exc for c in type(cause).__mro__]):
+                return n
+        return 0
+
+    #/************************************************************************/
+    def delay(self, cause, attempt, response=None):
+        """Return the delay (in seconds) to wait before retrying a request that 
+        failed with a given cause after a given number of attempts, or :data:`None`
+        when the request shall not be retried.
+        
+            >>> delay = retry.delay(cause, attempt, response=None)
+        """
+        if attempt >= self.retries(cause):
+            return None
+        after = self.retry_after(response)
+        if after is not None:
+            return after if after <= settings.DEF_RETRY_AFTER_MAX else None
+        return random.uniform(0, min(self.__max_backoff, self.__backoff * 2**attempt))
+
+    #/************************************************************************/
+    @staticmethod
+    def retry_after(response):
+        """Return the delay (in seconds) requested by the :literal:`Retry-After`
+        header of a response, if any.
+        
+            >>> delay = _Retry.retry_after(response)
+        """
         try:
-            response = await session.head(url)
-        except Exception as e: # aiohttp.ClientConnectionError:
-            raise happyError('connection failed', errtype=e)  
-        else: 
-            status = response.status
+            after = response.headers.get('Retry-After')
+            assert after is not None
+        except:
+            return None
         try:
-            name = settings.HTTP_ERROR_STATUS[status]['name']
-            desc = settings.HTTP_ERROR_STATUS[status]['desc']
-        except KeyError:
-            name = desc = 'Unknown error'#analysis:ignore
-        happyVerbose('response status from web-service: %s ("%s")' % (status,name))
-        async with response:
-            try:
-                response.raise_for_status()
-            except:
-                raise happyError('wrong request - %s status ("%s") returned' % (status,name))  
-                #happyVerbose('response status from web-service: %s' % status)
-        return status
-        
-    #/************************************************************************/ 
-    @_Decorator.parse_url
-    def get_status(self, *url, **kwargs):
-        """Retrieve the header of a URL and return the server's status code.
+            return max(float(after), 0)
+        except ValueError:
+            pass
+        try:
+            return max(email.utils.parsedate_to_datetime(after).timestamp() - time.time(), 0)
+        except:
+            return None
+
+    #/************************************************************************/
+    def observe(self, host, latency):
+        """Record the latency (in seconds) of a request sent to a given host.
         
-            >>> status = serv.get_status(*url)
-            
-        Arguments
-        ---------
-        url : str
-            complete URL name(s) whom status will be checked.
+            >>> retry.observe(host, latency)
+        """
+        with self.__lock:
+            if host not in self.__latencies:
+                self.__latencies[host] = collections.deque(maxlen=settings.HEDGE_WINDOW)
+            self.__latencies[host].append(latency)
+
+    #/************************************************************************/
+    def threshold(self, host):
+        """Return the delay (in seconds) after which a request sent to a given 
+        host is hedged, or :data:`None` when requests are not hedged.
         
-        Returns
+            >>> delay = retry.threshold(host)
+        """
+        if self.__hedge is False:
+            return None
+        with self.__lock:
+            latencies = sorted(self.__latencies.get(host, []))
+        if len(latencies) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[min(int(settings.HEDGE_QUANTILE * len(latencies)), len(latencies)-1)]
+
+#%%
+#==============================================================================
+# CLASS _RemoteFile
+#==============================================================================
+
+class _RemoteFile(io.RawIOBase):
+    """Read-only file-like object giving random access to a remote file through 
+    HTTP range requests.
+        
+        >>> f = base._RemoteFile(request, url, size, validator=None)
+        
+    Arguments
+    ---------
+    request : callable
+        function used to send the GET requests, *e.g.* :meth:`requests.Session.get`.
+    url : str
+        URL of the remote file.
+    size : int
+        size of the remote file (in bytes).
+        
+    Keyword arguments
+    -----------------
+    validator : str
+        validator (:literal:`ETag` or :literal:`Last-Modified` value) of the 
+        remote file, used to check that it is not modified while being read.
+        
+    Note
+    ----
+    Every request fetches a block ahead of the position read (or up to the end
+    of the file), starting with :data:`settings.REMOTE_ZIP_BLOCK_SIZE` bytes: the 
+    size of the blocks doubles as long as the file is read sequentially, and is
+    reset on random accesses. 
+    A known range (*e.g.*, a member of a zip archive) can also be fetched at 
+    once with :meth:`~_RemoteFile.preload`.
+    """
+    
+    #/************************************************************************/
+    def __init__(self, request, url, size, validator=None):
+        super(_RemoteFile,self).__init__()
+        self.__request      = request
+        self.__validator    = validator
+        self.__pos          = 0
+        self.__block        = settings.REMOTE_ZIP_BLOCK_SIZE
+        self.__buffer       = (0, b'') # offset and content of the last block fetched
+        self.url, self.size = url, size
+        self.transferred    = 0 # number of bytes actually downloaded
+        
+    #/************************************************************************/
+    def readable(self):
+        return True
+        
+    def seekable(self):
+        return True
+        
+    def tell(self):
+        return self.__pos
+        
+    #/************************************************************************/
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self.__pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise happyError('wrong value for WHENCE argument')
+        try:
+            assert pos >= 0
+        except:
+            raise happyError('negative seek position')
+        self.__pos = pos
+        return pos
+        
+    #/************************************************************************/
+    def readinto(self, b):
+        n = min(len(b), self.size - self.__pos)
+        if n <= 0:
+            return 0
+        start, buf = self.__buffer
+        if not start <= self.__pos < start + len(buf):
+            # grow the blocks while the file is read sequentially; otherwise, 
+            # close to the end of the file, the block ends with the file, so 
+            # that the trailing records of an archive are fetched at once
+            if buf != b'' and self.__pos == start + len(buf):
+                self.__block *= 2
+                start = self.__pos
+            else:
+                self.__block = settings.REMOTE_ZIP_BLOCK_SIZE
+                start = max(min(self.__pos, self.size - max(n, self.__block)), 0)
+            self.__fetch(start, start + max(n, self.__block))
+            start, buf = self.__buffer
+        data = buf[self.__pos - start : self.__pos - start + n]
+        b[:len(data)] = data
+        self.__pos += len(data)
+        return len(data)
+        
+    #/************************************************************************/
+    def preload(self, start, end):
+        """Fetch a range of the remote file in one single request, unless it 
+        has been fetched already, so that it is then read from memory.
+        
+            >>> f.preload(start, end)
+            
+        Arguments
+        ---------
+        start, end : int
+            first position and end (excluded) of the range.
+        """
+        offset, buf = self.__buffer
+        if not (offset <= start and min(end, self.size) <= offset + len(buf)):
+            self.__fetch(start, end)
+
+    #/************************************************************************/
+    def __fetch(self, start, end):
+        # fetch the range [start, end) of the remote file into the buffer
+        end = min(end, self.size)
+        headers = {'Range': 'bytes=%s-%s' % (start, end - 1)}
+        if self.__validator is not None:
+            headers.update({'If-Range': self.__validator})
+        response = self.__request(self.url, headers=headers, stream=True)
+        try:
+            assert response.status_code == 206
+        except:
+            response.close()
+            raise happyError('range request on %s not satisfied - remote file possibly modified' % self.url)
+        data = response.content[:end - start]
+        self.__buffer = (start, data)
+        self.transferred += len(data)
+
+#%%
+#==============================================================================
+# CLASS _MappedFile
+#==============================================================================
+
+class _MappedFile(mmap.mmap):
+    """Read-only memory map of a file, usable as a file-like object.
+        
+        >>> with open(path, 'rb') as f:
+        ...     mf = base._MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    The content of the file is left in the page cache: it is not copied into
+    memory unless it is sliced or read.
+    """
+    # mmap provides read/seek/tell but not the other methods of io.IOBase 
+    # used by zipfile
+    def readable(self):
+        return True
+    def seekable(self):
+        return True
+    def writable(self):
+        return False
+
+#%%
+#==============================================================================
+# CLASS _Stats
+#==============================================================================
+
+class _Stats(object):
+    """Class implementing thread-safe counters of the activity of the caches and
+    of the network, *e.g.* to size the caches and tune their expiration from
+    actual figures.
+    
+        >>> stats = base._Stats(parent=None)
+            
+    Keyword arguments
+    -----------------
+    parent : _Stats
+        counters every update is also added to, *e.g.* the counters aggregated 
+        over the whole process (see :meth:`~_Stats.process`).
+        
+    Note
+    ----
+    The following counters are kept:
+    
+    * :literal:`memory_hits`, :literal:`memory_misses`: responses found (or not)
+      in the in-memory cache,
+    * :literal:`disk_hits`, :literal:`disk_misses`: responses found (or not) in
+      the on-disk cache, including the pack file,
+    * :literal:`network_requests`, :literal:`network_errors`: requests sent, and
+      among them those which failed or were answered with an error status,
+    * :literal:`bytes_read`, :literal:`bytes_written`: volume of the responses
+      served from the caches, and downloaded into the on-disk cache,
+    * :literal:`revalidations`: expired responses revalidated by the server,
+    * :literal:`evictions`: entries evicted from the in-memory and on-disk caches;
+      these caches being shared, evictions are only counted over the process,
+      
+    together with a histogram of the latencies of the requests per host, whose
+    buckets are bounded by :data:`settings.STATS_LATENCY_BUCKETS`.
+    """
+    
+    COUNTERS    = ['memory_hits', 'memory_misses', 'disk_hits', 'disk_misses', 
+                   'network_requests', 'network_errors', 'bytes_read', 'bytes_written', 
+                   'revalidations', 'evictions']
+    
+    __process   = None
+    __plock     = threading.Lock()
+    
+    #/************************************************************************/
+    @classmethod
+    def process(cls):
+        """Return the counters aggregated over the process, creating them the 
+        first time.
+        """
+        with cls.__plock:
+            if cls.__process is None:
+                cls.__process = cls()
+            return cls.__process
+
+    #/************************************************************************/
+    def __init__(self, parent=None):
+        self.__parent           = parent
+        self.__lock             = threading.Lock()
+        self.__counters         = dict.fromkeys(self.COUNTERS, 0)
+        self.__latencies        = {} # host: [count, total, buckets]
+    
+    #/************************************************************************/
+    def count(self, counter, n=1):
+        """Increment a counter.
+        
+            >>> stats.count(counter, n=1)
+        """
+        with self.__lock:
+            self.__counters[counter] += n
+        if self.__parent is not None:
+            self.__parent.count(counter, n)
+
+    #/************************************************************************/
+    def observe(self, host, latency, error=False):
+        """Record a request sent to a given host, its latency (in seconds) and 
+        whether it failed.
+        
+            >>> stats.observe(host, latency, error=False)
+        """
+        bounds = settings.STATS_LATENCY_BUCKETS
+        with self.__lock:
+            self.__counters['network_requests'] += 1
+            self.__counters['network_errors'] += 1 if error else 0
+            if host not in self.__latencies:
+                self.__latencies[host] = [0, 0., [0] * (len(bounds) + 1)]
+            entry = self.__latencies[host]
+            entry[0] += 1
+            entry[1] += latency
+            entry[2][bisect.bisect_left(bounds, latency)] += 1
+        if self.__parent is not None:
+            self.__parent.observe(host, latency, error)
+
+    #/************************************************************************/
+    def snapshot(self):
+        """Return a copy of the counters, together with the histograms of the
+        latencies per host.
+        
+            >>> counters = stats.snapshot()
+        """
+        with self.__lock:
+            counters = dict(self.__counters)
+            counters.update({'latency': {host: {'count': e[0], 'total': e[1], 
+                                                'buckets': list(zip(settings.STATS_LATENCY_BUCKETS + [None], e[2]))} 
+                                         for (host, e) in self.__latencies.items()}})
+        return counters
+
+    #/************************************************************************/
+    def reset(self):
+        """Reset all counters (the aggregated counters are left unchanged).
+        """
+        with self.__lock:
+            self.__counters = dict.fromkeys(self.COUNTERS, 0)
+            self.__latencies = {}
+
+#%%
+#==============================================================================
+# CLASS _MemoryCache
+#==============================================================================
+
+class _MemoryCache(object):
+    """Class implementing a thread-safe in-memory cache of responses, bounded by 
+    the total size of the cached contents and with LRU eviction.
+    
+        >>> cache = base._MemoryCache(max_size=None)
+            
+    Keyword arguments
+    -----------------
+    max_size : int
+        maximum size (in bytes) of the cached contents; entries larger than a 
+        quarter of this size are never cached; default: :data:`settings.DEF_MEMORY_CACHE_SIZE`;
+        when set to 0, nothing is cached.
+        
+    Note
+    ----
+    Every entry stores the content of a response together with its time of 
+    download (or revalidation), so that its freshness can be checked against
+    an expiration time without accessing the disk.
+    """
+    
+    #/************************************************************************/
+    def __init__(self, max_size=None):
+        self.__lock             = threading.Lock()
+        self.__entries          = collections.OrderedDict()
+        self.__size             = 0
+        self.__max_size         = 0
+        self.max_size           = settings.DEF_MEMORY_CACHE_SIZE if max_size is None else max_size
+
+    #/************************************************************************/
+    @property
+    def max_size(self):
+        """Maximum size (in bytes) of the cached contents (:data:`getter`/:data:`setter`).
+        """
+        return self.__max_size
+    @max_size.setter#analysis:ignore
+    def max_size(self, max_size):
+        if not isinstance(max_size, int) or max_size < 0:
+            raise happyError('wrong type/value for MAX_SIZE parameter')
+        with self.__lock:
+            self.__max_size = max_size
+            self.__evict()
+
+    @property
+    def size(self):
+        """Current size (in bytes) of the cached contents.
+        """
+        return self.__size
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    #/************************************************************************/
+    def __evict(self):
+        # drop the least recently used entries until the cache fits its size
+        while self.__size > self.__max_size and self.__entries:
+            _, (content, _) = self.__entries.popitem(last=False)
+            self.__size -= len(content)
+            _Stats.process().count('evictions')
+
+    #/************************************************************************/
+    def get(self, key):
+        """Return the content and the time of a cached entry, or :data:`None`
+        when the key is not cached.
+        
+            >>> content, mtime = cache.get(key)
+        """
+        with self.__lock:
+            try:
+                self.__entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self.__entries[key]
+
+    #/************************************************************************/
+    def put(self, key, content, mtime=None):
+        """Store the content of a response in the cache.
+        
+            >>> cache.put(key, content, mtime=None)
+        """
+        if not isinstance(content, bytes) or len(content) > self.__max_size // 4:
+            self.pop(key)
+            return
+        with self.__lock:
+            if key in self.__entries:
+                self.__size -= len(self.__entries.pop(key)[0])
+            self.__entries[key] = (content, time.time() if mtime is None else mtime)
+            self.__size += len(content)
+            self.__evict()
+
+    #/************************************************************************/
+    def pop(self, key):
+        """Remove an entry from the cache.
+        
+            >>> cache.pop(key)
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__size -= len(self.__entries.pop(key)[0])
+
+    #/************************************************************************/
+    def clear(self, prefix=None):
+        """Remove all entries from the cache, or only those whose keys start with
+        a given prefix (*e.g.*, the entries of a given cache directory).
+        
+            >>> cache.clear(prefix=None)
+        """
+        with self.__lock:
+            for key in [k for k in self.__entries if prefix is None or k.startswith(prefix)]:
+                self.__size -= len(self.__entries.pop(key)[0])
+
+#%%
+#==============================================================================
+# CLASS _CacheIndex
+#==============================================================================
+
+class _CacheIndex(object):
+    """Class implementing an access-time index of the entries of an on-disk cache
+    directory, used to bound the size and the number of entries of the cache.
+    
+        >>> index = base._CacheIndex.get(cache_store, memory=None)
+            
+    Arguments
+    ---------
+    cache_store : str
+        path of the cache directory; a unique index is shared by all services of
+        a process using the same directory.
+        
+    Keyword arguments
+    -----------------
+    memory : _MemoryCache
+        in-memory cache in front of the cache directory: the entries held in 
+        memory are regarded as recently used, and evicted entries are also 
+        dropped from memory.
+        
+    Note
+    ----
+    The index is loaded from the access times of the cached files, which are 
+    explicitly set on every access (the modification times being kept so as to
+    check the freshness of the entries), and kept in the order of the accesses;
+    the files hard-linked to the same body are accounted for once. Whenever the
+    limits of the cache are exceeded, entries are evicted incrementally by a
+    background thread: expired entries first, then the least recently used ones.
+    The same thread regularly collects the bodies stored once per content (see
+    :data:`settings.CACHE_OBJECTS_DIR`) which are not linked to any entry anymore.
+    """
+    
+    __registry  = {}
+    __lock      = threading.Lock()
+    
+    #/************************************************************************/
+    @classmethod
+    def get(cls, cache_store, memory=None):
+        """Return the index of a cache directory, creating it the first time.
+        """
+        key = os.path.realpath(cache_store)
+        with cls.__lock:
+            if key not in cls.__registry:
+                cls.__registry[key] = cls(cache_store, memory=memory)
+            return cls.__registry[key]
+
+    #/************************************************************************/
+    @classmethod
+    def forget(cls, pathname):
+        """Remove a pathname from the index it belongs to, if any.
+        """
+        with cls.__lock:
+            indexes = list(cls.__registry.values())
+        for index in indexes:
+            index.discard(pathname)
+    
+    #/************************************************************************/
+    @classmethod
+    def drop(cls, cache_store):
+        """Drop the index of a cache directory, *e.g.* once it has been deleted.
+        """
+        with cls.__lock:
+            cls.__registry.pop(os.path.realpath(cache_store), None)
+    
+    #/************************************************************************/
+    def __init__(self, cache_store, memory=None):
+        self.cache_store        = cache_store
+        self.max_size           = settings.DEF_MAX_CACHE_SIZE
+        self.max_entries        = settings.DEF_MAX_CACHE_ENTRIES
+        self.expire_after       = None
+        self.__memory           = memory
+        self.__lock             = threading.RLock()
+        # pathname: [atime, mtime, size, inode], in the order of the accesses
+        self.__entries          = collections.OrderedDict()
+        self.__links            = collections.Counter() # inode: number of entries
+        self.__size             = 0
+        self.__loaded           = False
+        self.__event            = threading.Event()
+        self.__thread           = None
+        self.__collected        = time.time()
+
+    #/************************************************************************/
+    @property
+    def size(self):
+        """Total size (in bytes) of the indexed entries.
+        """
+        self.load()
+        return self.__size
+
+    def __len__(self):
+        self.load()
+        return len(self.__entries)
+
+    #/************************************************************************/
+    def __is_entry(self, name):
+        return not name.startswith(settings.CACHE_PACK_NAME)                \
+            and not any([name.endswith(ext) for ext in 
+                         (settings.CACHE_META_EXT, settings.CACHE_DECODED_EXT, 
+                          settings.CACHE_PART_EXT, settings.CACHE_TMP_EXT)])
+        
+    #/************************************************************************/
+    def load(self):
+        """Scan the cache directory so as to build the index, when not done yet.
+        """
+        if self.__loaded is True:
+            return
+        entries = {}
+        for root, dirs, files in os.walk(self.cache_store):
+            dirs[:] = [d for d in dirs if d not in (settings.CACHE_LOCK_DIR, settings.CACHE_OBJECTS_DIR)]
+            for name in filter(self.__is_entry, files):
+                pathname = os.path.join(root, name)
+                try:
+                    st = os.stat(pathname)
+                except OSError:
+                    continue
+                # note: the download times of the files linked to a shared body 
+                # (see _Service.__cached_time) are only read when accessed
+                entries[pathname] = [st.st_atime, st.st_mtime, st.st_size, (st.st_dev, st.st_ino)]
+        with self.__lock:
+            if self.__loaded is True:
+                return
+            # entries accessed while scanning prevail
+            entries = collections.OrderedDict(sorted([(p,e) for (p,e) in entries.items() 
+                                                      if p not in self.__entries], 
+                                                     key=lambda pe: pe[1][0]))
+            for entry in entries.values():
+                self.__link(entry, 1)
+            entries.update(self.__entries)
+            self.__entries = entries
+            self.__loaded = True
+
+    #/************************************************************************/
+    def __link(self, entry, n):
+        # account for the size of an entry added (n=1) or removed (n=-1): the 
+        # size of the files hard-linked to the same body is counted once
+        inode = entry[3]
+        if inode is not None:
+            self.__links[inode] += n
+            count = self.__links[inode]
+            if count <= 0:
+                del self.__links[inode]
+            if count > 1 or (n < 0 and count > 0): # other entries are linked
+                return
+        self.__size += n * entry[2]
+
+    #/************************************************************************/
+    def touch(self, pathname, atime=None, mtime=None, size=None, inode=None):
+        """Record an access to (or the update of) an entry of the cache, the
+        entry becoming the most recently used.
+        """
+        with self.__lock:
+            entry = self.__entries.get(pathname)
+            if entry is None and size is None:
+                return
+            elif entry is not None:
+                self.__link(entry, -1)
+                self.__entries.move_to_end(pathname)
+            else:
+                entry = self.__entries[pathname] = [0, 0, 0, None]
+            entry[0] = time.time() if atime is None else atime
+            entry[1] = entry[1] if mtime is None else mtime
+            entry[2] = entry[2] if size is None else size
+            entry[3] = entry[3] if inode is None else inode
+            self.__link(entry, 1)
+        if self.exceeded() or self.__collect_due():
+            self.schedule()
+
+    #/************************************************************************/
+    def discard(self, pathname):
+        """Remove an entry from the index.
+        """
+        with self.__lock:
+            entry = self.__entries.pop(pathname, None)
+            if entry is not None:
+                self.__link(entry, -1)
+
+    #/************************************************************************/
+    def exceeded(self):
+        """Check whether the limits of the cache are exceeded.
+        """
+        return (self.max_size is not None and self.__size > self.max_size)  \
+            or (self.max_entries is not None and len(self.__entries) > self.max_entries)
+
+    #/************************************************************************/
+    def __victims(self, batch):
+        # select the next entries to evict: expired entries first, then the
+        # least recently used ones (entries held in memory being regarded as
+        # recently used)
+        expire_after, now = self.expire_after, time.time()
+        hot = self.__memory.__contains__ if self.__memory is not None else lambda p: False
+        victims, links = [], collections.Counter()
+        with self.__lock:
+            entries = self.__entries
+            excess_size = self.__size - self.max_size if self.max_size is not None else 0
+            excess_num = len(entries) - self.max_entries if self.max_entries is not None else 0
+            if isinstance(expire_after, (int,float)) and expire_after > 0:
+                expired = set([p for (p,e) in entries.items() if now - e[1] >= expire_after])
+            else:
+                expired = set()
+            # entries are ordered by access already: no sort is needed
+            lru = itertools.chain([p for p in entries if p in expired],
+                                  (p for p in entries if p not in expired and not hot(p)),
+                                  (p for p in entries if p not in expired and hot(p)))
+            for p in lru:
+                if len(victims) >= batch or (p not in expired and excess_size <= 0 and excess_num <= 0):
+                    break
+                victims.append(p)
+                entry = entries[p]
+                # the body is freed with the last entry linked to it only
+                links[entry[3]] += 1
+                if entry[3] is None or links[entry[3]] == self.__links[entry[3]]:
+                    excess_size -= entry[2]
+                excess_num -= 1
+        return victims
+
+    #/************************************************************************/
+    def evict(self, batch=None):
+        """Run one eviction step, *i.e.* remove (at most :data:`batch`) entries
+        from the cache when its limits are exceeded; return the number of entries
+        removed.
+        """
+        self.load()
+        if not self.exceeded():
+            return 0
+        victims = self.__victims(batch or settings.CACHE_EVICTION_BATCH)
+        for pathname in victims:
+            happyVerbose("evicting disk file %s" % pathname)
+            for ext in ('', settings.CACHE_META_EXT, settings.CACHE_DECODED_EXT):
+                try:
+                    os.remove(pathname + ext)
+                except OSError:
+                    pass
+            self.discard(pathname)
+            if self.__memory is not None:
+                self.__memory.pop(pathname)
+        _Stats.process().count('evictions', len(victims))
+        return len(victims)
+
+    #/************************************************************************/
+    def __collect_due(self):
+        return settings.CACHE_OBJECTS_DIR not in (None,'')                  \
+            and time.time() - self.__collected >= settings.CACHE_OBJECTS_GC_INTERVAL
+
+    #/************************************************************************/
+    def collect(self):
+        """Remove the objects of the cache (*i.e.*, the bodies of the responses 
+        stored once per content) which are not linked to any entry anymore; 
+        return the number of objects removed.
+        """
+        self.__collected = time.time()
+        if settings.CACHE_OBJECTS_DIR in (None,''):
+            return 0
+        removed = 0
+        for root, _, files in os.walk(os.path.join(self.cache_store, settings.CACHE_OBJECTS_DIR)):
+            for name in files:
+                objname = os.path.join(root, name)
+                try:
+                    if os.stat(objname).st_nlink <= 1:
+                        os.remove(objname)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    #/************************************************************************/
+    def __run(self):
+        # background eviction: entries are removed step by step, every step 
+        # holding the lock of the index only briefly; objects left unlinked 
+        # are then collected from time to time
+        while True:
+            self.__event.wait()
+            self.__event.clear()
+            try:
+                while self.evict() > 0:
+                    time.sleep(0)
+                if self.__collect_due():
+                    self.collect()
+            except:
+                pass
+
+    #/************************************************************************/
+    def schedule(self):
+        """Trigger the background eviction of the cache entries.
+        """
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                                 name='%s-eviction' % settings.PACKAGE)
+                self.__thread.start()
+        self.__event.set()
+
+#%%
+#==============================================================================
+# CLASS _PackStore
+#==============================================================================
+
+class _PackStore(object):
+    """Class implementing a pack file, *i.e.* a single SQLite database storing
+    small cached responses together with their validators.
+    
+        >>> pack = base._PackStore.get(cache_store)
+            
+    Arguments
+    ---------
+    cache_store : str
+        path of the cache directory where the pack file :data:`settings.CACHE_PACK_NAME`
+        is stored; a unique instance is shared by all services of a process using
+        the same directory.
+        
+    Note
+    ----
+    The database is opened in WAL mode, so that it can be shared by several 
+    processes; a connection is opened per thread (and process).
+    """
+    
+    __registry  = {}
+    __lock      = threading.Lock()
+    
+    #/************************************************************************/
+    @classmethod
+    def get(cls, cache_store):
+        """Return the pack file of a cache directory.
+        """
+        key = os.path.realpath(cache_store)
+        with cls.__lock:
+            if key not in cls.__registry:
+                cls.__registry[key] = cls(cache_store)
+            return cls.__registry[key]
+
+    #/************************************************************************/
+    @classmethod
+    def drop(cls, cache_store):
+        """Drop the pack file of a cache directory from the registry, *e.g.* once
+        the directory has been deleted.
+        """
+        with cls.__lock:
+            cls.__registry.pop(os.path.realpath(cache_store), None)
+
+    #/************************************************************************/
+    def __init__(self, cache_store):
+        try:
+            assert SQLITE_INSTALLED is True
+        except:
+            raise happyError('SQLITE3 module not available')
+        self.pathname           = os.path.join(cache_store, settings.CACHE_PACK_NAME)
+        self.__local            = threading.local()
+
+    #/************************************************************************/
+    def __connect(self):
+        # return the connection of the current thread to the database
+        conn = getattr(self.__local, 'conn', None)
+        if conn is None or getattr(self.__local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.pathname, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, '
+                         'content BLOB, mtime REAL, meta TEXT)')
+            self.__local.conn, self.__local.pid = conn, os.getpid()
+        return conn
+
+    #/************************************************************************/
+    def read(self, key):
+        """Return the content, the time of download (or revalidation) and the
+        metadata (URL and validators) of a packed response, or :data:`None`.
+        
+            >>> content, mtime, meta = pack.read(key)
+        """
+        row = self.__connect().execute('SELECT content, mtime, meta FROM entries WHERE key=?', 
+                                       (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            meta = json.loads(row[2] or '{}')
+        except:
+            meta = {}
+        return bytes(row[0]), row[1], meta
+
+    #/************************************************************************/
+    def write(self, key, content, mtime, meta=None):
+        """Store a response in the pack file.
+        
+            >>> pack.write(key, content, mtime, meta=None)
+        """
+        self.__connect().execute('INSERT OR REPLACE INTO entries VALUES (?,?,?,?)',
+                                 (key, sqlite3.Binary(content), mtime, json.dumps(meta or {})))
+
+    #/************************************************************************/
+    def delete(self, key=None, expire_after=None):
+        """Remove a given response from the pack file, or all the responses older
+        than :data:`expire_after` seconds when no key is passed.
+        
+            >>> pack.delete(key=None, expire_after=None)
+        """
+        if key is not None:
+            self.__connect().execute('DELETE FROM entries WHERE key=?', (key,))
+        else:
+            self.__connect().execute('DELETE FROM entries WHERE mtime<=?', 
+                                     (time.time() - (expire_after or 0),))
+
+    #/************************************************************************/
+    def keys(self):
+        """Return the keys of the responses stored in the pack file.
+        """
+        return [row[0] for row in self.__connect().execute('SELECT key FROM entries')]
+
+    #/************************************************************************/
+    def __len__(self):
+        return self.__connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    #/************************************************************************/
+    def close(self):
+        """Close the connection of the current thread to the database.
+        """
+        conn = getattr(self.__local, 'conn', None)
+        if conn is not None:
+            conn.close()
+        self.__local.conn = None
+
+#%%
+#==============================================================================
+# CLASS _CachedResponse
+#==============================================================================
+
+try:
+    assert SERVICE_AVAILABLE is True
+except:
+    class _CachedResponse(object):
+        #doc-ignore
+        pass 
+else:
+    class _CachedResponse(requests.Response):
+        """Generic class used for representing a cached response.
+            
+            >>> resp = base._CachedResponse(resp, url, path='')
+            
+        The body of the response :data:`resp` may be passed as :data:`bytes` 
+        or as a live response. When :data:`resp` is :data:`None`, the response 
+        is lazy: only the path and the metadata of the cached file are stored, 
+        and the body is read from :data:`path` when :data:`content`, :data:`text`
+        or :meth:`json` is accessed. The callable :data:`restore`, when passed,
+        is called with :data:`path` whenever the cached file is requested while 
+        it does not exist (*e.g.*, because the response was moved into the pack
+        file of the cache), so that the file is written back.
+        """ 
+        # why not derive this class from aiohttp.ClientResponse in the case
+        # ASYNCIO_AVAILABLE is True? actually, we refer here to aiohttp doc,
+        # namely http://docs.aiohttp.org/en/stable/client_reference.html:
+        #   "User never creates the instance of ClientResponse class but gets 
+        #   it from API calls"
+        __attrs__ = requests.Response.__attrs__ + ['_cache_path', 'cache_store']
+        def __init__(self, *args, **kwargs):
+            r, url = args
+            path = kwargs.pop('path','')
+            restore = kwargs.pop('restore',None)
+            try:
+                assert happyType.isstring(url) and happyType.isstring(path) \
+                    and (restore is None or callable(restore)) \
+                    and (r is None or isinstance(r,(bytes,requests.Response,aiohttp.ClientResponse)))
+            except:
+                raise happyError('parsed initialising parameters not recognised')
+            super(_CachedResponse,self).__init__()
+            self.url, self._restore = url, restore
+            self._cache_path = self.cache_store = path
+            if r is None:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    raise happyError('cached file %s not found' % path)
+                self.reason, self.status_code = "OK", 200
+                self._content_consumed = True
+                self.headers['Content-Length'] = str(st.st_size)
+                self.headers['Last-Modified'] = email.utils.formatdate(st.st_mtime, usegmt=True)
+            elif isinstance(r,bytes):
+                self.reason, self.status_code = "OK", 200
+                self._content, self._content_consumed = r, True           
+            elif isinstance(r,(requests.Response,aiohttp.ClientResponse)):
+                # self.__response = r
+                for attr in r.__dict__:
+                    setattr(self, attr, getattr(r, attr))
+            # self._encoding = ?
+        @property
+        def _cache_path(self):
+            # the cached file is written back when it was moved away from path
+            path, restore = self.__dict__.get('_path', ''), self.__dict__.get('_restore')
+            if path != '' and restore is not None and not os.path.exists(path):
+                restore(path)
+            return path
+        @_cache_path.setter
+        def _cache_path(self, path):
+            self._path = path
+        @property
+        def content(self):
+            # the body of a lazy response is read only when it is actually needed
+            if self._content is False and self._content_consumed is True:
+                try:
+                    with open(self._path, 'rb') as f:
+                        self._content = f.read()
+                except OSError:
+                    raise happyError('cached file %s not available anymore' % self._path)
+            return super(_CachedResponse,self).content
+        def buffer(self):
+            """Return a read-only memory map of the cached file of the response,
+            or :data:`None` when the response is not cached in a file.
+            
+                >>> buf = resp.buffer()
+                
+            The memory map is a file-like object that can be passed as is to 
+            :class:`zipfile.ZipFile` for instance, while GDAL can read the path
+            :data:`_cache_path` directly.
+            """
+            try:
+                with open(self._path, 'rb') as f:
+                    return _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError): # ValueError: empty file
+                return None
+        def __repr__(self):
+            return '<Response [%s]>' % (self.status_code)
+                 
+#%%
+#==============================================================================
+# CLASS _Service
+#==============================================================================
+
+class _Service(object):
+    """Base class for web-based geospatial services.
+    
+    This class is used to defined a web-session and simple connection operations 
+    called by a web-service. 
+        
+       >>> serv = base._Service()        
+    """
+    
+    RESPONSE_FORMATS = ['resp', 'zip', 'raw', 'text', 'stringio', 'content', 'bytes', 'bytesio', 'json']
+    ZIP_OPERATIONS  = ['extract', 'extractall', 'getinfo', 'namelist', 'read', 'infolist']
+    
+    # flag the threads of the pool so that nested calls run sequentially
+    __worker        = threading.local()
+    # requests in flight, shared by all services and threads (single-flight)
+    __in_flight     = {}
+    __flight_lock   = threading.Lock()
+    __aio_flights   = weakref.WeakKeyDictionary()
+    # in-memory cache shared by all services
+    __memory        = _MemoryCache()
+    # cached files being refreshed in background (stale-while-revalidate)
+    __refreshing    = set()
+    
+    #/************************************************************************/
+    def __init__(self, **kwargs):
+        self.__session           = None
+        self.__own_session       = True
+        self.__asynchronous      = kwargs.pop(_Decorator.KW_ASYNC, ASYNCIO_AVAILABLE)
+        if not isinstance(self.__asynchronous, bool):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_ASYNC.upper())
+        elif self.__asynchronous is True and AIOHTTP_INSTALLED is False:
+            raise happyError('asynchronous implementation not available - AIOHTTP package missing')
+        self.__loop              = None
+        self.__executor          = None
+        self.__hedger            = None
+        self.__max_workers       = None
+        self.max_workers         = kwargs.pop(_Decorator.KW_WORKERS, settings.DEF_MAX_WORKERS)
+        # client sessions bound to event loops other than the one of the service
+        self.__aio_sessions      = weakref.WeakKeyDictionary()
+        self.__cache_store       = True
+        self.__expire_after      = None # datetime.deltatime(0)
+        self.__cache_backend     = None
+        self.__stats             = _Stats(parent=_Stats.process())
+        self.__scheduler         = _Scheduler(**{k: kwargs.pop(k) \
+            for k in (_Decorator.KW_IN_FLIGHT,_Decorator.KW_PER_HOST,_Decorator.KW_RATE_LIMIT) if k in kwargs})
+        self.__retry             = _Retry(**{k: kwargs.pop(k) \
+            for k in (_Decorator.KW_RETRY,_Decorator.KW_BACKOFF,_Decorator.KW_HEDGE) if k in kwargs})
+        self.__max_cache_size    = None
+        self.__max_cache_entries = None
+        self.max_cache_size      = kwargs.pop(_Decorator.KW_CACHE_SIZE, settings.DEF_MAX_CACHE_SIZE)
+        self.max_cache_entries   = kwargs.pop(_Decorator.KW_CACHE_ENTRIES, settings.DEF_MAX_CACHE_ENTRIES)
+        self.cache_backend       = kwargs.pop(_Decorator.KW_BACKEND, settings.DEF_CACHE_BACKEND)
+        self.cache_decoded       = kwargs.pop(_Decorator.KW_DECODED, settings.DEF_CACHE_DECODED)
+        self.stale_while_revalidate = kwargs.pop(_Decorator.KW_STALE, settings.DEF_STALE_WHILE_REVALIDATE)
+        self.expire_negative     = kwargs.pop(_Decorator.KW_NEGATIVE, settings.DEF_EXPIRE_NEGATIVE)
+        # update with keyword arguments passed
+        if kwargs != {}:
+            attrs = (_Decorator.KW_CACHE,_Decorator.KW_EXPIRE,_Decorator.KW_FORCE)
+            for attr in list(set(attrs).intersection(kwargs.keys())):
+                setattr(self, '%s' % attr, kwargs.pop(attr))
+        # determine appropriate setting for a given session, taking into account
+        # the explicit setting on that request, and the setting in the session. 
+        if isinstance(self.__cache_store, bool):
+            self.__cache_store = self.__default_cache() if self.cache_store else None
+        # determine appropriate setting for a given session, taking into account
+        # the explicit setting on that request, and the setting in the session.
+        if self.__asynchronous is False:            
+            try:
+                # whether requests_cache is defined or not, no matter
+                self.__session = requests.Session()
+                # session = requests.session(**kwargs)
+            except:
+                raise happyError('wrong requests setting - SESSION not initialised')
+            try:
+                # size the connection pool so that it is shared by all the threads
+                # of the executor
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(self.max_workers or 1, 
+                                                                         requests.adapters.DEFAULT_POOLSIZE))
+                for protocol in ('http://', 'https://'):
+                    self.__session.mount(protocol, adapter)
+            except:
+                pass
+            if CACHECONTROL_INSTALLED is True and self.cache_store is not None:
+                try:
+                    if self.expire_after is None or self.expire_after != settings.CACHE_NEVER_EXPIRE \
+                            and int(self.expire_after) > 0:
+                        cache_store = FileCache(os.path.abspath(self.cache_store))  
+                    else:
+                        cache_store = FileCache(os.path.abspath(self.cache_store), forever=True)
+                except:
+                    pass
+                else:
+                    self.__session = CacheControl(self.session, cache_store)
+            try:
+                assert self.session is not None
+            except:
+                raise happyError('wrong definition for SESSION parameters - SESSION not initialised')
+        else:
+            # the client session is created the first time it is needed on the 
+            # event loop owned by the service (see __get_loop)
+            self.__session = None
+        
+    #/************************************************************************/
+    def __enter__(self):
+        return self
+    def __exit__(self, *args):
+        self.close()
+    async def __aenter__(self):
+        return self
+    async def __aexit__(self, *args):
+        await self.aclose()
+        
+    #/************************************************************************/
+    def close(self):
+        """Close the connections kept alive by the session of an instance of a 
+        class :class:`_Service`, as well as the event loop owned by the instance.
+        
+            >>> serv.close()
+            
+        The service can still be used afterwards: a new session (and a new loop)
+        will be created on the next request.
+        
+        Examples
+        --------
+        Either explicitly close the service once done:
+            
+            >>> serv = base._Service()
+            >>> status = serv.get_status(settings.ESTAT_URL)
+            >>> serv.close()
+            
+        or use it as a context manager:
+            
+            >>> with base._Service() as serv:
+                    status = serv.get_status(settings.ESTAT_URL)
+        """
+        if self.__own_session is False:
+            pass # the session passed by the caller is left open
+        elif self.__asynchronous is False:
+            try:
+                self.__session.close()
+            except:
+                pass
+        else:
+            try:
+                assert self.__session is not None and not self.__session.closed
+                self.__get_loop().run_until_complete(self.__session.close())
+            except:
+                pass
+            self.__session = None
+        if self.__loop is not None and not self.__loop.is_closed():
+            self.__loop.close()
+        self.__loop = None
+        for executor in (self.__executor, self.__hedger):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self.__executor = self.__hedger = None
+        
+    #/************************************************************************/
+    async def aclose(self):
+        """Asynchronous version of :meth:`~_Service.close`: close the connections
+        kept alive by the client session bound to the running event loop.
+        
+            >>> await serv.aclose()
+            
+        Example
+        -------
+        
+            >>> async with base._Service() as serv:
+                    response = await serv.aget_response(settings.ESTAT_URL)
+        """
+        session = self.__aio_sessions.pop(asyncio.get_event_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+        
+    #/************************************************************************/
+    def __get_loop(self):
+        # return the long-lived event loop owned by the service, creating it 
+        # the first time it is needed (or whenever it has been closed)
+        # the loop is run explicitly (see __run_async): it is not installed as 
+        # the event loop of the calling thread
+        if self.__loop is None or self.__loop.is_closed():
+            self.__loop = asyncio.new_event_loop()
+        return self.__loop
+
+    #/************************************************************************/
+    async def __get_aio_session(self):
+        # return the client session shared by all asynchronous requests sent from
+        # the running loop so that keep-alive connections are reused between batches
+        loop = asyncio.get_event_loop()
+        session = self.__session if loop is self.__loop else self.__aio_sessions.get(loop)
+        if session is None or session.closed:
+            # statuses are checked explicitly (as with requests), so that error
+            # responses can be retried, resumed or cached
+            session = aiohttp.ClientSession()
+            if loop is self.__loop:     self.__session, self.__own_session = session, True
+            else:                       self.__aio_sessions[loop] = session
+        return session
+
+    #/************************************************************************/
+    def __run_async(self, coro):
+        # run a coroutine until completion on the event loop of the service
+        return self.__get_loop().run_until_complete(coro)
+        
+    #/************************************************************************/
+    def __get_executor(self):
+        # return the pool of threads owned by the service, creating it the first
+        # time it is needed
+        if self.__executor is None:
+            self.__executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(self.max_workers or 1, 1),
+                                                                    thread_name_prefix=settings.PACKAGE)
+        return self.__executor
+
+    #/************************************************************************/
+    def __sync_map(self, func, items):
+        # apply func to all items, in parallel over the pool of threads of the
+        # service when possible, sequentially otherwise; results are returned 
+        # in the order of the input items and the first exception is raised;
+        # duplicated items are processed only once
+        items, index = self.__dedupe(items)
+        if len(items) <= 1 or (self.max_workers or 1) <= 1                  \
+                or getattr(_Service.__worker, 'active', False) is True:
+            res = [func(i) for i in items]
+        else:
+            def work(item):
+                _Service.__worker.active = True
+                try:
+                    return func(item)
+                finally:
+                    _Service.__worker.active = False
+            res = list(self.__get_executor().map(work, items))
+        return [res[i] for i in index]
+        
+    #/************************************************************************/
+    async def __async_map(self, func, items):
+        # asynchronous counterpart of __sync_map: the items are processed over 
+        # the pool of threads of the service without blocking the running loop
+        items, index = self.__dedupe(items)
+        loop = asyncio.get_event_loop()
+        def work(item):
+            _Service.__worker.active = True
+            try:
+                return func(item)
+            finally:
+                _Service.__worker.active = False
+        res = await asyncio.gather(*[loop.run_in_executor(self.__get_executor(), work, i) for i in items])
+        return [res[i] for i in index]
+        
+    #/************************************************************************/
+    @staticmethod
+    def __normalise_url(url, canonical=False):
+        # normalise a URL so that equivalent URLs are identified: lowercase 
+        # scheme and host, default port and fragment removed; the query is also
+        # made canonical (see __canonical_query) for the keys of the cache only,
+        # since queries which differ by the rounding of their coordinates are 
+        # still distinct requests
+        try:
+            parts = urllib.parse.urlsplit(url)
+            scheme, netloc = parts.scheme.lower(), parts.netloc.lower()
+            if (scheme == 'http' and netloc.endswith(':80'))                \
+                    or (scheme == 'https' and netloc.endswith(':443')):
+                netloc = netloc.rsplit(':',1)[0]
+            query = _Service.__canonical_query(parts.query) if canonical else parts.query
+            return urllib.parse.urlunsplit((scheme, netloc, parts.path or '/', query, ''))
+        except:
+            return url
+        
+    #/************************************************************************/
+    @staticmethod
+    def __canonical_query(query):
+        # sort the parameters of a query (repeated parameters keeping their order)
+        # and round the coordinates it contains, so that queries built along 
+        # different paths (e.g., with build_url) are identified
+        if query == '':
+            return query
+        precision = settings.CACHE_KEY_PRECISION
+        def canonical(key, value):
+            if precision is None or key.lower() not in settings.CACHE_KEY_COORDINATES:
+                return value
+            try:
+                return repr(round(float(value), precision))
+            except ValueError:
+                return value
+        params = urllib.parse.parse_qsl(query, keep_blank_values=True)
+        return urllib.parse.urlencode(sorted([(k, canonical(k, v)) for (k, v) in params], 
+                                             key=lambda p: p[0]))
+        
+    #/************************************************************************/
+    @staticmethod
+    def __dedupe(items):
+        # return the distinct items - URLs being compared in normalised form - 
+        # together with the position of every input item among them
+        distinct, keys, index = [], {}, []
+        for item in items:
+            key = _Service.__normalise_url(item) if happyType.isstring(item) else id(item)
+            if key not in keys:
+                keys.update({key: len(distinct)})
+                distinct.append(item)
+            index.append(keys[key])
+        return distinct, index
+        
+    #/************************************************************************/
+    @staticmethod
+    def __single_flight(key, func, *args):
+        # run func(*args) unless an identical request (same key) is already in
+        # flight, in any thread, in which case its outcome is awaited and shared
+        with _Service.__flight_lock:
+            future = _Service.__in_flight.get(key)
+            leader = future is None
+            if leader is True:
+                future = _Service.__in_flight[key] = concurrent.futures.Future()
+        if leader is False:
+            happyVerbose("joining request in flight for %s" % key[1])
+            return future.result()
+        try:
+            res = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with _Service.__flight_lock:
+                _Service.__in_flight.pop(key, None)
+        
+    #/************************************************************************/
+    @staticmethod
+    async def __async_single_flight(key, func, *args):
+        # asynchronous version of __single_flight: identical requests sent on 
+        # the same event loop share the same task
+        flights = _Service.__aio_flights.setdefault(asyncio.get_event_loop(), {})
+        task = flights.get(key)
+        if task is None:
+            task = flights[key] = asyncio.ensure_future(func(*args))
+            task.add_done_callback(lambda t: flights.pop(key, None))
+        else:
+            happyVerbose("joining request in flight for %s" % key[1])
+        return await asyncio.shield(task)
+        
+    #/************************************************************************/
+    @property
+    def max_workers(self):
+        """Workers property (:data:`getter`/:data:`setter`) of an instance of a 
+        class :class:`_Service`. :data:`max_workers` is the number of threads 
+        used to send multiple requests in parallel in the sequential (*i.e.*, 
+        non asynchronous) implementation; when set to :data:`None`, 0 or 1, the
+        requests are sent one after the other.
+        """
+        return self.__max_workers
+    @max_workers.setter#analysis:ignore
+    def max_workers(self, max_workers):
+        if max_workers is not None and not (isinstance(max_workers, int) and max_workers >= 0):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_WORKERS.upper())
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+        self.__max_workers = max_workers
+        
+    #/************************************************************************/
+    @property
+    def asynchronous(self):
+        """Asynchronous flag (:data:`getter`) of an instance of a class :class:`_Service`,
+        set at initialisation (through the keyword argument :literal:`asynchronous`).
+        When :data:`True`, requests are sent with :mod:`aiohttp`, both by the 
+        native coroutines (*e.g.*, :meth:`~_Service.aget_response`) on the loop
+        of the caller and by the other methods on the event loop owned by the 
+        service; otherwise, requests are sent with :mod:`requests` over the pool 
+        of threads of the service (see :data:`~_Service.max_workers`). Default to
+        :data:`False`.
+        """
+        return self.__asynchronous
+        
+    #/************************************************************************/
+    @property
+    def session(self):
+        """Session property (:data:`getter`/:data:`setter`) of an instance of
+        a class :class:`_Service`. :data:`session` is itself an instance of a
+        :class:`requests.session.Session` class, or of a :class:`aiohttp.ClientSession`
+        class when the service is asynchronous. A session passed by the caller 
+        is not closed by the service.
+        """ # A session type is :class:`requests.session.Session`.
+        return self.__session
+    @session.setter#analysis:ignore
+    def session(self, session):
+        if session is not None and not isinstance(session, 
+                                                  aiohttp.ClientSession if self.__asynchronous else requests.Session):
+            raise happyError('wrong type for SESSION parameter')
+        # a session passed by the caller is not closed by the service
+        self.__session, self.__own_session = session, session is None
+    
+    #/************************************************************************/
+    @property
+    def scheduler(self):
+        """Scheduler property (:data:`getter`/:data:`setter`) of an instance of
+        a class :class:`_Service`. :data:`scheduler` is an instance of the class
+        :class:`_Scheduler` that bounds the number of concurrent requests (overall
+        and per host) and the rate of the requests sent to any host. 
+        """
+        return self.__scheduler
+    @scheduler.setter#analysis:ignore
+    def scheduler(self, scheduler):
+        if not isinstance(scheduler, _Scheduler):
+            raise happyError('wrong type for SCHEDULER parameter')
+        self.__scheduler = scheduler
+    
+    #/************************************************************************/
+    @property
+    def retry(self):
+        """Retry property (:data:`getter`/:data:`setter`) of an instance of a 
+        class :class:`_Service`. :data:`retry` is an instance of the class 
+        :class:`_Retry` that defines how requests failing transiently are retried
+        (with exponential backoff) and whether slow requests are hedged.
+        """
+        return self.__retry
+    @retry.setter#analysis:ignore
+    def retry(self, retry):
+        if not isinstance(retry, _Retry):
+            raise happyError('wrong type for RETRY parameter')
+        self.__retry = retry
+    
+    #/************************************************************************/
+    def __sync_send(self, url, method, **kwargs):
+        # send a single request through the scheduler of the service and record
+        # its latency
+        with self.__scheduler.slot(url):
+            start = time.time()
+            try:
+                response = getattr(self.session, method)(url, **kwargs)
+            except:
+                self.__stats.observe(_Scheduler.host(url), time.time() - start, error=True)
+                raise
+        latency = time.time() - start
+        self.__retry.observe(_Scheduler.host(url), latency)
+        self.__stats.observe(_Scheduler.host(url), latency, error=response.status_code >= 400)
+        return response
+
+    #/************************************************************************/
+    def __sync_hedge(self, url, method, **kwargs):
+        # send a request, and a duplicate (hedged) request when the first one is
+        # not answered in due time: the first successful response is returned
+        # while the other one is discarded
+        threshold = self.__retry.threshold(_Scheduler.host(url)) if method in ('get','head') else None
+        if threshold is None:
+            return self.__sync_send(url, method, **kwargs)
+        if self.__hedger is None:
+            self.__hedger = concurrent.futures.ThreadPoolExecutor(max_workers=2*max(self.max_workers or 1, 1),
+                                                                  thread_name_prefix=settings.PACKAGE)
+        futures = [self.__hedger.submit(self.__sync_send, url, method, **kwargs)]
+        done, _ = concurrent.futures.wait(futures, timeout=threshold)
+        if done == set():
+            happyVerbose('hedging request to %s after %.3fs' % (url, threshold))
+            futures.append(self.__hedger.submit(self.__sync_send, url, method, **kwargs))
+        while True:
+            done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                futures.remove(future)
+                if future.exception() is None or futures == []:
+                    break
+            else:
+                continue
+            for other in futures:
+                other.add_done_callback(lambda f: f.exception() is None and f.result().close())
+            return future.result()
+
+    #/************************************************************************/
+    def __sync_request(self, url, method='get', **kwargs):
+        # send a request through the scheduler of the service, retrying it on 
+        # transient failures according to the retry policy of the service
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = self.__sync_hedge(url, method, **kwargs)
+            except Exception as e:
+                cause = e
+            else:
+                cause = response.status_code
+            delay = self.__retry.delay(cause, attempt, response)
+            if delay is None:
+                if response is None:
+                    raise cause
+                return response
+            happyVerbose('retrying request to %s in %.3fs (%s)' % (url, delay, cause))
+            if response is not None:
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    #/************************************************************************/
+    async def __async_send(self, session, url, method, **kwargs):
+        # asynchronous version of __sync_send
+        async with self.__scheduler.aslot(url):
+            start = time.time()
+            try:
+                response = await getattr(session, method)(url, **kwargs)
+            except:
+                self.__stats.observe(_Scheduler.host(url), time.time() - start, error=True)
+                raise
+        latency = time.time() - start
+        self.__retry.observe(_Scheduler.host(url), latency)
+        self.__stats.observe(_Scheduler.host(url), latency, error=response.status >= 400)
+        return response
+
+    #/************************************************************************/
+    async def __async_hedge(self, session, url, method, **kwargs):
+        # asynchronous version of __sync_hedge
+        threshold = self.__retry.threshold(_Scheduler.host(url)) if method in ('get','head') else None
+        if threshold is None:
+            return await self.__async_send(session, url, method, **kwargs)
+        tasks = [asyncio.ensure_future(self.__async_send(session, url, method, **kwargs))]
+        done, _ = await asyncio.wait(tasks, timeout=threshold)
+        if done == set():
+            happyVerbose('hedging request to %s after %.3fs' % (url, threshold))
+            tasks.append(asyncio.ensure_future(self.__async_send(session, url, method, **kwargs)))
+        while True:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                tasks.remove(task)
+                if task.exception() is None or tasks == []:
+                    break
+            else:
+                continue
+            for other in tasks:
+                other.cancel()
+            return task.result()
+
+    #/************************************************************************/
+    async def __async_request(self, session, url, method='get', **kwargs):
+        # asynchronous version of __sync_request
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = await self.__async_hedge(session, url, method, **kwargs)
+            except Exception as e:
+                cause = e
+            else:
+                cause = response.status
+            delay = self.__retry.delay(cause, attempt, response)
+            if delay is None:
+                if response is None:
+                    raise cause
+                return response
+            happyVerbose('retrying request to %s in %.3fs (%s)' % (url, delay, cause))
+            if response is not None:
+                response.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    #/************************************************************************/
+    @property
+    def cache_store(self):
+        """Cache property (:data:`getter`/:data:`setter`) of an instance of
+        a class :class:`_Service`. :data:`cache_store` is set to the physical 
+        location (*i.e.* on the drive) of the repository used to cache the 
+        downloaded datasets/responses.
+        """
+        return self.__cache_store
+    @cache_store.setter
+    def cache_store(self, cache_store):
+        if not(cache_store is None or isinstance(cache_store, (str,bool))):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_CACHE.upper())
+        else:
+            #if cache_store not in (False,'',None) and requests_cache is None and CACHECONTROL_INSTALLED is False:
+            #    raise happyError('caching not supported in the absence of modules requests_cache and cachecontrol')                
+            pass
+        self.__cache_store = cache_store
+    
+    #/************************************************************************/
+    @property
+    def max_cache_size(self):
+        """Cache size property (:data:`getter`/:data:`setter`) of an instance of
+        a class :class:`_Service`. :data:`max_cache_size` is the maximum size (in 
+        bytes) of the cache directory :data:`cache_store`; when exceeded, cached 
+        entries are evicted in the background, expired entries first, then the
+        least recently used ones. When set to :data:`None`, the size of the cache
+        is not limited.
+        """
+        return self.__max_cache_size
+    @max_cache_size.setter#analysis:ignore
+    def max_cache_size(self, max_cache_size):
+        if not (max_cache_size is None or isinstance(max_cache_size, int) and max_cache_size >= 0):
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_CACHE_SIZE.upper())
+        self.__max_cache_size = max_cache_size
+
+    #/************************************************************************/
+    @property
+    def max_cache_entries(self):
+        """Cache entries property (:data:`getter`/:data:`setter`) of an instance 
+        of a class :class:`_Service`. :data:`max_cache_entries` is the maximum 
+        number of entries of the cache directory :data:`cache_store`; see also 
+        :data:`max_cache_size`.
+        """
+        return self.__max_cache_entries
+    @max_cache_entries.setter#analysis:ignore
+    def max_cache_entries(self, max_cache_entries):
+        if not (max_cache_entries is None or isinstance(max_cache_entries, int) and max_cache_entries >= 0):
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_CACHE_ENTRIES.upper())
+        self.__max_cache_entries = max_cache_entries
+
+    #/************************************************************************/
+    def __cache_index(self, cache_store, expire_after):
+        # return the access-time index of a cache directory, updated with the 
+        # limits set on the service
+        index = _CacheIndex.get(cache_store, memory=_Service.__memory)
+        if self.__max_cache_size is not None or self.__max_cache_entries is not None:
+            index.max_size, index.max_entries = self.__max_cache_size, self.__max_cache_entries
+            index.expire_after = expire_after
+        return index
+
+    #/************************************************************************/
+    @property
+    def memory_cache(self):
+        """Memory cache property (:data:`getter`) of an instance of a class 
+        :class:`_Service`. :data:`memory_cache` is the instance of the class 
+        :class:`_MemoryCache`, shared by all services of the process, which keeps
+        the most recently used responses in memory in front of the disk caches.
+        """
+        return _Service.__memory
+    
+    #/************************************************************************/
+    def stats(self, process=False):
+        """Return the counters of the activity of the caches and of the network 
+        of an instance of a class :class:`_Service` (see :class:`_Stats`).
+        
+            >>> counters = serv.stats(process=False)
+            
+        Keyword arguments
+        -----------------
+        process : bool
+            flag set to return the counters aggregated over all the services of
+            the process instead; default to :data:`False`.
+            
+        Returns
+        -------
+        counters : dict
+            a dictionary with the counters listed in :data:`_Stats.COUNTERS`, and
+            the histograms of the latencies of the requests (under the key 
+            :literal:`latency`), indexed by host, each with the number of requests,
+            their total latency and the number of requests per bucket of latency
+            (the last bucket, unbounded, having :data:`None` as bound).
+            
+        Examples
+        --------
+        
+            >>> serv = base._Service()
+            >>> serv.read_url(settings.ESTAT_URL, ofmt='text')
+            >>> counters = serv.stats()
+            >>> counters['disk_hits'] / ((counters['disk_hits'] + counters['disk_misses']) or 1)
+                0.0
+        """
+        return (_Stats.process() if process is True else self.__stats).snapshot()
+
+    #/************************************************************************/
+    def reset_stats(self, process=False):
+        """Reset the counters of the activity of an instance of a class :class:`_Service`,
+        or those aggregated over the process when :data:`process` is :data:`True`.
+        
+            >>> serv.reset_stats(process=False)
+        """
+        (_Stats.process() if process is True else self.__stats).reset()
+
+    #/************************************************************************/
+    @property
+    def cache_backend(self):
+        """Cache backend property (:data:`getter`/:data:`setter`) of an instance
+        of a class :class:`_Service`. :data:`cache_backend` is the backend used 
+        to store the cached responses on disk, either :literal:`'File'` (one file
+        per response) or :literal:`'SQLite'` (small responses, *i.e.* less than 
+        :data:`settings.CACHE_PACK_MAX_SIZE` bytes, stored in a single pack file,
+        larger ones as files).
+        """
+        return self.__cache_backend
+    @cache_backend.setter#analysis:ignore
+    def cache_backend(self, cache_backend):
+        try:
+            assert cache_backend in settings.CACHE_BACKENDS
+        except:
+            raise happyError('wrong value for %s parameter - must be in %s' % (_Decorator.KW_BACKEND.upper(), settings.CACHE_BACKENDS))
+        try:
+            assert cache_backend != 'SQLite' or SQLITE_INSTALLED is True
+        except:
+            raise happyError('SQLITE3 module not available for %s backend' % cache_backend)
+        self.__cache_backend = cache_backend
+
+    #/************************************************************************/
+    @property
+    def cache_decoded(self):
+        """Decoded cache property (:data:`getter`/:data:`setter`) of an instance
+        of a class :class:`_Service`. When :data:`cache_decoded` is :data:`True`,
+        the decoded representation of cached JSON responses is pickled next to
+        the cached files (keyed by their size and validators), so that further
+        reads of these responses skip the JSON parsing.
+        
+        Note
+        ----
+        Pickled files are loaded from the cache directory: the latter shall not
+        be writable by untrusted users.
+        """
+        return self.__cache_decoded
+    @cache_decoded.setter#analysis:ignore
+    def cache_decoded(self, cache_decoded):
+        if not isinstance(cache_decoded, bool):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_DECODED.upper())
+        self.__cache_decoded = cache_decoded
+
+    #/************************************************************************/
+    @property
+    def expire_after(self):
+        """Expiration property (:data:`getter`/:data:`setter`) of an instance of
+        a class :class:`_Service`. :data:`expire_after` represents the time after
+        which datasets downloaded and cached through this instance shall be 
+        downloaded again. Expired datasets whose validators (:literal:`ETag`, 
+        :literal:`Last-Modified`) were returned by the server are first revalidated
+        through a conditional request, so that unmodified datasets are not 
+        transferred again.
+        
+        :data:`expire_after` can also be a dictionary of expiration times indexed
+        by the categories of requests listed in :data:`settings.CACHE_CATEGORIES`
+        (see :meth:`~_Service.url_category`), with the :literal:`'default'` key used 
+        for other requests. Categories that are not set explicitly keep the 
+        lifetimes of :data:`settings.CACHE_POLICIES`, which also apply when 
+        :data:`expire_after` is not set.
+        
+        Cached datasets expire after :data:`expire_after` seconds, unless it is 
+        :data:`None` or set to :data:`settings.CACHE_NEVER_EXPIRE`, in which case 
+        they never expire; the latter are also kept when the cache is cleaned.
+        """
+        return self.__expire_after
+    @expire_after.setter
+    def expire_after(self, expire_after):
+        if happyType.ismapping(expire_after):
+            try:
+                assert all([k == 'default' or k in settings.CACHE_CATEGORIES for k in expire_after.keys()])
+            except:
+                raise happyError('wrong key for %s parameter - must be in %s' % 
+                                 (_Decorator.KW_EXPIRE.upper(), settings.CACHE_CATEGORIES + ['default']))
+            for v in expire_after.values():
+                self.expire_after = v # check the values
+            self.__expire_after = dict(expire_after)
+        elif expire_after is None or expire_after == settings.CACHE_NEVER_EXPIRE \
+                or isinstance(expire_after, (int, datetime.timedelta)) \
+                and (int(expire_after)>=0 or expire_after==-1):
+            self.__expire_after = expire_after
+        elif not isinstance(expire_after, (int, datetime.timedelta)):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_EXPIRE.upper())
+        #elif isinstance(expire_after, int) and expire_after<0:
+        #    raise happyError('wrong time setting for %s parameter' % _Decorator.KW_EXPIRE.upper())
+        
+    #/************************************************************************/
+    @property
+    def expire_negative(self):
+        """Negative expiration property (:data:`getter`/:data:`setter`) of an 
+        instance of a class :class:`_Service`. :data:`expire_negative` is the 
+        lifetime (in seconds) of the negative responses cached by this instance,
+        *i.e.* error responses (see :data:`settings.CACHE_NEGATIVE_STATUS`) and
+        responses with an empty list of results (*e.g.*, a location outside the 
+        European Union): it applies whenever it is shorter than :data:`expire_after`.
+        When :data:`None`, error responses are not cached.
+        """
+        return self.__expire_negative
+    @expire_negative.setter#analysis:ignore
+    def expire_negative(self, expire_negative):
+        if isinstance(expire_negative, datetime.timedelta):
+            expire_negative = expire_negative.total_seconds()
+        if not (expire_negative is None or isinstance(expire_negative, (int, float)) \
+                and not isinstance(expire_negative, bool) and expire_negative >= 0):
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_NEGATIVE.upper())
+        self.__expire_negative = expire_negative
+
+    #/************************************************************************/
+    def url_category(self, url):
+        """Return the category of a request, used to select the lifetime of its 
+        cached response.
+        
+            >>> category = serv.url_category(url)
+            
+        Returns
+        -------
+        category : str
+            one of the categories in :data:`settings.CACHE_CATEGORIES`, or :data:`None`
+            when the URL is not recognised; the base method always returns :data:`None`
+            and shall be overriden by the services.
+        """
+        return None
+
+    #/************************************************************************/
+    def __expire_for(self, url, expire_after):
+        #ignore-doc
+        # resolve the lifetime of the cached response of a URL from the policy
+        # expire_after (possibly set per category of requests): the default 
+        # policies never override a lifetime set explicitly
+        if happyType.ismapping(expire_after):
+            policies = dict(settings.CACHE_POLICIES, **expire_after)
+            expire_after = policies.get('default')
+        elif expire_after is None:
+            policies = settings.CACHE_POLICIES
+        else:
+            policies = {}
+        expire_after = policies.get(self.url_category(url), expire_after)
+        if isinstance(expire_after, datetime.timedelta):
+            expire_after = expire_after.total_seconds()
+        return expire_after
+
+    #/************************************************************************/
+    @property
+    def stale_while_revalidate(self):
+        """Staleness property (:data:`getter`/:data:`setter`) of an instance of
+        a class :class:`_Service`. :data:`stale_while_revalidate` is the maximum 
+        time (in seconds) during which a cached response which has expired (see
+        :data:`expire_after`) is still returned as is, while it is refreshed in 
+        background by the pool of threads of the service. When :data:`None` (or 
+        0), expired responses are downloaded again before being returned.
+        """
+        return self.__stale_while_revalidate
+    @stale_while_revalidate.setter#analysis:ignore
+    def stale_while_revalidate(self, stale):
+        if isinstance(stale, datetime.timedelta):
+            stale = stale.total_seconds()
+        if not (stale is None or isinstance(stale, (int, float)) and not isinstance(stale, bool) and stale >= 0):
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_STALE.upper())
+        self.__stale_while_revalidate = stale or None
+
+    #/************************************************************************/
+    def __is_stale(self, pathname, expire_after):
+        #ignore-doc
+        # check whether a cached file has expired, but not for longer than the
+        # staleness accepted by the service
+        if self.__stale_while_revalidate is None or not isinstance(expire_after, (int, float)) \
+                or expire_after <= 0:
+            return False
+        try:
+            age = time.time() - self.__cached_time(pathname)
+        except OSError:
+            return False
+        return expire_after <= age < expire_after + self.__stale_while_revalidate
+
+    #/************************************************************************/
+    def __refresh_cache(self, url, pathname, cache_store, expire_after):
+        #ignore-doc
+        # refresh a stale cached file in background, once at a time
+        with _Service.__flight_lock:
+            if pathname in _Service.__refreshing:
+                return
+            _Service.__refreshing.add(pathname)
+        def refresh():
+            try:
+                with self.__lock_cache(pathname, cache_store):
+                    # another process may have refreshed it already
+                    if self.__is_cached(pathname, expire_after) is False and self.__asynchronous is True:
+                        asyncio.run(self.__async_in_thread(self.__async_download, url, pathname, False, cache_store))
+                    elif self.__is_cached(pathname, expire_after) is False:
+                        self.__sync_download(url, pathname, False, cache_store)
+            except Exception:
+                happyVerbose('background refresh of %s failed' % url)
+            finally:
+                with _Service.__flight_lock:
+                    _Service.__refreshing.discard(pathname)
+        try:
+            self.__get_executor().submit(refresh)
+        except RuntimeError: # executor shut down
+            with _Service.__flight_lock:
+                _Service.__refreshing.discard(pathname)
+
+    #/************************************************************************/
+    async \
+    def __async_in_thread(self, func, *args):
+        #ignore-doc
+        # run a coroutine of the service taking a client session from a worker 
+        # thread: the loop of the service may be running in another thread, so
+        # that it is run on a loop of its own, with a client session of its own
+        async with aiohttp.ClientSession() as session:
+            return await func(session, *args)
+
+    #/************************************************************************/   
+    @staticmethod
+    def __check_status(status):
+        # check the status code returned by the server, whatever the request 
+        # (HEAD or GET) and the implementation (sequential or asynchronous)
+        try:
+            name = settings.HTTP_ERROR_STATUS[status]['name']
+            desc = settings.HTTP_ERROR_STATUS[status]['desc']
+        except KeyError:
+            name = desc = 'Unknown error'#analysis:ignore
+        happyVerbose('response status from web-service: %s ("%s")' % (status,name))
+        try:
+            assert isinstance(status,int) and status < 400
+        except:
+            raise happyError('wrong request - %s status ("%s") returned' % (status,name))  
+        return status
+
+    #/************************************************************************/   
+    def __get_status(self, url):
+        # sequential implementation of get_status
+        try:
+            response = self.__sync_request(url, 'head')
+        except requests.ConnectionError:
+            raise happyError('connection failed - a Connection error occurred')  
+        except requests.HTTPError:
+            raise happyError('request failed - an HTTP error occurred.')  
+        else:
+            status = response.status_code
+        try:
+            self.__check_status(status)
+        finally:
+            response.close()
+        return status
+
+    #/************************************************************************/
+    async def __aio_get_status(self, session, url):
+        # asynchronous implementation of get_status
+        try:
+            response = await self.__async_request(session, url, 'head')
+        except Exception as e: # aiohttp.ClientConnectionError:
+            raise happyError('connection failed', errtype=e)  
+        else: 
+            status = response.status
+        async with response:
+            self.__check_status(status)
+        return status
+        
+    #/************************************************************************/ 
+    @_Decorator.parse_url
+    def get_status(self, *url, **kwargs):
+        """Retrieve the header of a URL and return the server's status code.
+        
+            >>> status = serv.get_status(*url)
+            
+        Arguments
+        ---------
+        url : str
+            complete URL name(s) whom status will be checked.
+        
+        Returns
+        -------
+        status : int
+            response status code(s).
+            
+        Raises
+        ------
+        happyError
+            error is raised in the cases:
+                
+                * the request is wrongly formulated,
+                * the connection fails.
+            
+        Examples
+        --------
+        We can see the response status code when connecting to different web-pages
+        or services:
+        
+            >>> serv = base._Service()
+            >>> serv.get_status('http://dumb')
+                Cannot connect to host dumb:80 ssl:None [nodename nor servname provided, or not known]: connection failed
+            >>> serv.get_status('http://www.dumbanddumber.com')
+                301 
+        
+        Let us actually check that the status is ok when connecting to |Eurostat| website:
+            
+            >>> stat = serv.get_status(settings.ESTAT_URL)
+            >>> print(stat)
+                200
+            >>> import requests
+            >>> stat == requests.codes.ok
+                True
+        
+        See also
+        --------
+        :meth:`~_Service.get_response`, :meth:`~_Service.build_url`.
+        """ 
+        try:
+            assert _Decorator.KW_URL in kwargs
+        except:
+            pass
+        else:
+            url = kwargs.pop(_Decorator.KW_URL)
+        #if len(urls)==1 and happyType.issequence(urls[0]):
+        #    urls = urls[0]
+        #try:
+        #    assert all([happyType.isstring(url) for url  in urls])
+        #except:
+        #    raise happyError('wrong type for input URLs')
+        if self.__asynchronous is False:
+            try:
+                status = self.__sync_map(self.__get_status, url)
+            except happyError as e:
+                raise happyError(errtype=e) # 'sequential status extraction error'
+        else:
+            async def aio_get_all_status(url):
+                session = await self.__get_aio_session()
+                # tasks to do
+                tasks = [self.__aio_get_status(session, u) for u in url]
+                # gather task responses
+                return await asyncio.gather(*tasks, return_exceptions=True) 
+            try:
+                status = self.__run_async(aio_get_all_status(url)) # loop until done
+            except happyError as e:
+                raise happyError(errtype=e) # 'asynchronous status extraction error'
+        status = [s if isinstance(s,int) else -1 for s in status]
+        return status if status in ([],None) or len(status)>1 else status[0]
+
+    #/************************************************************************/
+    @staticmethod
+    def __default_cache():
+        #ignore-doc
+        # create default pathname for cache directory depending on OS platform.
+        # inspired by `Python` package `mod:wbdata`: default path defined for 
+        # `property:path` property of `class:Cache` class.
+        platform = sys.platform
+        if platform.startswith("win"): # windows
+            basedir = os.getenv("LOCALAPPDATA",os.getenv("APPDATA",os.path.expanduser("~")))
+        elif platform.startswith("darwin"): # Mac OS
+            basedir = os.path.expanduser("~/Library/Caches")
+        else:
+            basedir = os.getenv("XDG_CACHE_HOME",os.path.expanduser("~/.cache"))
+        return os.path.join(basedir, settings.PACKAGE)    
+
+    #/************************************************************************/
+    @staticmethod
+    def __build_cache(url, cache_store):
+        #ignore-doc
+        # build unique filename from URL name and cache directory, e.g. using 
+        # hashlib encoding; the URL is normalised first so that logically 
+        # identical requests share the same entry.
+        # :param url:
+        # :param cache_store:
+        # :returns: a unique pathname representing the input URL
+        pathname = _Service.__normalise_url(url, canonical=True).encode('utf-8')
+        try:
+            pathname = hashlib.md5(pathname).hexdigest()
+        except:
+            pathname = pathname.hex()
+        # shard the cache so as to keep directories small
+        return os.path.join(cache_store or './', pathname[:settings.CACHE_SHARD_WIDTH], pathname)
+
+    #/************************************************************************/
+    @staticmethod
+    def __migrate_cache(pathname, cache_store):
+        #ignore-doc
+        # move an entry (and its sidecar) of the former flat layout of the cache
+        # into its shard
+        legacy = os.path.join(cache_store or './', os.path.basename(pathname))
+        if legacy == pathname or not os.path.isfile(legacy) or os.path.exists(pathname):
+            return
+        happyVerbose("migrating disk file %s to %s" % (legacy, pathname))
+        os.makedirs(os.path.dirname(pathname), exist_ok=True)
+        for ext in ('', settings.CACHE_META_EXT):
+            try:
+                os.replace(legacy + ext, pathname + ext)
+            except OSError:
+                pass
+        _CacheIndex.forget(legacy)
+
+    #/************************************************************************/
+    @staticmethod
+    @contextlib.contextmanager
+    def __lock_cache(pathname, cache_store):
+        #ignore-doc
+        # hold the (exclusive) lock of a cache entry, shared by all processes 
+        # using the same cache
+        if fcntl is None:
+            yield
+            return
+        lockdir = os.path.join(cache_store, settings.CACHE_LOCK_DIR)
+        os.makedirs(lockdir, exist_ok=True)
+        lockname = os.path.join(lockdir, os.path.basename(pathname)[:settings.CACHE_LOCK_WIDTH])
+        with open(lockname, 'a') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    #/************************************************************************/
+    @staticmethod
+    @contextlib.asynccontextmanager
+    async def __alock_cache(pathname, cache_store):
+        #ignore-doc
+        # asynchronous version of __lock_cache: the lock is polled so that the
+        # running event loop is not blocked
+        if fcntl is None:
+            yield
+            return
+        lockdir = os.path.join(cache_store, settings.CACHE_LOCK_DIR)
+        os.makedirs(lockdir, exist_ok=True)
+        lockname = os.path.join(lockdir, os.path.basename(pathname)[:settings.CACHE_LOCK_WIDTH])
+        with open(lockname, 'a') as f:
+            while True:
+                try:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    await asyncio.sleep(0.01)
+                else:
+                    break
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    #/************************************************************************/
+    @staticmethod
+    def __atomic_write(pathname, data, mode='wb'):
+        #ignore-doc
+        # write data to a temporary file which is then synced to disk and renamed,
+        # so that readers never see partial files
+        fd, tmpname = tempfile.mkstemp(suffix=settings.CACHE_TMP_EXT, 
+                                       dir=os.path.dirname(pathname) or None)
+        try:
+            with os.fdopen(fd, mode) as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmpname, pathname)
+        except:
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+            raise
+
+    #/************************************************************************/
+    @staticmethod
+    def __is_cached(pathname, time_out): # note: we check a path here
+        #ignore-doc
+        if not os.path.exists(pathname):
+            resp = False
+        elif time_out is None:
+            resp = True
+        elif time_out < 0:
+            resp = True
+        elif time_out == 0:
+            resp = False
+        else:
+            cur = time.time()
+            mtime = _Service.__cached_time(pathname)
+            happyVerbose("%s - last modified: %s" % (pathname,time.ctime(mtime)))
+            resp = cur - mtime < time_out
+        return resp
+    
+    #/************************************************************************/
+    @_Decorator.parse_url
+    def is_cached(self, *url, **kwargs):
+        """Check whether a URL has been already cached.
+        
+        Returns
         -------
-        status : int
-            response status code(s).
-            
-        Raises
-        ------
-        happyError
-            error is raised in the cases:
-                
-                * the request is wrongly formulated,
-                * the connection fails.
+        ans : bool, list[bool] 
+            True if the input URL(s) can be retrieved from the disk (cache).,
+        """
+        try:
+            assert _Decorator.KW_URL in kwargs
+        except:
+            pass
+        else:
+            url = kwargs.pop(_Decorator.KW_URL)
+        cache_store = kwargs.get(_Decorator.KW_CACHE) or self.cache_store or True
+        if isinstance(cache_store, bool) and cache_store is True:
+            cache_store = self.__default_cache()
+        expire_after = kwargs.get(_Decorator.KW_EXPIRE) or self.expire_after
+        pathnames = [self.__build_cache(u, cache_store) for u in url]
+        [self.__migrate_cache(p, cache_store) for p in pathnames]
+        expire_after = [self.__expire_for(u, expire_after) for u in url]
+        ans = [self.__is_cached(p, e) or self.__is_packed(p, cache_store, e)
+               for p, e in zip(pathnames, expire_after)]
+        return ans if len(ans)>1 else ans[0]
+    
+    #/************************************************************************/
+    @staticmethod
+    def __clean_cache(pathname, time_expiration): # note: we clean a path here
+        #ignore-doc
+        if not os.path.exists(pathname):
+            resp = False
+        elif time_expiration is None or time_expiration <= 0:
+            resp = True
+        else:
+            cur = time.time()
+            mtime = _Service.__cached_time(pathname)
+            happyVerbose("%s - last modified: %s" % (pathname,time.ctime(mtime)))
+            resp = cur - mtime >= time_expiration
+        if resp is True:
+            happyVerbose("removing disk file %s" % pathname)
+            _Service.__memory.pop(pathname)
+            _CacheIndex.forget(pathname)
+            if os.path.isfile(pathname):
+                os.remove(pathname)
+                for ext in (settings.CACHE_META_EXT, settings.CACHE_DECODED_EXT, settings.CACHE_PART_EXT,
+                            settings.CACHE_PART_EXT + settings.CACHE_META_EXT):
+                    if os.path.exists(pathname + ext):
+                        os.remove(pathname + ext)
+            elif os.path.isdir(pathname):
+                shutil.rmtree(pathname) 
             
+    #/************************************************************************/
+    @staticmethod
+    def __clean_pack(pathname, cache_store, time_expiration):
+        #ignore-doc
+        # remove a response from the pack file, with the same rule as __clean_cache
+        pack, key = _PackStore.get(cache_store), os.path.basename(pathname)
+        entry = pack.read(key)
+        if entry is None:
+            return
+        elif time_expiration is None or time_expiration <= 0                \
+                or time.time() - entry[1] >= time_expiration:
+            happyVerbose("removing packed response %s" % key)
+            pack.delete(key)
+            _Service.__memory.pop(pathname)
+
+    #/************************************************************************/
+    @_Decorator.parse_url
+    def clean_cache(self, *url, **kwargs):
+        """Clean a cached file or a cached repository.
+
         Examples
         --------
-        We can see the response status code when connecting to different web-pages
-        or services:
-        
-            >>> serv = base._Service()
-            >>> serv.get_status('http://dumb')
-                Cannot connect to host dumb:80 ssl:None [nodename nor servname provided, or not known]: connection failed
-            >>> serv.get_status('http://www.dumbanddumber.com')
-                301 
         
-        Let us actually check that the status is ok when connecting to |Eurostat| website:
+            >>> serv = services.GISCOService()
+            >>> serv.clean_cache()
             
-            >>> stat = serv.get_status(settings.ESTAT_URL)
-            >>> print(stat)
-                200
-            >>> import requests
-            >>> stat == requests.codes.ok
-                True
-        
-        See also
-        --------
-        :meth:`~_Service.get_response`, :meth:`~_Service.build_url`.
-        """ 
+        To be sure, one can enfore the :data:`expire_after` parameter:
+            
+            >>> serv.clean_cache(expire_after=0)
+            
+        Note
+        ----
+        The responses pinned in the cache, *i.e.* whose lifetime is :data:`settings.CACHE_NEVER_EXPIRE`
+        (see :data:`settings.CACHE_POLICIES`), are kept when the whole cache is 
+        cleaned, unless another lifetime is explicitly set as above.
+        """
         try:
             assert _Decorator.KW_URL in kwargs
         except:
             pass
         else:
-            url = kwargs.pop(_Decorator.KW_URL)
-        #if len(urls)==1 and happyType.issequence(urls[0]):
-        #    urls = urls[0]
+            url = kwargs.pop(_Decorator.KW_URL,None)
+        cache_store = kwargs.get(_Decorator.KW_CACHE) or self.cache_store or True
+        if isinstance(cache_store, bool) and cache_store is True:
+            cache_store = self.__default_cache()
+        # a null lifetime is explicit here (see the examples above)
+        expire_after = kwargs.get(_Decorator.KW_EXPIRE, self.expire_after)
+        packed = os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME))
+        if url in ((),None):
+            aside, pinned = self.__set_aside_pinned(cache_store, expire_after)
+            pathnames = os.scandir(cache_store) 
+            expire_after = itertools.repeat(self.__expire_for(None, expire_after))
+        else:
+            pathnames = [self.__build_cache(u, cache_store) for u in url]
+            expire_after = [self.__expire_for(u, expire_after) for u in url]
+        for pathname, expire in zip(pathnames, expire_after):
+            if url not in ((),None):
+                self.__migrate_cache(pathname, cache_store)
+                self.__clean_cache(pathname, expire)
+                if packed is True:
+                    self.__clean_pack(pathname, cache_store, expire)
+            elif pathname.is_dir():
+                self.__clean_cache(pathname.path, expire)
+        if url not in ((),None) and os.path.isdir(cache_store):
+            _CacheIndex.get(cache_store, memory=_Service.__memory).collect()
         #try:
-        #    assert all([happyType.isstring(url) for url  in urls])
-        #except:
-        #    raise happyError('wrong type for input URLs')
-        if ASYNCIO_AVAILABLE is False:
+        #    os.rmdir(cache_store)
+        #except OSError:
+        #    pass # the directory was not empty
+        if url in ((),None):
+            _Service.__memory.clear(prefix=os.path.join(cache_store, ''))
+            _CacheIndex.drop(cache_store)
+            if packed is True:
+                _PackStore.get(cache_store).close()
+                _PackStore.drop(cache_store)
+            shutil.rmtree(cache_store) 
+            self.__restore_pinned(cache_store, aside, pinned)
+                        
+    #/************************************************************************/
+    def __set_aside_pinned(self, cache_store, expire_after):
+        #ignore-doc
+        # set aside the pinned responses (see settings.CACHE_NEVER_EXPIRE) of a
+        # cache about to be removed, as identified by the URL in their sidecar:
+        # the files are moved to a sibling directory, while the packed responses
+        # are loaded (they are small); return both
+        def is_pinned(meta):
+            return meta.get('url') is not None and meta.get('negative') is None \
+                and self.__expire_for(meta['url'], expire_after) == settings.CACHE_NEVER_EXPIRE
+        aside, pinned = None, []
+        for pathname in list(self.__cache_entries(cache_store)):
+            if is_pinned(self.__read_meta(pathname)) is False:
+                continue
+            elif aside is None:
+                aside = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(cache_store)))
+            asidename = os.path.join(aside, os.path.relpath(pathname, cache_store))
+            os.makedirs(os.path.dirname(asidename), exist_ok=True)
+            for ext in ('', settings.CACHE_META_EXT, settings.CACHE_DECODED_EXT):
+                if os.path.exists(pathname + ext):
+                    os.replace(pathname + ext, asidename + ext)
+        if os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME)):
+            pack = _PackStore.get(cache_store)
+            pinned = [(key, entry) for (key, entry) in [(k, pack.read(k)) for k in pack.keys()] 
+                      if entry is not None and is_pinned(entry[2])]
+        return aside, pinned
+
+    #/************************************************************************/
+    def __restore_pinned(self, cache_store, aside, pinned):
+        #ignore-doc
+        # move the pinned responses set aside back into the (emptied) cache
+        if aside is None and pinned == []:
+            return
+        os.makedirs(cache_store, exist_ok=True)
+        if aside is not None:
+            for root, _, files in os.walk(aside):
+                for name in files:
+                    pathname = os.path.join(cache_store, os.path.relpath(os.path.join(root, name), aside))
+                    os.makedirs(os.path.dirname(pathname), exist_ok=True)
+                    os.replace(os.path.join(root, name), pathname)
+            shutil.rmtree(aside, ignore_errors=True)
+        for key, (content, mtime, meta) in pinned:
+            _PackStore.get(cache_store).write(key, content, mtime, meta)
+                        
+    #/************************************************************************/
+    @staticmethod
+    def __is_key(name):
+        #ignore-doc
+        # check whether a filename is the key (md5) of a cached response
+        return len(name) == 32 and all([c in '0123456789abcdef' for c in name])
+
+    #/************************************************************************/
+    def __cache_entries(self, cache_store):
+        #ignore-doc
+        # iterate over the pathnames of the responses cached in files, from the 
+        # shards of the cache directory (and its former flat layout)
+        for root, dirs, files in os.walk(cache_store):
+            dirs[:] = [d for d in dirs if len(d) == settings.CACHE_SHARD_WIDTH]
+            for name in filter(self.__is_key, files):
+                yield os.path.join(root, name)
+                
+    #/************************************************************************/
+    def export_cache(self, archive, *url, **kwargs):
+        """Export a snapshot of the cache into a single compressed archive, so 
+        that it can be imported on other nodes (see :meth:`~_Service.import_cache`).
+        
+            >>> manifest = serv.export_cache(archive, *url, **kwargs)
+            
+        Arguments
+        ---------
+        archive : str
+            path of the :literal:`tar.gz` archive to create.
+        url : str
+            complete URL name(s) of the cached responses to export; when none is
+            passed, the whole cache is exported.
+            
+        Keyword arguments
+        -----------------
+        cache_store : str
+            cache directory; default to :data:`cache_store`.
+            
+        Returns
+        -------
+        manifest : dict
+            the manifest stored in the archive (as :literal:`manifest.json`), which
+            maps the keys of the cached responses to their URL (when known), their
+            time of download (or revalidation), their size and their validators.
+            
+        Note
+        ----
+        Every response is exported from an open handle of its cached file, which
+        is only ever replaced atomically, so that the archive is consistent even 
+        when the cache is used concurrently. The archive itself is written to a 
+        temporary file which is then renamed.
+        """
+        try:
+            assert happyType.isstring(archive)
+        except:
+            raise happyError('wrong type for ARCHIVE parameter')
+        url = url or kwargs.pop(_Decorator.KW_URL, None) or ()
+        if happyType.isstring(url):
+            url = [url,]
+        cache_store = kwargs.get(_Decorator.KW_CACHE) or self.cache_store or True
+        if isinstance(cache_store, bool) and cache_store is True:
+            cache_store = self.__default_cache()
+        if not os.path.isdir(cache_store):
+            raise happyError('cache %s is not a directory' % cache_store)
+        packed = os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME))
+        if url in ((),[]):
+            pathnames, urls = self.__cache_entries(cache_store), {}
+            keys = _PackStore.get(cache_store).keys() if packed is True else []
+        else:
+            pathnames = [self.__build_cache(u, cache_store) for u in url]
+            urls = {os.path.basename(p): u for (p, u) in zip(pathnames, url)}
+            [self.__migrate_cache(p, cache_store) for p in pathnames]
+            keys = list(urls.keys()) if packed is True else []
+        manifest = {'format': settings.CACHE_BUNDLE_FORMAT, 'created': time.time(), 'entries': {}}
+        def add(tar, key, f, size, mtime, meta):
+            info = tarfile.TarInfo(settings.CACHE_BUNDLE_DATA + '/' + key)
+            info.size, info.mtime = size, mtime
+            tar.addfile(info, f)
+            manifest['entries'][key] = {'url': meta.pop('url', None) or urls.get(key), 
+                                        'mtime': mtime, 'size': size, 'meta': meta}
+        tmpname = archive + settings.CACHE_TMP_EXT
+        try:
+            with tarfile.open(tmpname, 'w:gz') as tar:
+                for pathname in pathnames:
+                    key = os.path.basename(pathname)
+                    try:
+                        f = open(pathname, 'rb')
+                    except OSError:
+                        continue # not cached, or packed
+                    with f:
+                        meta, st = self.__read_meta(pathname), os.fstat(f.fileno())
+                        mtime = meta.pop('time', None) # see __cached_time
+                        add(tar, key, f, st.st_size, mtime if st.st_nlink > 1 and mtime else st.st_mtime, meta)
+                for key in keys:
+                    entry = None if key in manifest['entries'] else _PackStore.get(cache_store).read(key)
+                    if entry is not None:
+                        content, mtime, meta = entry
+                        add(tar, key, io.BytesIO(content), len(content), mtime, meta)
+                data = json.dumps(manifest).encode('utf-8')
+                info = tarfile.TarInfo(settings.CACHE_BUNDLE_MANIFEST)
+                info.size, info.mtime = len(data), manifest['created']
+                tar.addfile(info, io.BytesIO(data))
+            os.replace(tmpname, archive)
+        except (OSError, tarfile.TarError):
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+            raise happyError('cache not exported into %s' % archive)
+        happyVerbose('%s cached responses exported into %s' % (len(manifest['entries']), archive))
+        return manifest
+
+    #/************************************************************************/
+    def import_cache(self, archive, **kwargs):
+        """Import into the cache the responses of an archive created with the 
+        method :meth:`~_Service.export_cache`.
+        
+            >>> report = serv.import_cache(archive, overwrite=False, **kwargs)
+            
+        Arguments
+        ---------
+        archive : str
+            path of the :literal:`tar.gz` archive to import.
+            
+        Keyword arguments
+        -----------------
+        overwrite : bool
+            when :data:`False`, cached responses which are more recent than those
+            of the archive are kept; default to :data:`False`.
+        cache_store : str
+            cache directory; default to :data:`cache_store`.
+            
+        Returns
+        -------
+        report : dict
+            a dictionary with the number of responses :literal:`'imported'` and 
+            :literal:`'skipped'`.
+            
+        Raises
+        ------
+        happyError
+            error is raised when the archive is not valid, in which case nothing
+            is imported.
+            
+        Note
+        ----
+        The whole archive is first extracted and checked against its manifest, 
+        then every response is moved into the cache atomically (together with 
+        its time of download and its validators), so that its expiration is 
+        preserved. Responses are stored under the key of their URL when it is
+        known, under their exported key otherwise.
+        """
+        overwrite = kwargs.pop('overwrite', False)
+        if not isinstance(overwrite, bool):
+            raise happyError('wrong type for OVERWRITE parameter')
+        cache_store = kwargs.get(_Decorator.KW_CACHE) or self.cache_store or True
+        if isinstance(cache_store, bool) and cache_store is True:
+            cache_store = self.__default_cache()
+        os.makedirs(cache_store, exist_ok=True)
+        # the temporary directory is ignored by the index of the cache (which 
+        # skips files with a temporary extension)
+        tmpdir = tempfile.mkdtemp(dir=cache_store, prefix='.', suffix=settings.CACHE_TMP_EXT)
+        report = {'imported': 0, 'skipped': 0}
+        try:
             try:
-                status = [self.__get_status(u) for u in url]
-            except happyError as e:
-                raise happyError(errtype=e) # 'sequential status extraction error'
+                with tarfile.open(archive, 'r:gz') as tar:
+                    manifest = json.load(tar.extractfile(settings.CACHE_BUNDLE_MANIFEST))
+                    assert manifest.get('format') == settings.CACHE_BUNDLE_FORMAT
+                    entries = manifest['entries']
+                    for key, entry in entries.items():
+                        assert self.__is_key(key)
+                        member = tar.getmember(settings.CACHE_BUNDLE_DATA + '/' + key)
+                        assert member.isfile() and member.size == entry['size']
+                        with tar.extractfile(member) as src, \
+                                open(os.path.join(tmpdir, key + settings.CACHE_TMP_EXT), 'wb') as dst:
+                            shutil.copyfileobj(src, dst)
+                            dst.flush()
+                            os.fsync(dst.fileno())
+            except (OSError, KeyError, ValueError, TypeError, AssertionError, tarfile.TarError):
+                raise happyError('archive %s not recognised' % archive)
+            packed = os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME))
+            for key, entry in entries.items():
+                url = entry.get('url')
+                pathname = self.__build_cache(url, cache_store) if url is not None             \
+                    else os.path.join(cache_store, key[:settings.CACHE_SHARD_WIDTH], key)
+                with self.__lock_cache(pathname, cache_store):
+                    if overwrite is False and os.path.exists(pathname)                      \
+                            and self.__cached_time(pathname) >= entry['mtime']:
+                        report['skipped'] += 1
+                        continue
+                    os.makedirs(os.path.dirname(pathname), exist_ok=True)
+                    tmpname = os.path.join(tmpdir, key + settings.CACHE_TMP_EXT)
+                    os.utime(tmpname, (time.time(), entry['mtime']))
+                    meta, metaname = dict(entry.get('meta') or {}), pathname + settings.CACHE_META_EXT
+                    if meta != {}:
+                        meta.update({'url': url})
+                        self.__atomic_write(metaname, json.dumps(meta), mode='w')
+                    elif os.path.exists(metaname):
+                        os.remove(metaname)
+                    os.replace(tmpname, pathname)
+                    # drop whatever was derived from the former response
+                    if os.path.exists(pathname + settings.CACHE_DECODED_EXT):
+                        os.remove(pathname + settings.CACHE_DECODED_EXT)
+                    _Service.__memory.pop(pathname)
+                    if packed is True:
+                        _PackStore.get(cache_store).delete(os.path.basename(pathname))
+                self.__record_access(pathname, cache_store, None)
+                report['imported'] += 1
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        happyVerbose('%(imported)s cached responses imported, %(skipped)s skipped' % report)
+        return report
+
+    #/************************************************************************/
+    @staticmethod
+    def __read_meta(pathname):
+        #ignore-doc
+        # load the sidecar of a cached response, i.e. the URL and the validators
+        # (ETag, Last-Modified) returned with the response
+        try:
+            with open(pathname + settings.CACHE_META_EXT, 'r') as f:
+                meta = json.load(f)
+            assert happyType.ismapping(meta)
+        except:
+            meta = {}
+        return meta
+
+    #/************************************************************************/
+    @staticmethod
+    def __write_meta(pathname, url, headers, **flags):
+        #ignore-doc
+        # store the validators (and flags) of a response in the sidecar of the 
+        # cached file; a former sidecar is removed when there is none
+        meta = {h: headers.get(h) for h in settings.CACHE_VALIDATORS if headers.get(h)}
+        meta.update(flags)
+        metaname = pathname + settings.CACHE_META_EXT
+        if meta == {}:
+            if os.path.exists(metaname):
+                os.remove(metaname)
+            return
+        meta.update({'url': url})
+        _Service.__atomic_write(metaname, json.dumps(meta), mode='w')
+
+    #/************************************************************************/
+    @staticmethod
+    def __pin_meta(pathname, url):
+        #ignore-doc
+        # record the URL of a pinned response in its sidecar, whether validators
+        # were returned or not, so that the response is identified (and kept) 
+        # when the whole cache is cleaned
+        if not os.path.exists(pathname):
+            return
+        meta = _Service.__read_meta(pathname)
+        if meta.get('url') != url:
+            meta.update({'url': url})
+            _Service.__atomic_write(pathname + settings.CACHE_META_EXT, json.dumps(meta), mode='w')
+
+    #/************************************************************************/
+    @staticmethod
+    def __stamp_meta(pathname, mtime):
+        #ignore-doc
+        # store the time a cached file was downloaded (or revalidated) in its 
+        # sidecar, since its modification time is shared with the other files 
+        # hard-linked to the same body (see __link_object)
+        meta = _Service.__read_meta(pathname)
+        meta.update({'time': mtime})
+        _Service.__atomic_write(pathname + settings.CACHE_META_EXT, json.dumps(meta), mode='w')
+
+    #/************************************************************************/
+    @staticmethod
+    def __cached_time(pathname, st=None):
+        #ignore-doc
+        # return the time a cached file was downloaded (or revalidated), which
+        # its freshness is checked against: its modification time, unless it is
+        # hard-linked to a shared body, in which case the time is kept in the
+        # sidecar; raise OSError when the file does not exist
+        st = st or os.stat(pathname)
+        if st.st_nlink > 1:
+            return _Service.__read_meta(pathname).get('time', st.st_mtime)
+        return st.st_mtime
+
+    #/************************************************************************/
+    @staticmethod
+    def __conditional_headers(pathname, force_download, cache_store):
+        #ignore-doc
+        # build the headers of a conditional request so as to revalidate an 
+        # expired cached response instead of downloading it again
+        if force_download is True or cache_store in (None,False) or not os.path.exists(pathname):
+            return {}
+        meta = _Service.__read_meta(pathname)
+        return {c: meta[v] for (v,c) in settings.CACHE_VALIDATORS.items() if v in meta}
+    
+    #/************************************************************************/
+    @staticmethod
+    def __revalidate_cache(pathname, url):
+        #ignore-doc
+        # the server acknowledged (304 status) that the cached response is still
+        # valid: refresh its download time so that it is not expired anymore, 
+        # without changing the time of the other files linked to the same body
+        happyVerbose("cached response of %s not modified - revalidated" % url)
+        if os.stat(pathname).st_nlink > 1:
+            _Service.__stamp_meta(pathname, time.time())
         else:
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            loop = asyncio.get_event_loop() # event loop
-            async def aio_get_all_status(loop, url):
-                async with aiohttp.ClientSession(loop=loop, raise_for_status=True) as session:
-                    # tasks to do
-                    tasks = [self.__aio_get_status(session, u) for u in url]
-                    # gather task responses
-                    return await asyncio.gather(*tasks, return_exceptions=True) 
+            os.utime(pathname, None)
+
+    #/************************************************************************/
+    @staticmethod
+    def __resume_headers(pathname, headers):
+        #ignore-doc
+        # complete the headers of a request with a range request whenever a 
+        # partial download of the response is available: the download is then
+        # resumed, provided the resource did not change in the meantime (see 
+        # the validator passed to 'If-Range')
+        partname = pathname + settings.CACHE_PART_EXT
+        try:
+            offset = os.path.getsize(partname)
+            meta = _Service.__read_meta(partname)
+            assert offset > 0 and (meta.get('ETag') or meta.get('Last-Modified'))
+        except:
+            return partname, headers, 0
+        headers = dict(headers)
+        headers.update({'Range': 'bytes=%s-' % offset,
+                        'If-Range': meta.get('ETag') or meta.get('Last-Modified')})
+        return partname, headers, offset
+
+    #/************************************************************************/
+    @staticmethod
+    def __check_resume(partname, offset, status, headers):
+        #ignore-doc
+        # check the status of a (possibly resumed) download: return True when
+        # the response shall be appended to the partial file, False when the
+        # download restarts from zero; when the range could not be satisfied
+        # the partial file is dropped and None is returned
+        if offset == 0 or status == 200:
+            return False
+        elif status == 206                                                  \
+                and (headers.get('Content-Range') or '').startswith('bytes %s-' % offset):
+            happyVerbose("resuming download of %s from byte %s" % (partname, offset))
+            return True
+        elif status in (206, 416):
+            _Service.__remove_part(partname)
+            return None
+        return False
+
+    #/************************************************************************/
+    def __flag_negative(self, partname, url, status, headers):
+        #ignore-doc
+        # flag a complete download as negative in its sidecar when it is either
+        # an error response or a (small) JSON response with no results
+        if self.__expire_negative is None:
+            return
+        elif status not in settings.CACHE_NEGATIVE_STATUS:
             try:
-                future = asyncio.ensure_future(aio_get_all_status(loop, url)) 
-                # future = loop.create_task(aio_get_all_status(urls))
-                status = loop.run_until_complete(future) # loop until done
-                # status = future.result()
-            except happyError as e:
-                raise happyError(errtype=e) # 'asynchronous status extraction error'
-            finally:
-                loop.close()  
-        status = [s if isinstance(s,int) else -1 for s in status]
-        return status if status in ([],None) or len(status)>1 else status[0]
+                assert os.path.getsize(partname) <= settings.CACHE_NEGATIVE_MAX_SIZE
+                with open(partname, 'rb') as f:
+                    data = json.loads(f.read().decode())
+            except:
+                return
+            if not (data == [] or happyType.ismapping(data)                 \
+                    and any([data.get(k) == [] for k in settings.CACHE_NEGATIVE_KEYS])):
+                return
+        happyVerbose("negative response of %s cached (status %s)" % (url, status))
+        self.__write_meta(partname, url, headers, negative=status)
+
+    #/************************************************************************/
+    @staticmethod
+    def __read_negative(pathname):
+        #ignore-doc
+        # return the status of a negative cached response, None otherwise
+        if not os.path.exists(pathname + settings.CACHE_META_EXT):
+            return None
+        return _Service.__read_meta(pathname).get('negative')
+
+    #/************************************************************************/
+    def __expire_negative_for(self, pathname, expire_after):
+        #ignore-doc
+        # shorten the lifetime of a negative cached response
+        if self.__expire_negative is None or self.__read_negative(pathname) is None:
+            return expire_after
+        elif expire_after is None or expire_after < 0:
+            return self.__expire_negative
+        return min(expire_after, self.__expire_negative)
+
+    #/************************************************************************/
+    def __check_negative(self, pathname, cache_store, expire_after):
+        #ignore-doc
+        # raise the error of a negative cached response (once its access has 
+        # been recorded), and drop it from the memory cache; return whether the
+        # response is negative
+        status = self.__read_negative(pathname)
+        if status is None:
+            return False
+        _Service.__memory.pop(pathname)
+        self.__record_access(pathname, cache_store, expire_after)
+        if status in settings.CACHE_NEGATIVE_STATUS:
+            self.__check_status(status)
+        return True
 
     #/************************************************************************/
     @staticmethod
-    def __default_cache():
+    def __remove_part(partname):
         #ignore-doc
-        # create default pathname for cache directory depending on OS platform.
-        # inspired by `Python` package `mod:wbdata`: default path defined for 
-        # `property:path` property of `class:Cache` class.
-        platform = sys.platform
-        if platform.startswith("win"): # windows
-            basedir = os.getenv("LOCALAPPDATA",os.getenv("APPDATA",os.path.expanduser("~")))
-        elif platform.startswith("darwin"): # Mac OS
-            basedir = os.path.expanduser("~/Library/Caches")
-        else:
-            basedir = os.getenv("XDG_CACHE_HOME",os.path.expanduser("~/.cache"))
-        return os.path.join(basedir, settings.PACKAGE)    
+        for f in (partname, partname + settings.CACHE_META_EXT):
+            if os.path.exists(f):
+                os.remove(f)
 
     #/************************************************************************/
     @staticmethod
-    def __build_cache(url, cache_store):
+    def __commit_part(partname, pathname, cache_store=None):
         #ignore-doc
-        # build unique filename from URL name and cache directory, e.g. using 
-        # hashlib encoding.
-        # :param url:
-        # :param cache_store:
-        # :returns: a unique pathname representing the input URL
-        pathname = url.encode('utf-8')
-        try:
-            pathname = hashlib.md5(pathname).hexdigest()
-        except:
-            pathname = pathname.hex()
-        return os.path.join(cache_store or './', pathname)
+        # atomically move a complete download (and its sidecar) into the cache,
+        # its body being stored once per content (see __link_object) unless it 
+        # is a negative response, whose lifetime is shorter
+        if _Service.__read_meta(partname).get('negative') is None:
+            _Service.__link_object(partname, cache_store)
+        os.replace(partname, pathname)
+        if os.path.exists(partname + settings.CACHE_META_EXT):
+            os.replace(partname + settings.CACHE_META_EXT, pathname + settings.CACHE_META_EXT)
+        elif os.path.exists(pathname + settings.CACHE_META_EXT):
+            os.remove(pathname + settings.CACHE_META_EXT)
 
     #/************************************************************************/
     @staticmethod
-    def __is_cached(pathname, time_out): # note: we check a path here
+    def __link_object(filename, cache_store):
         #ignore-doc
-        if not os.path.exists(pathname):
-            resp = False
-        elif time_out is None:
-            resp = True
-        elif time_out < 0:
-            resp = True
-        elif time_out == 0:
-            resp = False
-        else:
-            cur = time.time()
-            mtime = os.stat(pathname).st_mtime
-            happyVerbose("%s - last modified: %s" % (pathname,time.ctime(mtime)))
-            resp = cur - mtime < time_out
-        return resp
-    
-    #/************************************************************************/
-    @_Decorator.parse_url
-    def is_cached(self, *url, **kwargs):
-        """Check whether a URL has been already cached.
-        
-        Returns
-        -------
-        ans : bool, list[bool] 
-            True if the input URL(s) can be retrieved from the disk (cache).,
-        """
+        # content-addressed storage: turn a file into a hard link to the object 
+        # of the cache with the same content (its own download time being kept
+        # in its sidecar), or store it as a new object; objects no longer linked
+        # are removed by the index of the cache (see _CacheIndex.collect)
+        if settings.CACHE_OBJECTS_DIR in (None,'') or cache_store in (None,False):
+            return
+        digest = hashlib.sha256()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(settings.CACHE_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+        objname = os.path.join(cache_store, settings.CACHE_OBJECTS_DIR, 
+                               digest[:settings.CACHE_SHARD_WIDTH], digest)
         try:
-            assert _Decorator.KW_URL in kwargs
-        except:
+            os.makedirs(os.path.dirname(objname), exist_ok=True)
+            try:
+                os.link(filename, objname)
+            except FileExistsError:
+                _Service.__stamp_meta(filename, os.path.getmtime(filename))
+                os.link(objname, filename + settings.CACHE_TMP_EXT)
+                os.replace(filename + settings.CACHE_TMP_EXT, filename)
+        except OSError:
+            # hard links not supported (or object just collected): the file is 
+            # simply kept as is
             pass
-        else:
-            url = kwargs.pop(_Decorator.KW_URL)
-        cache_store = kwargs.get(_Decorator.KW_CACHE) or self.cache_store or True
-        if isinstance(cache_store, bool) and cache_store is True:
-            cache_store = self.__default_cache()
-        expire_after = kwargs.get(_Decorator.KW_EXPIRE) or self.expire_after
-        ans = [self.__is_cached(self.__build_cache(u, cache_store), expire_after) 
-                for u in url]
-        return ans if len(ans)>1 else ans[0]
-    
+
     #/************************************************************************/
     @staticmethod
-    def __clean_cache(pathname, time_expiration): # note: we clean a path here
+    def __from_memory(pathname, force_download, expire_after):
         #ignore-doc
-        if not os.path.exists(pathname):
-            resp = False
-        elif time_expiration is None or time_expiration <= 0:
-            resp = True
+        # return the content cached in memory for a given pathname when it is
+        # still fresh, None otherwise
+        if force_download is True:
+            return None
+        entry = _Service.__memory.get(pathname)
+        if entry is None:
+            return None
+        content, mtime = entry
+        return content if _Service.__is_fresh(mtime, expire_after) else None
+
+    #/************************************************************************/
+    @staticmethod
+    def __is_fresh(mtime, expire_after):
+        #ignore-doc
+        # check whether an entry cached at a given time has not expired yet
+        return expire_after is None or expire_after < 0                     \
+            or (expire_after > 0 and time.time() - mtime < expire_after)
+
+    #/************************************************************************/
+    def __from_pack(self, pathname, force_download, cache_store, expire_after):
+        #ignore-doc
+        # return the content of a fresh response stored in the pack file, None
+        # otherwise; a stale packed response is moved back to a file (with its
+        # validators) so that it can be revalidated
+        if self.__cache_backend != 'SQLite' or not os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME)):
+            return None
+        pack, key = _PackStore.get(cache_store), os.path.basename(pathname)
+        entry = pack.read(key)
+        if entry is None:
+            return None
+        content, mtime, meta = entry
+        if force_download is False and self.__is_fresh(mtime, expire_after):
+            _Service.__memory.put(pathname, content, mtime)
+            return content
+        if meta != {}:
+            self.__unpack(pathname, cache_store, entry)
         else:
-            cur = time.time()
-            mtime = os.stat(pathname).st_mtime
-            happyVerbose("%s - last modified: %s" % (pathname,time.ctime(mtime)))
-            resp = cur - mtime >= time_expiration
-        if resp is True:
-            happyVerbose("removing disk file %s" % pathname)
-            if os.path.isfile(pathname):
-                os.remove(pathname)
-            elif os.path.isdir(pathname):
-                shutil.rmtree(pathname) 
-            
+            pack.delete(key)
+        return None
+
     #/************************************************************************/
-    @_Decorator.parse_url
-    def clean_cache(self, *url, **kwargs):
-        """Clean a cached file or a cached repository.
+    def __unpack(self, pathname, cache_store, entry=None):
+        #ignore-doc
+        # move a packed response back to a file, with its validators and its 
+        # time of download; return whether the response was packed
+        if self.__cache_backend != 'SQLite' or not os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME)):
+            return False
+        pack, key = _PackStore.get(cache_store), os.path.basename(pathname)
+        entry = entry or pack.read(key)
+        if entry is None:
+            return False
+        content, mtime, meta = entry
+        os.makedirs(os.path.dirname(pathname), exist_ok=True)
+        self.__atomic_write(pathname, content)
+        os.utime(pathname, (mtime, mtime))
+        if meta != {}:
+            self.__atomic_write(pathname + settings.CACHE_META_EXT, json.dumps(meta), mode='w')
+        pack.delete(key)
+        return True
 
-        Examples
-        --------
-        
-            >>> serv = services.GISCOService()
-            >>> serv.clean_cache()
-            
-        To be sure, one can enfore the :data:`expire_after` parameter:
-            
-            >>> serv.clean_cache(expire_after=0)
-            
-        """
+    #/************************************************************************/
+    def __restore_for(self, cache_store, expire_after):
+        #ignore-doc
+        # return the callable passed to the responses whose file may be moved 
+        # into the pack file, None otherwise
+        if self.__cache_backend != 'SQLite':
+            return None
+        return functools.partial(self.__keep_file, cache_store=cache_store, expire_after=expire_after)
+
+    #/************************************************************************/
+    def __keep_file(self, pathname, cache_store, expire_after):
+        #ignore-doc
+        # write back to a file a response moved into the pack file, or only kept
+        # in memory, when its path is requested (see _CachedResponse)
+        with self.__lock_cache(pathname, cache_store):
+            if os.path.exists(pathname) or self.__unpack(pathname, cache_store) is True:
+                pass
+            elif _Service.__memory.get(pathname) is not None:
+                content, mtime = _Service.__memory.get(pathname)
+                os.makedirs(os.path.dirname(pathname), exist_ok=True)
+                self.__atomic_write(pathname, content)
+                os.utime(pathname, (mtime, mtime))
+            else:
+                return
+        self.__record_access(pathname, cache_store, expire_after)
+
+    #/************************************************************************/
+    def __is_packed(self, pathname, cache_store, expire_after):
+        #ignore-doc
+        # check whether a fresh response is stored in the pack file
+        if self.__cache_backend != 'SQLite' or not os.path.exists(os.path.join(cache_store, settings.CACHE_PACK_NAME)):
+            return False
+        entry = _PackStore.get(cache_store).read(os.path.basename(pathname))
+        return entry is not None and self.__is_fresh(entry[1], expire_after)
+
+    #/************************************************************************/
+    def __to_pack(self, pathname, content, cache_store):
+        #ignore-doc
+        # move a small cached file (and its sidecar) into the pack file
+        if self.__cache_backend != 'SQLite' or len(content) > settings.CACHE_PACK_MAX_SIZE:
+            return False
         try:
-            assert _Decorator.KW_URL in kwargs
-        except:
-            pass
-        else:
-            url = kwargs.pop(_Decorator.KW_URL,None)
-        cache_store = kwargs.get(_Decorator.KW_CACHE) or self.cache_store or True
-        if isinstance(cache_store, bool) and cache_store is True:
-            cache_store = self.__default_cache()
-        expire_after = kwargs.get(_Decorator.KW_EXPIRE) or self.expire_after
-        if url in ((),None):
-            pathnames = os.scandir(cache_store) 
-        else:
-            pathnames = [self.__build_cache(u, cache_store) for u in url]
-        for pathname in pathnames:
-            if pathname.is_dir():
-                self.__clean_cache(pathname, expire_after)
-        #try:
-        #    os.rmdir(cache_store)
-        #except OSError:
-        #    pass # the directory was not empty
-        if url in ((),None):
-            shutil.rmtree(cache_store) 
-                        
+            mtime = self.__cached_time(pathname)
+        except OSError:
+            return False
+        meta = self.__read_meta(pathname)
+        meta.pop('time', None) # the pack keeps the time of its entries
+        _PackStore.get(cache_store).write(os.path.basename(pathname), content, mtime, meta)
+        for ext in ('', settings.CACHE_META_EXT):
+            try:
+                os.remove(pathname + ext)
+            except OSError:
+                pass
+        _CacheIndex.forget(pathname)
+        return True
+
+    #/************************************************************************/
+    def __record_access(self, pathname, cache_store, expire_after, from_memory=False):
+        #ignore-doc
+        # record the access to a cached file in the index of the cache: the 
+        # access time of the file is explicitly set (so as not to depend on the 
+        # mount options of the disk) while its modification time is preserved
+        index = self.__cache_index(cache_store, expire_after)
+        if from_memory is True:
+            index.touch(pathname)
+            return
+        try:
+            st, now = os.stat(pathname), time.time_ns()
+            os.utime(pathname, ns=(now, st.st_mtime_ns))
+            mtime = self.__cached_time(pathname, st)
+        except OSError:
+            return
+        index.touch(pathname, now / 1e9, mtime, st.st_size, (st.st_dev, st.st_ino))
+
     #/************************************************************************/
-    def __sync_cache_response(self, url, force_download, cache_store, expire_after):
-        # sequential implementation of cache_response
+    def __count_access(self, tier, hit):
+        #ignore-doc
+        # account for a response looked up in a given tier of the cache: hit is
+        # either a flag or the content found (None when missed)
+        if hit is None or hit is False:
+            self.__stats.count('%s_misses' % tier)
+            return
+        self.__stats.count('%s_hits' % tier)
+        if isinstance(hit, bytes):
+            self.__stats.count('bytes_read', len(hit))
+
+    #/************************************************************************/
+    def __count_written(self, nbytes):
+        #ignore-doc
+        # account for the bytes actually transferred into the cache, also per 
+        # thread so that prefetch can report the volume of every single download
+        self.__stats.count('bytes_written', nbytes)
+        _Service.__worker.written = getattr(_Service.__worker, 'written', 0) + nbytes
+
+    #/************************************************************************/
+    @staticmethod
+    def __to_memory(pathname, content):
+        #ignore-doc
+        # keep the content of a cached file in memory
+        try:
+            mtime = _Service.__cached_time(pathname)
+        except OSError:
+            return
+        _Service.__memory.put(pathname, content, mtime)
+
+    #/************************************************************************/
+    def __sync_cache_response(self, url, force_download, cache_store, expire_after, lazy=False):
+        # sequential implementation of cache_response, coalescing identical
+        # requests in flight
+        expire_after = self.__expire_for(url, expire_after)
+        key = ('cache', self.__normalise_url(url), force_download, cache_store, expire_after, lazy)
+        return self.__single_flight(key, self.__sync_store_response, 
+                                    url, force_download, cache_store, expire_after, lazy)
+
+    #/************************************************************************/
+    def __sync_store_response(self, url, force_download, cache_store, expire_after, lazy=False):
         pathname = self.__build_cache(url, cache_store)
-        is_cached = self.__is_cached(pathname, expire_after)
-        if force_download is True or is_cached is False or cache_store in (None,False):
-            response = self.session.get(url)
-            content = response.content
-            if cache_store not in (None,False):
-                # write "content" to a given pathname
-                with open(pathname, 'wb') as f:
-                    f.write(content)
-        else:
-            # read "content" from a given pathname.
-            with open(pathname, 'rb') as f:
-                content = f.read()
+        if cache_store in (None,False):
+            response = self.__sync_request(url)
+            self.__check_status(response.status_code)
+            return response.content, pathname
+        content = self.__from_memory(pathname, force_download, expire_after)
+        self.__count_access('memory', content)
+        if content is not None:
+            self.__record_access(pathname, cache_store, expire_after, from_memory=True)
+            return content, pathname
+        content = self.__from_pack(pathname, force_download, cache_store, expire_after)
+        if content is not None:
+            self.__count_access('disk', content)
+            return content, pathname
+        self.__migrate_cache(pathname, cache_store)
+        expire_after = self.__expire_negative_for(pathname, expire_after)
+        hit = True
+        if force_download is False and self.__is_stale(pathname, expire_after) is True:
+            # return the stale response and refresh it in background
+            self.__refresh_cache(url, pathname, cache_store, expire_after)
+        elif force_download is True or self.__is_cached(pathname, expire_after) is False:
+            with self.__lock_cache(pathname, cache_store):
+                # check again: another process may have cached the response while
+                # we were waiting for the lock
+                if force_download is True or self.__is_cached(pathname, expire_after) is False:
+                    hit = False
+                    self.__sync_download(url, pathname, force_download, cache_store)
+                    if expire_after == settings.CACHE_NEVER_EXPIRE:
+                        self.__pin_meta(pathname, url)
+        self.__count_access('disk', hit)
+        # negative responses are neither kept in memory nor packed
+        negative = self.__check_negative(pathname, cache_store, expire_after)
+        # read "content" from a given pathname, unless it is loaded lazily
+        if self.__is_lazy(pathname, lazy) is True:
+            self.__stats.count('bytes_read', os.path.getsize(pathname) if hit else 0)
+            self.__record_access(pathname, cache_store, expire_after)
+            return None, pathname
+        with open(pathname, 'rb') as f:
+            content = f.read()
+        self.__stats.count('bytes_read', len(content) if hit else 0)
+        if negative is True:
+            return content, pathname
+        self.__to_memory(pathname, content)
+        if self.__to_pack(pathname, content, cache_store) is False:
+            self.__record_access(pathname, cache_store, expire_after)
         return content, pathname
 
+    #/************************************************************************/
+    @staticmethod
+    def __is_lazy(pathname, lazy=False):
+        #ignore-doc
+        # check whether a cached file is large enough to be loaded lazily; small
+        # files are read right away so as to be kept in the memory cache
+        try:
+            return lazy is True and os.path.getsize(pathname) >= settings.CACHE_LAZY_MIN_SIZE
+        except OSError:
+            return False
+
+    #/************************************************************************/
+    def __sync_download(self, url, pathname, force_download, cache_store):
+        # download (or revalidate) the response of a URL into the cache: the 
+        # response is streamed to a partial file, so that large archives are not
+        # loaded in memory and interrupted downloads can be resumed, which is
+        # then synced and atomically renamed
+        headers = self.__conditional_headers(pathname, force_download, cache_store)
+        revalidate = headers != {}
+        partname, headers, offset = self.__resume_headers(pathname, headers)
+        with self.__sync_request(url, headers=headers, stream=True) as response:
+            if revalidate is True and response.status_code == 304:
+                self.__stats.count('revalidations')
+                self.__revalidate_cache(pathname, url)
+                self.__remove_part(partname)
+                return
+            resume = self.__check_resume(partname, offset, response.status_code, response.headers)
+            if resume is None:
+                return self.__sync_download(url, pathname, force_download, cache_store)
+            if not (self.__expire_negative is not None and resume is False 
+                    and response.status_code in settings.CACHE_NEGATIVE_STATUS):
+                self.__check_status(response.status_code)
+            os.makedirs(os.path.dirname(pathname), exist_ok=True)
+            if resume is False:
+                self.__write_meta(partname, url, response.headers)
+            with open(partname, 'ab' if resume else 'wb') as f:
+                for chunk in response.iter_content(settings.CACHE_CHUNK_SIZE):
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+                self.__count_written(f.tell() - (offset if resume else 0))
+            self.__flag_negative(partname, url, response.status_code, response.headers)
+            self.__commit_part(partname, pathname, cache_store)
+
     #/************************************************************************/
     async \
-    def __async_cache_response(self, session, url, force_download, cache_store, expire_after):
+    def __async_cache_response(self, session, url, force_download, cache_store, expire_after, lazy=False):
         # asynchronous implementation of cache_response
+        expire_after = self.__expire_for(url, expire_after)
+        key = ('cache', self.__normalise_url(url), force_download, cache_store, expire_after, lazy)
+        return await self.__async_single_flight(key, self.__async_store_response, 
+                                                session, url, force_download, cache_store, expire_after, lazy)
+
+    #/************************************************************************/
+    async \
+    def __async_store_response(self, session, url, force_download, cache_store, expire_after, lazy=False):
         pathname = self.__build_cache(url, cache_store)
-        is_cached = self.__is_cached(pathname, expire_after)
-        if force_download is True or is_cached is False or cache_store in (None,False):
-            response = await session.get(url)
-            content = await response.content.read()
-            if cache_store not in (None,False):
-                try:
-                    assert aiofiles
-                except:  # we loose the benefits of the async ... but ok
-                    print('__async open')
-                    with open(pathname, 'wb') as f:
-                        f.write(content)
-                else:
-                    async with aiofiles.open(pathname, 'wb') as f:
-                        await f.write(content)
+        if cache_store in (None,False):
+            response = await self.__async_request(session, url)
+            self.__check_status(response.status)
+            return await response.content.read(), pathname
+        content = self.__from_memory(pathname, force_download, expire_after)
+        self.__count_access('memory', content)
+        if content is not None:
+            self.__record_access(pathname, cache_store, expire_after, from_memory=True)
+            return content, pathname
+        content = self.__from_pack(pathname, force_download, cache_store, expire_after)
+        if content is not None:
+            self.__count_access('disk', content)
+            return content, pathname
+        self.__migrate_cache(pathname, cache_store)
+        expire_after = self.__expire_negative_for(pathname, expire_after)
+        hit = True
+        if force_download is False and self.__is_stale(pathname, expire_after) is True:
+            self.__refresh_cache(url, pathname, cache_store, expire_after)
+        elif force_download is True or self.__is_cached(pathname, expire_after) is False:
+            async with self.__alock_cache(pathname, cache_store):
+                if force_download is True or self.__is_cached(pathname, expire_after) is False:
+                    hit = False
+                    await self.__async_download(session, url, pathname, force_download, cache_store)
+                    if expire_after == settings.CACHE_NEVER_EXPIRE:
+                        self.__pin_meta(pathname, url)
+        self.__count_access('disk', hit)
+        negative = self.__check_negative(pathname, cache_store, expire_after)
+        # read "content" from a given pathname, unless it is loaded lazily
+        if self.__is_lazy(pathname, lazy) is True:
+            self.__stats.count('bytes_read', os.path.getsize(pathname) if hit else 0)
+            self.__record_access(pathname, cache_store, expire_after)
+            return None, pathname
+        try:
+            assert aiofiles
+        except:
+            with open(pathname, 'rb') as f:
+                content = f.read() 
         else:
+            async with aiofiles.open(pathname, 'rb') as f:
+                content = await f.read() 
+        self.__stats.count('bytes_read', len(content) if hit else 0)
+        if negative is True:
+            return content, pathname
+        self.__to_memory(pathname, content)
+        if self.__to_pack(pathname, content, cache_store) is False:
+            self.__record_access(pathname, cache_store, expire_after)
+        return content, pathname
+
+    #/************************************************************************/
+    async \
+    def __async_download(self, session, url, pathname, force_download, cache_store):
+        # asynchronous version of __sync_download
+        headers = self.__conditional_headers(pathname, force_download, cache_store)
+        revalidate = headers != {}
+        partname, headers, offset = self.__resume_headers(pathname, headers)
+        response = await self.__async_request(session, url, headers=headers)
+        try:
+            if revalidate is True and response.status == 304:
+                self.__stats.count('revalidations')
+                self.__revalidate_cache(pathname, url)
+                self.__remove_part(partname)
+                return
+            resume = self.__check_resume(partname, offset, response.status, response.headers)
+            if resume is None:
+                return await self.__async_download(session, url, pathname, force_download, cache_store)
+            if not (self.__expire_negative is not None and resume is False 
+                    and response.status in settings.CACHE_NEGATIVE_STATUS):
+                self.__check_status(response.status)
+            os.makedirs(os.path.dirname(pathname), exist_ok=True)
+            if resume is False:
+                self.__write_meta(partname, url, response.headers)
             try:
                 assert aiofiles
-            except:
-                with open(pathname, 'rb') as f:
-                    content = f.read() 
+            except:  # we loose the benefits of the async ... but ok
+                with open(partname, 'ab' if resume else 'wb') as f:
+                    async for chunk in response.content.iter_chunked(settings.CACHE_CHUNK_SIZE):
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self.__count_written(f.tell() - (offset if resume else 0))
             else:
-                async with aiofiles.open(pathname, 'rb') as f:
-                    content = await f.read() 
-        return content, pathname
+                async with aiofiles.open(partname, 'ab' if resume else 'wb') as f:
+                    async for chunk in response.content.iter_chunked(settings.CACHE_CHUNK_SIZE):
+                        await f.write(chunk)
+                    await f.flush()
+                    os.fsync(f.fileno())
+                    self.__count_written(await f.tell() - (offset if resume else 0))
+            self.__flag_negative(partname, url, response.status, response.headers)
+            self.__commit_part(partname, pathname, cache_store)
+        finally:
+            response.release()
     
     #/************************************************************************/
     @_Decorator.parse_url
@@ -2473,61 +5404,87 @@ class _Service(object):
         if not isinstance(force_download, bool):
             raise happyError('wrong type for %s parameter' % _Decorator.KW_FORCE.upper())
         expire_after = kwargs.get(_Decorator.KW_EXPIRE) or self.expire_after
-        if ASYNCIO_AVAILABLE is False:
+        if self.__asynchronous is False:
             try:
-                resp, path = zip(*[self.__sync_cache_response(u, force_download, cache_store, expire_after)              \
-                                        for u in url])
+                resp, path = zip(*self.__sync_map(lambda u: self.__sync_cache_response(u, force_download, cache_store, expire_after), 
+                                                  url))
             except happyError as e:
                 raise happyError(errtype=e) # 'sequential status extraction error'
         else:
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            loop = asyncio.get_event_loop() # event loop
-            async def async_cache_all_response(loop, url):
-                async with aiohttp.ClientSession(loop=loop, raise_for_status=True) as session:
-                    # tasks to do
-                    tasks = [self.__async_cache_response(session, u,
-                                                         force_download, cache_store, expire_after)         \
-                                for u in url]
-                    # gather task responses
-                    return await asyncio.gather(*tasks, return_exceptions=True) 
+            async def async_cache_all_response(url):
+                session = await self.__get_aio_session()
+                # tasks to do
+                tasks = [self.__async_cache_response(session, u,
+                                                     force_download, cache_store, expire_after)         \
+                            for u in url]
+                # gather task responses: the first exception is raised, as in the
+                # sequential implementation
+                return await asyncio.gather(*tasks)
             try:
-                future = asyncio.ensure_future(async_cache_all_response(loop, url)) 
-                # future = loop.create_task(aio_get_all_status(urls))
-                resp, path = zip(*loop.run_until_complete(future)) # loop until done
-                # status = future.result()
+                resp, path = zip(*self.__run_async(async_cache_all_response(url))) # loop until done
             except happyError as e:
                 raise happyError(errtype=e) # 'asynchronous status extraction error'
-            finally:
-                loop.close()             
         return (resp, path) if resp in ([],None) or len(resp)>1 else (resp[0], path[0])
 
+    #/************************************************************************/
+    def __parse_caching(self, kwargs):
+        # retrieve (and pop) the caching parameters from the keyword arguments
+        # of a request, using the settings of the service as default values
+        caching = kwargs.pop(_Decorator.KW_CACHING, True)
+        cache_store = kwargs.pop(_Decorator.KW_CACHE,None) or self.cache_store or False
+        if isinstance(cache_store, bool) and cache_store is True:
+            cache_store = self.__default_cache()
+        # create cache directory only the fist time it is needed
+        if cache_store not in (False, None):
+            if not os.path.exists(cache_store):
+                os.makedirs(cache_store)
+            elif not os.path.isdir(cache_store):
+                raise happyError('cache %s is not a directory' % cache_store)
+        force_download = kwargs.pop(_Decorator.KW_FORCE, False)
+        if not isinstance(force_download, bool):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_FORCE.upper())
+        expire_after = kwargs.get(_Decorator.KW_EXPIRE) or self.expire_after
+        #expire_after = kwargs.pop(_Decorator.KW_EXPIRE,None) or self.expire_after or 0
+        return caching, cache_store, force_download, expire_after
+
     #/************************************************************************/
     def __sync_get_response(self, url, force_download, caching, cache_store, expire_after, **kwargs):
+        # coalesce identical requests in flight
+        expire_after = self.__expire_for(url, expire_after)
+        key = ('get', self.__normalise_url(url), force_download, caching, cache_store, expire_after, 
+               repr(sorted(kwargs.items())))
+        return self.__single_flight(key, functools.partial(self.__sync_fetch_response, **kwargs),
+                                    url, force_download, caching, cache_store, expire_after)
+
+    #/************************************************************************/
+    def __sync_fetch_response(self, url, force_download, caching, cache_store, expire_after, **kwargs):
         if caching is False or cache_store is None:
             try:
                 if REQUESTS_CACHE_INSTALLED is True:
                     with requests_cache.disabled():
-                        resp = self.session.get(url)    
+                        resp = self.__sync_request(url)    
                 else:
-                    resp = self.session.get(url)                
+                    resp = self.__sync_request(url)                
             except:
                 raise happyError('wrong request formulated') 
         else: 
             path = ''
             try:
                 if CACHECONTROL_INSTALLED is True:
-                    resp = self.session.get(url)                
+                    resp = self.__sync_request(url)                
                     path = cache_store
                 elif REQUESTS_CACHE_INSTALLED is True:
                     with requests_cache.enabled(cache_store, **kwargs):
-                        resp = self.session.get(url)  
+                        resp = self.__sync_request(url)  
                     path = cache_store
                 else:
-                    resp, path = self.__sync_cache_response(url, force_download, cache_store, expire_after)
+                    resp, path = self.__sync_cache_response(url, force_download, cache_store, expire_after, lazy=True)
+            except happyError as e:
+                raise happyError(errtype=e)
             except:
                 raise happyError('wrong request formulated')  
             else:
-                resp = _CachedResponse(resp, url, path=path)
+                resp = _CachedResponse(resp, url, path=path, restore=self.__restore_for(cache_store, expire_after))
         try:
             assert resp is not None
         except:
@@ -2537,19 +5494,29 @@ class _Service(object):
     #/************************************************************************/
     async \
     def __async_get_response(self, session, url, force_download, caching, cache_store, expire_after):
+        # coalesce identical requests in flight
+        expire_after = self.__expire_for(url, expire_after)
+        key = ('get', self.__normalise_url(url), force_download, caching, cache_store, expire_after)
+        return await self.__async_single_flight(key, self.__async_fetch_response,
+                                                session, url, force_download, caching, cache_store, expire_after)
+
+    #/************************************************************************/
+    async \
+    def __async_fetch_response(self, session, url, force_download, caching, cache_store, expire_after):
         if caching is False or cache_store is None:
             try:
-                resp = await session.get(url)                
+                resp = await self.__aio_cached_response(await self.__async_request(session, url), url)
             except:
                 raise happyError('wrong request formulated') 
         else: 
             try:
-                resp, path = await self.__async_cache_response(session, url, force_download, cache_store, expire_after)
+                resp, path = await self.__async_cache_response(session, url, force_download, cache_store, expire_after, lazy=True)
+            except happyError as e:
+                raise happyError(errtype=e)
             except:
                 raise happyError('wrong request formulated')  
             else:
-                print('url=%s' % url)
-                resp = _CachedResponse(resp, url, path=path)
+                resp = _CachedResponse(resp, url, path=path, restore=self.__restore_for(cache_store, expire_after))
         try:
             assert resp is not None
             # yield from response.raise_for_status()
@@ -2651,50 +5618,131 @@ class _Service(object):
             pass
         else:
             url = kwargs.pop(_Decorator.KW_URL)
-        caching = kwargs.pop(_Decorator.KW_CACHING, True)
-        cache_store = kwargs.pop(_Decorator.KW_CACHE,None) or self.cache_store or False
-        if isinstance(cache_store, bool) and cache_store is True:
-            cache_store = self.__default_cache()
-        # create cache directory only the fist time it is needed
-        if cache_store not in (False, None):
-            if not os.path.exists(cache_store):
-                os.makedirs(cache_store)
-            elif not os.path.isdir(cache_store):
-                raise happyError('cache %s is not a directory' % cache_store)
-        force_download = kwargs.pop(_Decorator.KW_FORCE, False)
-        if not isinstance(force_download, bool):
-            raise happyError('wrong type for %s parameter' % _Decorator.KW_FORCE.upper())
-        expire_after = kwargs.get(_Decorator.KW_EXPIRE) or self.expire_after
-        #expire_after = kwargs.pop(_Decorator.KW_EXPIRE,None) or self.expire_after or 0
-        if isinstance(cache_store, bool) and cache_store is True:
-            cache_store = self.__default_cache()
-        if ASYNCIO_AVAILABLE is False:
-            try:
-                response = [self.__sync_get_response(u, force_download, caching, cache_store, expire_after)              \
-                            for u in url]
-            except happyError as e:
-                raise happyError(errtype=e) # 'sequential status extraction error'
-        else:
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            loop = asyncio.get_event_loop() # event loop
-            async def async_get_all_response(loop, url):
-                async with aiohttp.ClientSession(loop=loop, raise_for_status=True) as session:
-                    # tasks to do
-                    tasks = [self.__async_get_response(session, u, force_download, caching, cache_store, expire_after)  \
-                             for u in url]
-                    # gather task responses
-                    return await asyncio.gather(*tasks, return_exceptions=True) 
-            try:
-                future = asyncio.ensure_future(async_get_all_response(loop, url)) 
-                # future = loop.create_task(aio_get_all_status(urls))
-                response = loop.run_until_complete(future) # loop until done
-                # status = future.result()
-            except happyError as e:
-                raise happyError(errtype=e) # 'asynchronous status extraction error'
-            finally:
-                loop.close()             
+        caching, cache_store, force_download, expire_after = self.__parse_caching(kwargs)
+        if self.__asynchronous is False:
+            try:
+                response = self.__sync_map(lambda u: self.__sync_get_response(u, force_download, caching, cache_store, expire_after), 
+                                           url)
+            except happyError as e:
+                raise happyError(errtype=e) # 'sequential status extraction error'
+        else:
+            async def async_get_all_response(url):
+                session = await self.__get_aio_session()
+                # tasks to do
+                tasks = [self.__async_get_response(session, u, force_download, caching, cache_store, expire_after)  \
+                         for u in url]
+                # gather task responses: the first exception is raised, as in the
+                # sequential implementation
+                return await asyncio.gather(*tasks)
+            try:
+                response = self.__run_async(async_get_all_response(url)) # loop until done
+            except happyError as e:
+                raise happyError(errtype=e) # 'asynchronous status extraction error'
+        return response if response in ([],None) or len(response)>1 else response[0]
+    
+    #/************************************************************************/
+    @_Decorator.parse_url
+    async def aget_response(self, *url, **kwargs):
+        """Retrieve the GET response of a URL: native coroutine version of the
+        method :meth:`~_Service.get_response`.
+        
+            >>> response = await serv.aget_response(*url, **kwargs)
+            
+        Arguments
+        ---------
+        url : str
+            complete URL name(s) whose response(s) is(are) retrieved.
+            
+        Keyword arguments
+        -----------------
+        kwargs :
+            see keyword arguments of :meth:`~_Service.get_response` method.
+            
+        Returns
+        -------
+        response : :class:`requests.models.Response`
+            response(s) fetched from the input :data:`url` addresses.
+            
+        Example
+        -------
+        The coroutine runs on the event loop of the caller, *e.g.* in a Jupyter
+        notebook:
+        
+            >>> serv = base._Service()
+            >>> resp = await serv.aget_response(settings.ESTAT_URL)
+            
+        Note
+        ----
+        When the service is not asynchronous (see :data:`~_Service.asynchronous`),
+        the requests are sent over the pool of threads of the service (see 
+        :data:`~_Service.max_workers`) so that the running loop is never blocked.
+
+        See also
+        --------
+        :meth:`~_Service.get_response`, :meth:`~_Service.aread_url`.
+        """
+        try:
+            assert _Decorator.KW_URL in kwargs
+        except:
+            pass
+        else:
+            url = kwargs.pop(_Decorator.KW_URL)
+        caching, cache_store, force_download, expire_after = self.__parse_caching(kwargs)
+        try:
+            if self.__asynchronous is False:
+                response = await self.__async_map(lambda u: self.__sync_get_response(u, force_download, caching, cache_store, expire_after), 
+                                                  url)
+            else:
+                session = await self.__get_aio_session()
+                response = await asyncio.gather(*[self.__async_get_response(session, u, force_download, caching, cache_store, expire_after) \
+                                                  for u in url])
+        except happyError as e:
+            raise happyError(errtype=e)
         return response if response in ([],None) or len(response)>1 else response[0]
     
+    #/************************************************************************/
+    @staticmethod
+    def __decoded_signature(pathname):
+        #ignore-doc
+        # identify the raw content of a cached file by its size and validators 
+        # (or download time when the server did not return any validator, see 
+        # __cached_time), so that the signature does not change when the file 
+        # is revalidated, nor when the times of its inode are updated
+        st = os.stat(pathname)
+        meta = _Service.__read_meta(pathname)
+        validators = tuple([meta.get(v) for v in settings.CACHE_VALIDATORS])
+        return (st.st_size,) + (validators if any(validators) else (_Service.__cached_time(pathname, st),))
+
+    #/************************************************************************/
+    def __from_decoded(self, response):
+        #ignore-doc
+        # load the decoded representation of a cached response, if available 
+        # and consistent with the raw cached file; return a pair (found, data)
+        pathname = getattr(response, '_path', None)
+        if self.__cache_decoded is False or not pathname or not os.path.isfile(pathname):
+            return False, None
+        try:
+            with open(pathname + settings.CACHE_DECODED_EXT, 'rb') as f:
+                signature, data = pickle.load(f)
+            assert signature == self.__decoded_signature(pathname)
+        except:
+            return False, None
+        return True, data
+
+    #/************************************************************************/
+    def __to_decoded(self, response, data):
+        #ignore-doc
+        # store the decoded representation of a cached response next to it
+        pathname = getattr(response, '_path', None)
+        if self.__cache_decoded is False or not pathname or not os.path.isfile(pathname):
+            return
+        try:
+            self.__atomic_write(pathname + settings.CACHE_DECODED_EXT,
+                                pickle.dumps((self.__decoded_signature(pathname), data), 
+                                             protocol=pickle.HIGHEST_PROTOCOL))
+        except:
+            happyVerbose("decoded response of %s not cached" % pathname)
+
     #/************************************************************************/
     def __sync_read_response(self, response, **kwargs):
         if not _Decorator.KW_OFORMAT in kwargs:
@@ -2722,6 +5770,9 @@ class _Service(object):
             if fmt == 'content':
                 fmt = 'bytes'
         if fmt.startswith('json'):
+            found, data = self.__from_decoded(response)
+            if found is True:
+                return data
             try:
                 assert fmt not in ('jsontext', 'jsonbytes')
                 data = response.json()
@@ -2739,6 +5790,7 @@ class _Service(object):
                 else:
                     fmt = 'jsontext' # force
             else:
+                self.__to_decoded(response, data)
                 return data
         elif fmt == 'raw':
             try:
@@ -2751,8 +5803,14 @@ class _Service(object):
             except:
                 raise happyError('error accessing ''text'' attribute of response')
         elif fmt in ('bytes', 'bytesio', 'zip'):
+            # cached archives are memory-mapped instead of being read: zipfile 
+            # only needs a seekable file
+            data = response.buffer() if fmt == 'zip' and isinstance(response, _CachedResponse) else None
             try:
+                assert data is None
                 data = response.content 
+            except AssertionError:
+                pass
             except:
                 raise happyError('error accessing ''content'' attribute of response')
         if fmt == 'stringio':
@@ -2760,7 +5818,7 @@ class _Service(object):
                 data = io.StringIO(data)
             except:
                 raise happyError('error loading StringIO data')
-        elif fmt in ('bytesio', 'zip'):
+        elif fmt == 'bytesio' or (fmt == 'zip' and not isinstance(data, mmap.mmap)):
             try:
                 data = io.BytesIO(data)
             except:
@@ -2779,9 +5837,17 @@ class _Service(object):
                         data = json.loads(data.decode(chardet.detect(data)["encoding"]))
                     except:
                         raise happyError('error JSON-encoding of bytes content')
+        if fmt in ('jsontext', 'jsonbytes'):
+            self.__to_decoded(response, data)
         if fmt != 'zip':
             return data 
-        # deal with special case
+        with contextlib.closing(data):
+            return self.__read_zip(data, **kwargs)
+
+    #/************************************************************************/
+    def __read_zip(self, data, **kwargs):
+        # run the operation passed in kwargs on the zip archive represented by 
+        # the file-like object data
         operators = [op for op in self.ZIP_OPERATIONS if op in kwargs.keys()] 
         try:
             assert operators in ([],[None]) or sum([1 for op in operators]) == 1
@@ -2815,8 +5881,19 @@ class _Service(object):
             elif members is not None:
                 if not all([m in zf.namelist() for m in members]):
                     raise happyError('impossible to retrieve member file(s) from zipped data')
+            if isinstance(data, _RemoteFile) and operator in ('extract', 'read'):
+                # a remote member is fetched in one single request: its range
+                # ends where the next member (or the central directory) starts
+                remote = data
+                offsets = sorted([i.header_offset for i in zf.infolist()] + [zf.start_dir])
+                def preload(m):
+                    start = zf.getinfo(m).header_offset
+                    remote.preload(start, offsets[bisect.bisect_right(offsets, start)])
+                    return m
+            else:
+                preload = lambda m: m
             if operator in ('extract', 'getinfo', 'read'):
-                data = [getattr(zf, operator)(m) for m in members]
+                data = [getattr(zf, operator)(preload(m)) for m in members]
                 return data if data in ([],[None]) or len(data)>1 else data[0]
             elif operator == 'extractall':
                 return zf.extractall(path=path)    
@@ -2824,131 +5901,25 @@ class _Service(object):
     #/************************************************************************/
     async \
     def __async_read_response(self, response, **kwargs):
-        if not _Decorator.KW_OFORMAT in kwargs:
-            try:
-                url = response.url
-            except:
-                fmt = 'json'
-            else:
-                fmt = 'zip' if any([url.endswith(z) for z in ('zip','gzip','gz')]) else 'json'
-        else:
-            fmt = kwargs.pop(_Decorator.KW_OFORMAT, None)
-        if fmt in (None,'resp','response'):
-            return response
-        try:
-            assert fmt is None or happyType.isstring(fmt)
-        except:
-            raise happyError('wrong format for %s parameter' % _Decorator.KW_OFORMAT.upper()) 
-        else:
-            fmt = fmt.lower()
-        try:
-            assert fmt in ['jsontext', 'jsonbytes'] + self.RESPONSE_FORMATS # only for developers
-        except:
-            raise happyError('wrong value for FMT parameter - must be in %s' % self.RESPONSE_FORMATS) 
-        else:
-            if fmt == 'content':
-                fmt = 'bytes'
-        if fmt.startswith('json'):
-            try:
-                assert fmt not in ('jsontext', 'jsonbytes')
-                data = await response.json()
-            except:
-                try:
-                    assert fmt != 'jsonbytes'
-                    data = await response.text
-                except:
-                    try:
-                        data = await response.content 
-                    except:
-                        raise happyError('error JSON-encoding of response')
-                    else:
-                        fmt = 'jsonbytes' # force
-                else:
-                    fmt = 'jsontext' # force
-            else:
-                return data
-        elif fmt == 'raw':
-            try:
-                data = await response.raw
-            except:
-                raise happyError('error accessing ''raw'' attribute of response')
-        elif fmt in ('text', 'stringio'):
-            try:
-                data = await response.text
-            except:
-                raise happyError('error accessing ''text'' attribute of response')
-        elif fmt in ('bytes', 'bytesio', 'zip'):
-            try:
-                data = await response.content 
-            except:
-                raise happyError('error accessing ''content'' attribute of response')
-        if fmt == 'stringio':
-            try:
-                data = await io.StringIO(data)
-            except:
-                raise happyError('error loading StringIO data')
-        elif fmt in ('bytesio', 'zip'):
-            try:
-                data = await io.BytesIO(data)
-            except:
-                raise happyError('error loading BytesIO data')
-        elif fmt == 'jsontext':
-            try:
-                data = await json.loads(data)
-            except:
-                raise happyError('error JSON-encoding of str text')
-        elif fmt == 'jsonbytes':                
-                try:
-                    data = json.loads(data.decode())
-                except:
-                    try:            
-                        assert CHARDET_INSTALLED is True
-                        data = await json.loads(data.decode(chardet.detect(data)["encoding"]))
-                    except:
-                        raise happyError('error JSON-encoding of bytes content')
-        if fmt != 'zip':
-            return data 
-        # deal with special case
-        operators = [op for op in self.ZIP_OPERATIONS if op in kwargs.keys()] 
-        try:
-            #assert set(kwargs.keys()).difference(set(self.ZIP_OPERATIONS)) == set()
-            assert operators in ([],[None]) or sum([1 for op in operators]) == 1
-        except:
-            raise happyError('only one operation supported per call')
-        else:
-            if operators in ([],[None]):
-                operator = 'extractall'
-                kwargs.update({operator: self.cache_store})
-            else:
-                operator = operators[0] 
-        members, path = None, None
-        if operator in ('extract', 'getinfo', 'read'):
-            members = kwargs.pop(operator, None)
-        elif operator == 'extractall':
-            path = kwargs.pop('extractall', None)
-        else: # elif operator in ('infolist','namelist'):
-            try:
-                assert kwargs.get(operator) not in (False,None)
-            except:
-                raise happyError('no operation parsed')
-        if operator.startswith('extract'):
-            happyWarning('data extracted from zip file will be physically stored on local disk')
-        if members is not None and not happyType.issequence(members):
-            members = [members,]
-        # whatever comes next is actually not asynchronous
-        async with zipfile.ZipFile(data) as zf:
-            #if not zipfile.is_zipfile(zf): # does not work
-            #    raise happyError('file not recognised as zip file')    
-            if operator in  ('infolist','namelist'):
-                return await getattr(zf, operator)()
-            elif members is not None:
-                if not all([m in zf.namelist() for m in members]):
-                    raise happyError('impossible to retrieve member file(s) from zipped data')
-            if operator in ('extract', 'getinfo', 'read'):
-                data = await [getattr(zf, operator)(m) for m in members]
-                return data if data in ([],[None]) or len(data)>1 else data[0]
-            elif operator == 'extractall':
-                return await zf.extractall(path=path)    
+        # asynchronous version of __sync_read_response: the body of a live 
+        # response is awaited, then the response is decoded as a cached one 
+        # (decoding is not asynchronous anyway)
+        if isinstance(response, aiohttp.ClientResponse):
+            response = await self.__aio_cached_response(response, str(response.url))
+        return self.__sync_read_response(response, **kwargs)
+
+    #/************************************************************************/
+    @staticmethod
+    async def __aio_cached_response(response, url):
+        #ignore-doc
+        # read the body of a live aiohttp response and return it as a (non lazy)
+        # _CachedResponse, so that both implementations return the same type
+        async with response:
+            content = await response.read()
+        cached = _CachedResponse(content, url)
+        cached.status_code, cached.reason = response.status, response.reason
+        cached.headers.update(response.headers)
+        return cached
 
     #/************************************************************************/
     @_Decorator._parse_class((_CachedResponse, aiohttp.ClientResponse, requests.Response), _Decorator.KW_RESPONSE)
@@ -2995,30 +5966,80 @@ class _Service(object):
             pass
         else:
             response = kwargs.pop(_Decorator.KW_RESPONSE)
-        if ASYNCIO_AVAILABLE is False:
+        if self.__asynchronous is False:
             try:
                 data = [self.__sync_read_response(resp, **kwargs) for resp in response]
             except happyError as e:
                 raise happyError(errtype=e) # 'sequential status extraction error'
         else:
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            loop = asyncio.get_event_loop() # event loop
-            async def async_read_all_response(loop, response):
+            async def async_read_all_response(response):
                 # tasks to do
                 tasks = [self.__async_read_response(resp, **kwargs) for resp in response]
-                # gather task responses
-                return await asyncio.gather(*tasks, return_exceptions=True) 
+                # gather task responses: the first exception is raised, as in the
+                # sequential implementation
+                return await asyncio.gather(*tasks)
             try:
-                future = asyncio.ensure_future(async_read_all_response(loop, response)) 
-                # future = loop.create_task(aio_get_all_status(urls))
-                data = loop.run_until_complete(future) # loop until done
-                # status = future.result()
+                data = self.__run_async(async_read_all_response(response)) # loop until done
             except happyError as e:
                 raise happyError(errtype=e) # 'asynchronous status extraction error'
-            finally:
-                loop.close()             
         return data if data in ([],None) or len(data)>1 else data[0]
     
+    #/************************************************************************/
+    def __sync_open_remote(self, url, force_download, cache_store, expire_after, **kwargs):
+        # return a file-like object reading the zip archive at url through range
+        # requests when only some members (or the list of members) are requested
+        # and the archive is not in the cache already; return None otherwise, 
+        # i.e. when the archive shall be downloaded entirely
+        fmt = kwargs.get(_Decorator.KW_OFORMAT)
+        if not (happyType.isstring(fmt) and fmt.lower() == 'zip'):
+            return None
+        expire_after = self.__expire_for(url, expire_after)
+        operators = [op for op in self.ZIP_OPERATIONS if kwargs.get(op) not in (None,False)]
+        if len(operators) != 1 or operators[0] == 'extractall':
+            return None
+        elif force_download is False and cache_store not in (None,False)    \
+                and self.__is_cached(self.__build_cache(url, cache_store), expire_after):
+            return None
+        try:
+            response = self.__sync_request(url, 'head', allow_redirects=True)
+            self.__check_status(response.status_code)
+            size = int(response.headers.get('Content-Length'))
+            assert response.headers.get('Accept-Ranges','').lower() == 'bytes' \
+                and size >= settings.REMOTE_ZIP_MIN_SIZE
+        except:
+            return None
+        # note that weak ETags cannot be used with 'If-Range'
+        validator = response.headers.get('ETag')
+        if validator is None or validator.startswith('W/'):
+            validator = response.headers.get('Last-Modified')
+        happyVerbose("reading zip archive %s through range requests" % url)
+        return _RemoteFile(lambda u, **kw: self.__sync_request(u, **kw), 
+                           response.url, size, validator=validator)
+
+    #/************************************************************************/
+    def __sync_read_url(self, url, force_download, caching, cache_store, expire_after, **kwargs):
+        # sequential implementation of read_url: fetch, check the status of the
+        # GET response itself and decode the content in one single pass
+        remote = self.__sync_open_remote(url, force_download, cache_store, expire_after, **kwargs)
+        if remote is not None:
+            kwargs.pop(_Decorator.KW_OFORMAT)
+            with remote:
+                return self.__read_zip(remote, **kwargs)
+        response = self.__sync_get_response(url, force_download, caching, cache_store, expire_after)
+        self.__check_status(response.status_code)
+        return self.__sync_read_response(response, **kwargs)
+
+    #/************************************************************************/
+    async \
+    def __async_read_url(self, session, url, force_download, caching, cache_store, expire_after, **kwargs):
+        # asynchronous implementation of read_url: every response is decoded as
+        # soon as it arrives, independently of the other requests; note that zip
+        # archives are not read through range requests (see __sync_open_remote)
+        # since _RemoteFile is synchronous: they are downloaded entirely
+        response = await self.__async_get_response(session, url, force_download, caching, cache_store, expire_after)
+        self.__check_status(getattr(response, 'status', None) or response.status_code)
+        return await self.__async_read_response(response, **kwargs)
+
     #/************************************************************************/
     @_Decorator.parse_url
     def read_url(self, *url, **kwargs):
@@ -3055,7 +6076,12 @@ class _Service(object):
         
         Note
         ----
-        A mix of sequential/asynchronous implementations... 
+        The status is checked on the GET response itself (no preliminary HEAD
+        request is sent) and every response is decoded as soon as it is fetched,
+        *i.e.* one single round-trip per URL.
+        Only some members of a large zip archive are fetched (through range 
+        requests, see :data:`settings.REMOTE_ZIP_MIN_SIZE`) when the service is 
+        synchronous: an asynchronous service downloads the archive entirely.
 
         See also
         --------
@@ -3068,19 +6094,205 @@ class _Service(object):
             pass
         else:
             url = kwargs.pop(_Decorator.KW_URL)
+        caching, cache_store, force_download, expire_after = self.__parse_caching(kwargs)
+        kwargs.pop(_Decorator.KW_EXPIRE, None)
+        if self.__asynchronous is False:
+            try:
+                data = self.__sync_map(lambda u: self.__sync_read_url(u, force_download, caching, cache_store, expire_after, **kwargs), 
+                                       url)
+            except happyError as e:
+                raise happyError(errtype=e)
+            except:
+                raise happyError('URL data for %s not loaded' % url)
+        else:
+            async def async_read_all_url(url):
+                session = await self.__get_aio_session()
+                # tasks to do
+                tasks = [self.__async_read_url(session, u, force_download, caching, cache_store, expire_after, **kwargs) \
+                         for u in url]
+                # gather task responses: the first exception is raised, as in the
+                # sequential implementation
+                return await asyncio.gather(*tasks)
+            try:
+                data = self.__run_async(async_read_all_url(url)) # loop until done
+            except happyError as e:
+                raise happyError(errtype=e)
+        return data if data in ([],None) or len(data)>1 else data[0]
+    
+    #/************************************************************************/
+    @_Decorator.parse_url
+    async def aread_url(self, *url, **kwargs):
+        """Returns the (possibly formatted) response of a given URL: native 
+        coroutine version of the method :meth:`~_Service.read_url`.
+        
+            >>> data = await serv.aread_url(*url, **kwargs)
+            
+        Arguments
+        ---------
+        url : str
+            complete URL name(s) from which data will be fetched.
+            
+        Keyword arguments
+        -----------------
+        kwargs :
+            see keyword arguments of :meth:`~_Service.read_url` method.
+            
+        Returns
+        -------
+        data : 
+            data fetched from the input :data:`url`, formatted according to what 
+            is parsed through the keyword arguments.
+            
+        Example
+        -------
+        Thousands of requests can be awaited concurrently from the loop of the 
+        caller:
+            
+            >>> data = await asyncio.gather(*[serv.aread_url(u, ofmt='json') for u in urls])
+
+        Note
+        ----
+        Unlike :meth:`~_Service.read_url` run by a synchronous service, the zip
+        archives are always downloaded (and cached) entirely, even when only some
+        of their members are requested (see :data:`settings.REMOTE_ZIP_MIN_SIZE`).
+
+        See also
+        --------
+        :meth:`~_Service.read_url`, :meth:`~_Service.aget_response`.
+        """
         try:
-            assert self.get_status(url) is not None
-        except happyError as e:
-            raise happyError(errtype=e)
+            assert _Decorator.KW_URL in kwargs
         except:
-            raise happyError('error API request - wrong URL status')
+            pass
+        else:
+            url = kwargs.pop(_Decorator.KW_URL)
+        caching, cache_store, force_download, expire_after = self.__parse_caching(kwargs)
+        kwargs.pop(_Decorator.KW_EXPIRE, None)
         try:
-            response = self.get_response(url, **kwargs)
+            if self.__asynchronous is False:
+                data = await self.__async_map(lambda u: self.__sync_read_url(u, force_download, caching, cache_store, expire_after, **kwargs), 
+                                              url)
+            else:
+                session = await self.__get_aio_session()
+                data = await asyncio.gather(*[self.__async_read_url(session, u, force_download, caching, cache_store, expire_after, **kwargs) \
+                                              for u in url])
         except happyError as e:
             raise happyError(errtype=e)
         except:
             raise happyError('URL data for %s not loaded' % url)
-        return self.read_response(response, **kwargs)
+        return data if data in ([],None) or len(data)>1 else data[0]
+
+    #/************************************************************************/
+    @_Decorator.parse_url
+    def prefetch(self, *url, **kwargs):
+        """Download concurrently a set of URLs into the cache, without loading
+        their content, *e.g.* so as to warm up the cache of a node before it is 
+        used.
+        
+            >>> report = serv.prefetch(*url, budget=None, progress=None, **kwargs)
+            
+        Arguments
+        ---------
+        url : str
+            complete URL name(s) of the responses to cache.
+            
+        Keyword arguments
+        -----------------
+        budget : int
+            maximum number of bytes fetched: once it is reached, no further 
+            download is started (though the downloads in progress complete); 
+            default to :data:`None`, *i.e.* no limit.
+        progress : callable
+            function called as :literal:`progress(done, total, url, nbytes)` every
+            time a URL has been processed; default to :data:`None`.
+        kwargs :
+            see caching keyword arguments (:literal:`cache_store, _force_download_, 
+            _expire_after_`) of the method :meth:`~_Service.get_response`.
+            
+        Returns
+        -------
+        report : dict
+            a dictionary with the lists of URLs :literal:`'cached'` (*i.e.*, already
+            in the cache), :literal:`'fetched'`, :literal:`'failed'` and :literal:`'skipped'` 
+            (because of the :data:`budget`), and the number of :literal:`'bytes'` 
+            actually transferred (revalidated responses account for none).
+            
+        Raises
+        ------
+        happyError
+            error is raised when no cache is set.
+            
+        Note
+        ----
+        The requests are sent over the pool of :data:`max_workers` threads of the
+        service, hence they are subject to the limits of its scheduler. With an
+        asynchronous service, every thread runs the download on an event loop 
+        (and with a client session) of its own.
+        """
+        try:
+            assert _Decorator.KW_URL in kwargs
+        except:
+            pass
+        else:
+            url = kwargs.pop(_Decorator.KW_URL)
+        budget = kwargs.pop(_Decorator.KW_BUDGET, None)
+        if not (budget is None or isinstance(budget, int) and budget >= 0):
+            raise happyError('wrong type/value for %s parameter' % _Decorator.KW_BUDGET.upper())
+        progress = kwargs.pop(_Decorator.KW_PROGRESS, None)
+        if not (progress is None or callable(progress)):
+            raise happyError('wrong type for %s parameter' % _Decorator.KW_PROGRESS.upper())
+        _, cache_store, force_download, expire_after = self.__parse_caching(kwargs)
+        if cache_store in (None,False):
+            raise happyError('no cache set for prefetching')
+        url, _ = self.__dedupe(url)
+        report = {'cached': [], 'fetched': [], 'failed': [], 'skipped': [], 'bytes': 0}
+        def notify(u, nbytes):
+            if progress is not None:
+                progress(len(report['cached']) + len(report['fetched']) + len(report['failed']), 
+                         len(url), u, nbytes)
+        def fetch(u):
+            # only the bytes transferred are counted: a response revalidated (304
+            # status) or coalesced with a request in flight accounts for none
+            _Service.__worker.active, _Service.__worker.written = True, 0
+            try:
+                if self.__asynchronous is True:
+                    asyncio.run(self.__async_in_thread(functools.partial(self.__async_cache_response, lazy=True), 
+                                                       u, force_download, cache_store, expire_after))
+                else:
+                    self.__sync_cache_response(u, force_download, cache_store, expire_after, lazy=True)
+            finally:
+                _Service.__worker.active = False
+            return _Service.__worker.written
+        queue, running = collections.deque(), {}
+        for u in url:
+            if force_download is False and self.is_cached(u, **{_Decorator.KW_CACHE: cache_store, 
+                                                                _Decorator.KW_EXPIRE: expire_after}) is True:
+                report['cached'].append(u)
+                notify(u, 0)
+            else:
+                queue.append(u)
+        executor, window = self.__get_executor(), max(self.max_workers or 1, 1)
+        while queue or running:
+            while queue and len(running) < window and (budget is None or report['bytes'] < budget):
+                u = queue.popleft()
+                running[executor.submit(fetch, u)] = u
+            if running == {}:
+                break # budget exceeded
+            done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                u = running.pop(future)
+                try:
+                    nbytes = future.result()
+                except Exception:
+                    happyVerbose('URL %s not prefetched' % u)
+                    report['failed'].append(u)
+                    nbytes = 0
+                else:
+                    report['fetched'].append(u)
+                    report['bytes'] += nbytes
+                notify(u, nbytes)
+        report['skipped'] = list(queue)
+        return report
             
     #/************************************************************************/
     @classmethod
@@ -48,7 +48,7 @@ Perform operations using online web-services, *e.g.*:
     
 **Dependencies**
 
-*require*:      :mod:`io`, :mod:`io`, :mod:`collections`, :mod:`itertools`, :mod:`json`
+*require*:      :mod:`io`, :mod:`io`, :mod:`collections`, :mod:`itertools`, :mod:`asyncio`, :mod:`json`
 
 *optional*:     :mod:`geopy`, :mod:`googlemaps`, :mod:`googleplaces`, :mod:`pandas`, :mod:`Levenshtein`
 
@@ -64,8 +64,9 @@ __all__         = ['OSMService', 'GISCOService', 'APIService',
                    '_googleMapsAPI', '_googlePlacesAPI', '_geoCoderAPI']
 
 # generic import
-import io
+import io, re
 import collections, itertools
+import asyncio
 
 # local (absolute) imports
 from happygisco import happyVerbose, happyWarning, happyError, happyType
@@ -198,6 +199,30 @@ class OSMService(_Service):
             raise TypeError('wrong type for DOMAIN parameter')
         self.__domain = url or ''
 
+    #/************************************************************************/
+    def url_category(self, url):
+        """Return the category of a request to |OSM| web-service, used to select 
+        the lifetime of its cached response.
+        
+            >>> category = serv.url_category(url)
+            
+        Returns
+        -------
+        category : str
+            :literal:`'geocode'` for the (reverse) geocoding requests sent to the
+            :data:`domain` of the service, :data:`None` otherwise.
+        
+        See also
+        --------
+        :meth:`base._Service.url_category`.
+        """
+        try:
+            assert happyType.isstring(url) and self.domain
+            assert url.split('://')[-1].startswith(self.domain)
+        except:
+            return super(OSMService, self).url_category(url)
+        return 'geocode'
+
     #/************************************************************************/
     def url_geocode(self, **kwargs):
         """Generate the query URL for |Nominatim| geocoding web-service (from toponame to
@@ -304,44 +329,76 @@ class OSMService(_Service):
         return url
 
     #/************************************************************************/
-    def _place2geom(self, place, **kwargs): 
-        """Iterable version of :meth:`~OSMService.place2geom`.
-        """
+    def __place2url(self, place, **kwargs): 
+        # build the geocoding URLs of the input place(s); return the formatted
+        # places, the URLs and the key to extract from the responses
         if not happyType.issequence(place):     place = [place,]
         place = ['+'.join(p.replace(',',' ').split()) for p in place]
         fmt = kwargs.pop('format', '')
         key = kwargs.pop('key',None)
         if fmt is not None:
             kwargs.update({'format':fmt or 'json'})
+        url = []
         for p in place:
             kwargs.update({'q': p})
             try:
-                url = self.url_geocode(**kwargs)
+                url.append(self.url_geocode(**kwargs))
             except:
                 raise happyError('error geolocation URL formatting')
+        return place, url, key
+    
+    #/************************************************************************/
+    @staticmethod
+    def __filter_geom(place, data, key): 
+        # filter the geolocation data loaded for a given place
+        try:
+            assert data not in({},None)
+        except:
+            raise happyError('geolocation for place %s not loaded' % place)
+        try:
+            assert key is not None
+        except AssertionError:
             try:
-                data = self.read_url(url, **{_Decorator.KW_OFORMAT: 'JSON'})
-                assert data not in({},None)
+                assert data != [] 
             except:
-                raise happyError('geolocation for place %s not loaded' % p)
+                raise happyError('geolocation for place %s not recognised' % place)  
+            else:
+                pass
+        else:
             try:
-                assert key is not None
+                assert key in data and data[key] != [] 
             except AssertionError:
-                try:
-                    assert data != [] 
-                except:
-                    raise happyError('geolocation for place %s not recognised' % p)  
-                else:
-                    pass
+                happyVerbose('geolocation for place %s not recognised' % place, verb=True)  
+                data = None
             else:
-                try:
-                    assert key in data and data[key] != [] 
-                except AssertionError:
-                    happyVerbose('geolocation for place %s not recognised' % p, verb=True)  
-                    data = None
-                else:
-                    data = data.get(key)
-            yield data if data is None or happyType.ismapping(data) or len(data)>1 else data[0]
+                data = data.get(key)
+        return data if data is None or happyType.ismapping(data) or len(data)>1 else data[0]
+    
+    #/************************************************************************/
+    def _place2geom(self, place, **kwargs): 
+        """Iterable version of :meth:`~OSMService.place2geom`.
+        """
+        place, url, key = self.__place2url(place, **kwargs)
+        for p, u in zip(place, url):
+            try:
+                data = self.read_url(u, **{_Decorator.KW_OFORMAT: 'JSON'})
+            except:
+                raise happyError('geolocation for place %s not loaded' % p)
+            yield self.__filter_geom(p, data, key)
+    
+    #/************************************************************************/
+    async def _aplace2geom(self, place, **kwargs): 
+        """Asynchronous version of :meth:`~OSMService._place2geom`: return the
+        list of geometries once all requests have been awaited concurrently.
+        """
+        place, url, key = self.__place2url(place, **kwargs)
+        async def aread(p, u):
+            try:
+                data = await self.aread_url(u, **{_Decorator.KW_OFORMAT: 'JSON'})
+            except:
+                raise happyError('geolocation for place %s not loaded' % p)
+            return self.__filter_geom(p, data, key)
+        return await asyncio.gather(*[aread(p, u) for p, u in zip(place, url)])
 
     #/************************************************************************/
     #@_Decorator.parse_place
@@ -701,15 +758,41 @@ class OSMService(_Service):
         :meth:`GISCOService.place2coord`.
         """
         unique, order = kwargs.pop('unique',False), kwargs.pop('order','lL')
+        return self.__geom2coord(self._place2geom(place, **kwargs), order, unique)
+
+    #/************************************************************************/
+    @staticmethod
+    def __geom2coord(geom, order, unique):
+        # extract the coordinates from the geometries output by _place2geom
         coord = []
         # note the presence below of *a so as to ensure that None responses are 
         # also parsed
         func = lambda *a, **kw: [kw.get(_Decorator.KW_COORD)]
         [coord.append(data if data is None or len(data)>1 else data[0])     \
-             for g in self._place2geom(place, **kwargs)                     \
+             for g in geom                                                  \
              for data in _Decorator.parse_geometry(func)(g, filter='coord', order=order, unique=unique)]
         return coord if coord==[] or len(coord)>1 else coord[0]
 
+    #/************************************************************************/
+    @_Decorator.parse_place
+    async def aplace2coord(self, place, **kwargs):
+        """Retrieve the geographic coordinates of a given place provided by its 
+        (topo)name using |OSM| service: native coroutine version of the method 
+        :meth:`~OSMService.place2coord`.
+        
+            >>> coord = await serv.aplace2coord(place, **kwargs)
+            
+        The geocoding requests of all the input places are awaited concurrently
+        on the running event loop. See :meth:`~OSMService.place2coord` for the
+        description of the arguments.
+        
+        See also
+        --------
+        :meth:`~OSMService.place2coord`, :meth:`base._Service.aread_url`.
+        """
+        unique, order = kwargs.pop('unique',False), kwargs.pop('order','lL')
+        return self.__geom2coord(await self._aplace2geom(place, **kwargs), order, unique)
+
     @_Decorator.parse_coordinate
     def coord2place(self, coord, **kwargs):
         """Retrieve the (topo)name of a given location provided by its geographic 
@@ -875,6 +958,66 @@ class GISCOService(OSMService):
             raise TypeError('wrong type for %s parameter' % _Decorator.KW_MAP_URL.upper())
         self.__map_url = url or ''
 
+    #/************************************************************************/
+    def url_category(self, url):
+        """Return the category of a request to |GISCO| web-services, used to select 
+        the lifetime of its cached response.
+        
+            >>> category = serv.url_category(url)
+            
+        Returns
+        -------
+        category : str
+            one of the categories of :data:`settings.CACHE_CATEGORIES`, namely:
+            
+                * :literal:`'nuts_versioned'` and :literal:`'country_versioned'` for 
+                  the datasets returned by :meth:`~GISCOService.url_nuts` and 
+                  :meth:`~GISCOService.url_country` (including those of the |NUTS2JSON| 
+                  mirror) which are identified by their year, hence never change,
+                * :literal:`'nuts'` and :literal:`'country'` for the other datasets,
+                * :literal:`'findnuts'` for the requests built by :meth:`~GISCOService.url_findnuts`,
+                * :literal:`'routing'` for the requests built by :meth:`~GISCOService.url_routing`,
+                * :literal:`'geocode'` for the other requests to the REST services 
+                  (:meth:`~GISCOService.url_geocode`, :meth:`~GISCOService.url_reverse`),
+            
+            or :data:`None` when the URL is not recognised.
+            
+        Example
+        -------
+        
+            >>> serv.url_category(serv.url_nuts(year=2013, scale=1))
+                'nuts_versioned'
+            >>> serv.url_category(serv.url_findnuts(x=4.3, y=50.8))
+                'findnuts'
+        
+        Note
+        ----
+        This method overrides the *super* method :meth:`OSMService.url_category`.
+        """
+        try:
+            assert happyType.isstring(url)
+        except:
+            return None
+        address = url.split('://')[-1]
+        # datasets are versioned when identified by a (4-digit) year
+        versioned = lambda category, path:                                  \
+            category + '_versioned' if re.search(r'(?<![0-9])(19|20)[0-9]{2}(?![0-9])', path) else category
+        if address.startswith(settings.NUTS2JSON_DOMAIN):
+            path = address[len(settings.NUTS2JSON_DOMAIN):]
+            return versioned('country' if path.rsplit('/',1)[-1].startswith('cnt') else 'nuts', path)
+        elif self.cache_url and address.startswith(self.cache_url):
+            path = address[len(self.cache_url):].strip('/')
+            category = {settings.GISCO_NUTSTHEME: 'nuts', settings.GISCO_CTRYTHEME: 'country'}.get(path.split('/')[0])
+            return category if category is None else versioned(category, path.split('?')[0])
+        elif self.rest_url and address.startswith(self.rest_url):
+            path = address[len(self.rest_url):].strip('/')
+            if path.startswith('nuts/find-nuts'):
+                return 'findnuts'
+            elif path.startswith('route/'):
+                return 'routing'
+            return 'geocode'
+        return super(GISCOService, self).url_category(url)
+
     #/************************************************************************/
     @property
     def arcgis(self):
@@ -1570,7 +1713,9 @@ class GISCOService(OSMService):
         dic = _NestedDict([(getattr(_Decorator,'KW_' + k), v) for k,v in dimensions.items() \
                                if __del_source is False or source not in ('NUTS2JSON','BULK','INFO') or k!='SOURCE'],
                            **{_Decorator.KW_ORDER: True}) # [getattr(_Decorator,'KW_' + k) for k in dimensions.keys()]
-        dim = {}
+        dim, urls = {}, []
+        # when prefetching, only the URLs of the datasets are returned
+        prefetch = kwargs.pop(_Decorator.KW_PREFETCH, False)
         kwargs.update({_Decorator.KW_OFORMAT: 'response'})
         for prod in itertools.product(*list(dimensions.values())):
             dim.update(dict(zip([getattr(_Decorator,'KW_' + attr) for attr in dimensions.keys()], prod)))
@@ -1580,6 +1725,9 @@ class GISCOService(OSMService):
                 raise happyError('argument DATA not recognised - must be ''nuts'' or ''country''')
             else:
                 url = build_url(**dim)
+            if prefetch is True:
+                urls.append(url)
+                continue
             try:
                 response = self.read_url(url, **kwargs) 
             except happyError as e:
@@ -1591,7 +1739,7 @@ class GISCOService(OSMService):
                     dim.pop(_Decorator.KW_SOURCE)
                 dic.xupdate(response, **dim)
                 response = None
-        return dic 
+        return dic if prefetch is False else urls
 
     #/************************************************************************/
     def _data_geometry(self, data, **kwargs):
@@ -1889,6 +2037,71 @@ class GISCOService(OSMService):
         # kwargs.update({_Decorator.KW_OFORMAT: 'resp'})
         return self._data_response('NUTS', dimensions, **kwargs)
                 
+    #/************************************************************************/
+    def warm_cache(self, *data, **kwargs):
+        """Prefetch into the cache the |NUTS| and/or countries datasets available
+        through |GISCO| Rest API for the cartesian product of the dimensions 
+        (years, scales, projections, levels, vector types, ...) parsed.
+            
+            >>> report = serv.warm_cache(*data, budget=None, progress=None, **kwargs)
+            
+        Arguments
+        ---------
+        data : str
+            the type(s) of datasets to prefetch, :literal:`'nuts'` and/or :literal:`'country'`;
+            default to both.
+            
+        Keyword arguments
+        -----------------
+        budget,progress :
+            see keyword arguments of the method :meth:`~base._Service.prefetch`.
+        kwargs :
+            dimensions of the datasets (:literal:`source, unit, code, year, proj, 
+            scale, vector, level, ifmt`) as accepted by the methods :meth:`~GISCOService.nuts_response`
+            and :meth:`~GISCOService.country_response` (possibly as lists), and
+            caching keyword arguments of :meth:`~base._Service.get_response`.
+            
+        Returns
+        -------
+        report : dict
+            see output of the method :meth:`~base._Service.prefetch`.
+            
+        Example
+        -------
+        All |NUTS| regions of the years 2013 and 2016 can be cached at the 1:1 
+        million and 1:60 million scales:
+            
+            >>> serv = services.GISCOService()
+            >>> report = serv.warm_cache('nuts', year=[2013,2016], scale=['01m','60m'], 
+                                         level=[0,1,2,3], budget=2**30)
+            
+        See also
+        --------
+        :meth:`~GISCOService.nuts_response`, :meth:`~GISCOService.country_response`, 
+        :meth:`base._Service.prefetch`.
+        """
+        data = data or ('nuts', 'country')
+        try:
+            assert all([happyType.isstring(d) and d.lower() in ('nuts', 'country') for d in data])
+        except:
+            raise happyError('argument DATA not recognised - must be ''nuts'' or ''country''')
+        options = {k: kwargs.pop(k) for k in (_Decorator.KW_BUDGET, _Decorator.KW_PROGRESS, _Decorator.KW_CACHE,
+                                              _Decorator.KW_FORCE, _Decorator.KW_EXPIRE) if k in kwargs}
+        url = []
+        for d in data:
+            _kwargs = kwargs.copy()
+            if d.lower() == 'country':
+                [_kwargs.pop(k, None) for k in (_Decorator.KW_LEVEL, _Decorator.KW_UNIT)]
+            else:
+                _kwargs.pop(_Decorator.KW_CODE, None)
+            _kwargs.update({_Decorator.KW_PREFETCH: True})
+            try:
+                url.extend(getattr(self, d.lower() + '_response')(**_kwargs))
+            except happyError as e:
+                raise happyError(errtype=e)
+        happyVerbose('%s datasets to prefetch' % len(url))
+        return self.prefetch(*url, **options)
+
     #/************************************************************************/
     def country_geometry(self, **kwargs):
         """Load the content of responses associated to NUTS vector files available 
@@ -2940,6 +3153,10 @@ class GISCOService(OSMService):
         #return super(GISCOService,self)._place2geom(place, **kwargs)
         for g in super(GISCOService,self)._place2geom(place, **kwargs):
             yield g
+    async def _aplace2geom(self, place, **kwargs): 
+        # asynchronous version of :meth:`~GISCOService._place2geom`.
+        kwargs.update({'key': _Decorator.parse_geometry.KW_FEATURES})
+        return await super(GISCOService,self)._aplace2geom(place, **kwargs)
     #/************************************************************************/
     @_Decorator.parse_place
     def place2geom(self, place, **kwargs): 
@@ -3090,6 +3307,21 @@ class GISCOService(OSMService):
         """
         return super(GISCOService,self).place2coord(place=place, **kwargs)
 
+    #/************************************************************************/
+    @_Decorator.parse_place
+    async def aplace2coord(self, place, **kwargs): 
+        """Retrieve the geographic coordinates of a given place provided by its 
+        (topo)name using |GISCO| service: native coroutine version of the method 
+        :meth:`~GISCOService.place2coord`.
+        
+            >>> coord = await serv.aplace2coord(place, **kwargs)
+        
+        See also
+        --------
+        :meth:`~GISCOService.place2coord`, :meth:`OSMService.aplace2coord`.
+        """
+        return await super(GISCOService,self).aplace2coord(place=place, **kwargs)
+
     #/************************************************************************/
     #def _coord2geom(self, coord, **kwargs): 
     #    """Iterable version of :meth:`~GISCOService.coord2geom`.
@@ -3265,8 +3497,9 @@ class GISCOService(OSMService):
         return super(GISCOService,self).coord2place(coord=coord, **kwargs)
 
     #/************************************************************************/
-    def _coord2nuts(self, coord, **kwargs):
-        # iterable version of :meth:`~GISCOService.coord2nuts`.
+    def __coord2url(self, coord, **kwargs):
+        # build the findnuts URLs of the input coordinate(s); return the formatted
+        # coordinates, the URLs and the key to extract from the responses
         if not happyType.issequence(coord):     
             coord = list(coord)
         if not all([happyType.issequence(c) for c in coord]):     
@@ -3279,38 +3512,70 @@ class GISCOService(OSMService):
                        # 'proj': kwargs.pop('proj',4326),
                        'geometry': kwargs.pop('geometry','N')
                        })
+        url = []
         for i in range(len(coord)):
             kwargs.update({'x': coord[i][1], 'y': coord[i][0]})
             try:
-                url = self.url_findnuts(**kwargs)
+                url.append(self.url_findnuts(**kwargs))
             except:
                 raise happyError('error findnuts URL formatting')
+        return coord, url, key
+    
+    #/************************************************************************/
+    @staticmethod
+    def __filter_nuts(coord, data, key):
+        # filter the NUTS data loaded for a given location
+        try:
+            assert data not in ({},None)
+        except:
+            happyError('NUTS for location %s not loaded' % coord)
+        try:
+            assert key is not None
+        except AssertionError:
             try:
-                data = self.read_url(url, **{_Decorator.KW_OFORMAT: 'JSON'})
-                assert data not in ({},None)
-            except happyError as e:
-                raise happyError(errtype=e)
+                assert data != [] 
             except:
-                happyError('NUTS for location %s not loaded' % coord[i])
+                raise happyError('NUTS for geolocation %s not recognised' % coord)  
+            else:
+                pass
+        else:
             try:
-                assert key is not None
+                assert key in data and data[key] != [] 
             except AssertionError:
-                try:
-                    assert data != [] 
-                except:
-                    raise happyError('NUTS for geolocation %s not recognised' % coord[i])  
-                else:
-                    pass
+                # raise happyError
+                happyVerbose('NUTS for geolocation %s and key %s not recognised' % (coord, key))
+                data = None
             else:
-                try:
-                    assert key in data and data[key] != [] 
-                except AssertionError:
-                    # raise happyError
-                    happyVerbose('NUTS for geolocation %s and key %s not recognised' % (coord[i], key))
-                    data = None
-                else:
-                    data = data.get(key)
-            yield data if data is None or not happyType.issequence(data) or len(data)>1 else data[0]
+                data = data.get(key)
+        return data if data is None or not happyType.issequence(data) or len(data)>1 else data[0]
+
+    #/************************************************************************/
+    def _coord2nuts(self, coord, **kwargs):
+        # iterable version of :meth:`~GISCOService.coord2nuts`.
+        coord, url, key = self.__coord2url(coord, **kwargs)
+        for c, u in zip(coord, url):
+            try:
+                data = self.read_url(u, **{_Decorator.KW_OFORMAT: 'JSON'})
+            except happyError as e:
+                raise happyError(errtype=e)
+            except:
+                data = None
+            yield self.__filter_nuts(c, data, key)
+
+    #/************************************************************************/
+    async def _acoord2nuts(self, coord, **kwargs):
+        # asynchronous version of :meth:`~GISCOService._coord2nuts`: return the 
+        # list of NUTS once all requests have been awaited concurrently
+        coord, url, key = self.__coord2url(coord, **kwargs)
+        async def aread(c, u):
+            try:
+                data = await self.aread_url(u, **{_Decorator.KW_OFORMAT: 'JSON'})
+            except happyError as e:
+                raise happyError(errtype=e)
+            except:
+                data = None
+            return self.__filter_nuts(c, data, key)
+        return await asyncio.gather(*[aread(c, u) for c, u in zip(coord, url)])
 
     #/************************************************************************/
     @_Decorator.parse_year
@@ -3402,14 +3667,44 @@ class GISCOService(OSMService):
         level = kwargs.pop('level',None)
         #if 'key' not in kwargs:
         kwargs.update({'key': _Decorator.parse_nuts.KW_RESULTS})
+        return self.__parse_nuts(self._coord2nuts(coord, **kwargs), level)
+
+    #/************************************************************************/
+    @staticmethod
+    def __parse_nuts(geom, level):
+        # extract the NUTS (at given levels) from the data output by _coord2nuts
         nuts = []        
         #[nuts.append(data if len(data)>1 else data[0]) for data in self._coord2nuts(coord, **kwargs)]
         func = lambda *a, **kw: [kw.get(_Decorator.KW_NUTS)]
         [nuts.append(data if data is None or len(data)>1 else data[0])      \
-             for g in self._coord2nuts(coord, **kwargs)                     \
+             for g in geom                                                  \
              for data in _Decorator.parse_nuts(func)(g, level=level)]
         return nuts[0] if len(nuts)==1 else nuts
 
+    #/************************************************************************/
+    @_Decorator.parse_year
+    @_Decorator.parse_projection
+    @_Decorator.parse_geometry
+    @_Decorator.parse_coordinate
+    async def acoord2nuts(self, coord, **kwargs):
+        """Retrieve the various |NUTS| geometries (all levels) associated to given 
+        geolocation(s): native coroutine version of the method :meth:`~GISCOService.coord2nuts`.
+        
+            >>> nuts = await serv.acoord2nuts(coord, **kwargs)
+            
+        The requests for all the input geolocations are awaited concurrently on 
+        the running event loop. See :meth:`~GISCOService.coord2nuts` for the 
+        description of the arguments.
+        
+        See also
+        --------
+        :meth:`~GISCOService.coord2nuts`, :meth:`~GISCOService.aplace2nuts`,
+        :meth:`base._Service.aread_url`.
+        """
+        level = kwargs.pop('level',None)
+        kwargs.update({'key': _Decorator.parse_nuts.KW_RESULTS})
+        return self.__parse_nuts(await self._acoord2nuts(coord, **kwargs), level)
+
     #/************************************************************************/
     @_Decorator.parse_year
     @_Decorator.parse_projection
@@ -3501,6 +3796,27 @@ class GISCOService(OSMService):
         nuts = self.coord2nuts(coord, **kwargs)
         return nuts[0] if len(nuts)==1 else nuts
 
+    #/************************************************************************/
+    @_Decorator.parse_year
+    @_Decorator.parse_projection
+    @_Decorator.parse_place
+    async def aplace2nuts(self, place, **kwargs): 
+        """Retrieve the various |NUTS| geometries (all levels) associated to given 
+        geolocation(s) provided as a (topo)name: native coroutine version of the
+        method :meth:`~GISCOService.place2nuts`.
+        
+            >>> nuts = await serv.aplace2nuts(place, **kwargs)
+        
+        See also
+        --------
+        :meth:`~GISCOService.place2nuts`, :meth:`~GISCOService.aplace2coord`, 
+        :meth:`~GISCOService.acoord2nuts`.
+        """
+        kwargs.update({'unique': kwargs.pop('unique',True)})
+        coord = await self.aplace2coord(place, **kwargs)
+        nuts = await self.acoord2nuts(coord, **kwargs)
+        return nuts[0] if len(nuts)==1 else nuts
+
     #/************************************************************************/
     @_Decorator.parse_coordinate
     def coord2route(self, coord, **kwargs):
@@ -3561,7 +3877,19 @@ class GISCOService(OSMService):
         :meth:`~GISCOService.place2route`, :meth:`~GISCOService.coord2place`, 
         :meth:`~GISCOService.url_routing`, :meth:`base._Service.get_response`.
         """
-        routes, waypoints = None, None
+        url = self.__coord2route_url(coord, **kwargs)
+        try:
+            data = self.read_url(url, **{_Decorator.KW_OFORMAT: 'JSON'})
+            assert data is not None
+        except happyError as e:
+            raise happyError(errtype=e)
+        except:
+            raise happyError('route not available')
+        return self.__parse_route(data)
+
+    #/************************************************************************/
+    def __coord2route_url(self, coord, **kwargs):
+        # build the routing URL of the list of destinations
         if len(coord)<2 or not all([happyType.issequence(c) for c in coord]):
             raise happyError('wrong format for list of destinations along the route')
         if not coord in([],None):
@@ -3570,16 +3898,15 @@ class GISCOService(OSMService):
             coordinates = kwargs.pop(_Decorator.parse_coordinate.KW_POLYLINE)
         kwargs.update({'coordinates': coordinates})
         try:
-            url = self.url_routing(**kwargs)
+            return self.url_routing(**kwargs)
         except:
             raise happyError('error route URL formatting')
-        try:
-            data = self.read_url(url, **{_Decorator.KW_OFORMAT: 'JSON'})
-            assert data is not None
-        except happyError as e:
-            raise happyError(errtype=e)
-        except:
-            raise happyError('route not available')
+
+    #/************************************************************************/
+    @staticmethod
+    def __parse_route(data):
+        # extract the route and the waypoints from the routing data
+        routes, waypoints = None, None
         try:
             assert _Decorator.parse_route.KW_CODE in data       \
                 and data[_Decorator.parse_route.KW_CODE].upper() == "OK"
@@ -3590,6 +3917,29 @@ class GISCOService(OSMService):
             waypoints = data.get(_Decorator.parse_route.KW_WAYPOITNS)
         return routes[0], waypoints
 
+    #/************************************************************************/
+    @_Decorator.parse_coordinate
+    async def acoord2route(self, coord, **kwargs):
+        """Retrieve the route going through the various steps/destinations represented 
+        by a list of geographic coordinates: native coroutine version of the method
+        :meth:`~GISCOService.coord2route`.
+        
+            >>>  route, waypoints = await serv.acoord2route(coord, **kwargs)
+        
+        See also
+        --------
+        :meth:`~GISCOService.coord2route`, :meth:`base._Service.aread_url`.
+        """
+        url = self.__coord2route_url(coord, **kwargs)
+        try:
+            data = await self.aread_url(url, **{_Decorator.KW_OFORMAT: 'JSON'})
+            assert data is not None
+        except happyError as e:
+            raise happyError(errtype=e)
+        except:
+            raise happyError('route not available')
+        return self.__parse_route(data)
+
     #/************************************************************************/
     @_Decorator.parse_place
     def place2route(self, place, **kwargs):
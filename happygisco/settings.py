@@ -797,4 +797,237 @@ HTTP_ERROR_STATUS   = { # Informational.
                              }
 }
 """Descriptions of HTTP status codes. See https://en.wikipedia.org/wiki/List_of_HTTP_status_codes.
-"""
\ No newline at end of file
+"""
+DEF_MAX_IN_FLIGHT   = 32
+"""Default maximum number of requests simultaneously in flight for a given service.
+"""
+DEF_MAX_PER_HOST    = 8
+"""Default maximum number of concurrent requests sent to a same host.
+"""
+HOST_RATE_LIMITS    = {'nominatim.openstreetmap.org': 1
+                       }
+"""Maximum number of requests per second allowed on given hosts. |Nominatim|
+usage policy (see https://operations.osmfoundation.org/policies/nominatim/) 
+requires an absolute maximum of 1 request per second.
+"""
+DEF_RATE_BURST      = 1
+"""Default number of requests that can be sent at once to a rate limited host
+(*i.e.*, capacity of the token bucket).
+"""
+DEF_MAX_WORKERS     = 8
+"""Default number of threads used to send requests in parallel when the
+asynchronous implementation (based on :mod:`aiohttp`) is not available.
+"""
+CACHE_META_EXT      = '.meta'
+"""Extension of the sidecar files storing, next to a cached response, the URL it
+was downloaded from together with its validators.
+"""
+CACHE_VALIDATORS    = {'ETag':              'If-None-Match', 
+                       'Last-Modified':     'If-Modified-Since'
+                       }
+"""Response validators stored alongside cached responses, and the headers of the
+conditional requests used to revalidate them (see RFC 7232).
+"""
+CACHE_PART_EXT      = '.part'
+"""Extension of the partial files where responses are streamed before they are
+(atomically) moved into the cache.
+"""
+CACHE_CHUNK_SIZE    = 1048576
+"""Size (in bytes) of the chunks used when streaming responses to the cache.
+"""
+REMOTE_ZIP_MIN_SIZE = 8388608
+"""Minimum size (in bytes) of the zip archives whose members are read remotely,
+*i.e.* through HTTP range requests, when they are not already cached; smaller
+archives are entirely downloaded (and cached). Only the synchronous implementation
+of the services reads archives remotely: asynchronous services (and coroutines 
+like :meth:`~base._Service.aread_url`) always download them entirely.
+"""
+REMOTE_ZIP_BLOCK_SIZE = 65536
+"""Initial size (in bytes) of the blocks fetched through HTTP range requests when 
+reading a remote zip archive; the size doubles as long as the archive is read 
+sequentially, while the members read are fetched entirely in one request.
+"""
+RETRY_POLICY        = {429:                     4,
+                       500:                     3,
+                       502:                     3,
+                       503:                     4,
+                       504:                     3,
+                       'ConnectionError':       3,
+                       'Timeout':               3,
+                       'ChunkedEncodingError':  2,
+                       'ClientConnectionError': 3,
+                       'TimeoutError':          3
+                       }
+"""Maximum number of times a request is retried, indexed by the HTTP status codes 
+and the names of the exception classes (:mod:`requests` and :mod:`aiohttp`) 
+regarded as transient failures.
+"""
+DEF_RETRY_BACKOFF   = 0.5
+"""Default base delay (in seconds) of the exponential backoff between retries.
+"""
+DEF_RETRY_MAX_BACKOFF = 30
+"""Default maximum delay (in seconds) between two retries.
+"""
+DEF_RETRY_AFTER_MAX = 300
+"""Maximum delay (in seconds) requested by a :literal:`Retry-After` header that is
+honoured; beyond it, the request is not retried.
+"""
+DEF_HEDGE           = False
+"""Default flag set to send hedged requests, *i.e.* a duplicate of a request that
+has not been answered after the :data:`HEDGE_QUANTILE` latency of its host.
+"""
+HEDGE_QUANTILE      = 0.95
+"""Quantile of the latencies observed on a host after which a request is hedged.
+"""
+HEDGE_MIN_SAMPLES   = 20
+"""Minimum number of latencies observed on a host before hedging requests.
+"""
+HEDGE_WINDOW        = 200
+"""Number of (most recent) latencies kept per host to estimate the hedging delay.
+"""
+DEF_MEMORY_CACHE_SIZE = 67108864
+"""Default maximum size (in bytes) of the in-memory cache shared by all services
+of a process in front of the on-disk caches; set it to 0 to disable it.
+"""
+DEF_MAX_CACHE_SIZE  = None
+"""Default maximum size (in bytes) of an on-disk cache; when exceeded, entries are
+evicted in the background (expired entries first, then the least recently used
+ones); when set to :data:`None`, the size of the cache is not limited.
+"""
+DEF_MAX_CACHE_ENTRIES = None
+"""Default maximum number of entries of an on-disk cache; when set to :data:`None`,
+the number of entries is not limited.
+"""
+CACHE_EVICTION_BATCH = 256
+"""Maximum number of entries removed from an on-disk cache per eviction step.
+"""
+CACHE_KEY_COORDINATES = ['x', 'y', 'lat', 'lon']
+"""Query parameters of the URLs holding coordinates, which are rounded to 
+:data:`CACHE_KEY_PRECISION` decimals in the keys of the cached responses.
+"""
+CACHE_KEY_PRECISION = 6
+"""Number of decimals the coordinates of the queries are rounded to in the keys
+of the cached responses, so that requests for the same location share the same
+entry; when set to :data:`None`, coordinates are not rounded.
+"""
+CACHE_SHARD_WIDTH   = 2
+"""Number of leading (hexadecimal) characters of the cache keys used to name the
+subdirectories (shards) of an on-disk cache; when set to 0, all entries are 
+stored in the cache directory itself (former flat layout).
+"""
+CACHE_OBJECTS_DIR   = 'objects'
+"""Name of the subdirectory of an on-disk cache where the bodies of the downloaded
+responses are stored once per content (named after their SHA-256 digest), the
+entries of the cache being hard links to them (negative responses excepted); 
+the time every entry was downloaded or revalidated is then kept in its sidecar,
+so that its freshness does not depend on the other entries with the same content.
+When set to :data:`None` (or when hard links are not supported), every entry 
+keeps its own copy.
+"""
+CACHE_OBJECTS_GC_INTERVAL = 3600
+"""Minimum interval (in seconds) between two collections of the objects of an 
+on-disk cache which are not linked to any entry anymore.
+"""
+CACHE_LOCK_DIR      = '.locks'
+"""Name of the subdirectory of an on-disk cache holding the lock files used to
+synchronise the processes sharing the cache.
+"""
+CACHE_LOCK_WIDTH    = 4
+"""Number of leading (hexadecimal) characters of the cache keys used to name the 
+lock files, *i.e.* the keys are hashed onto at most :literal:`16**CACHE_LOCK_WIDTH`
+lock files.
+"""
+CACHE_TMP_EXT       = '.tmp'
+"""Extension of the temporary files written to an on-disk cache before they are
+atomically renamed.
+"""
+CACHE_BACKENDS      = ['File', 'SQLite']
+"""Backends available to store cached responses on disk: either one file per
+response (:literal:`'File'`), or one single pack file (SQLite database) for the
+small responses (:literal:`'SQLite'`).
+"""
+DEF_CACHE_BACKEND   = 'File'
+"""Default backend used to store cached responses on disk.
+"""
+CACHE_PACK_NAME     = 'pack.sqlite'
+"""Name of the pack file (SQLite database) storing small cached responses.
+"""
+CACHE_PACK_MAX_SIZE = 65536
+"""Maximum size (in bytes) of the responses stored in the pack file when the 
+:literal:`'SQLite'` backend is used; larger responses are stored as files.
+"""
+DEF_CACHE_DECODED   = False
+"""Default flag set to keep, next to the cached JSON responses, their decoded 
+representation (pickled) so that the cached responses are not parsed again.
+"""
+CACHE_DECODED_EXT   = '.pkl'
+"""Extension of the sidecar files storing the decoded representation of cached
+JSON responses.
+"""
+CACHE_LAZY_MIN_SIZE = 65536 # 64KB
+"""Minimum size (in bytes) of the cached files that are loaded lazily, *i.e.* 
+only when the content of the cached response is accessed, instead of being read
+(and kept in memory) when the response is retrieved.
+"""
+DEF_STALE_WHILE_REVALIDATE = None
+"""Default maximum staleness (in seconds) of the expired cached responses that 
+are still returned, while they are refreshed in background, when they are 
+requested: a response cached for longer than :literal:`expire_after` plus this 
+staleness is downloaded again before being returned. When :data:`None` (or 0), 
+expired responses are always downloaded again before being returned.
+"""
+CACHE_CATEGORIES    = ['nuts', 'nuts_versioned', 'country', 'country_versioned', 
+                       'geocode', 'findnuts', 'routing']
+"""Categories of requests (see :meth:`~services.GISCOService.url_category`) whose 
+cached responses can be given specific lifetimes through the :literal:`expire_after`
+parameter of the services; the :literal:`_versioned` categories gather the |NUTS|
+and countries datasets identified by their year (and scale, projection, ...), 
+which do not change once released.
+"""
+CACHE_NEVER_EXPIRE  = float('inf')
+"""Lifetime of the cached responses that never expire, *e.g.* pinned datasets: 
+unlike a null or negative :literal:`expire_after` parameter, such responses are
+kept when the whole cache is cleaned (see :meth:`~base._Service.clean_cache`).
+"""
+CACHE_POLICIES      = {'nuts_versioned':     CACHE_NEVER_EXPIRE,
+                       'country_versioned':  CACHE_NEVER_EXPIRE}
+"""Default lifetimes (in seconds) of the cached responses per category of requests,
+used when the :literal:`expire_after` parameter of the services is not set, or 
+is set per category without the given category; an explicit (scalar) lifetime
+always applies instead. By default, the versioned datasets are pinned in the 
+cache with :data:`CACHE_NEVER_EXPIRE`.
+"""
+DEF_EXPIRE_NEGATIVE = 3600 # 1 hour
+"""Default lifetime (in seconds) of negative cached responses, *i.e.* responses 
+with an error status listed in :data:`CACHE_NEGATIVE_STATUS` or with an empty list 
+of results, so that unresolved requests are not sent again at every run. When
+:data:`None`, error responses are not cached and empty results are cached like 
+any other response.
+"""
+CACHE_NEGATIVE_STATUS = [404]
+"""Error status of the responses that are cached as negative responses.
+"""
+CACHE_NEGATIVE_KEYS = ['results', 'features']
+"""Keys of the JSON responses whose empty list of results identifies a negative 
+response, *e.g.* :literal:`results` for |GISCO| *findnuts* service and :literal:`features` 
+for |GISCO| geocoding service (an empty JSON list, as returned by |Nominatim|, is
+also negative).
+"""
+CACHE_NEGATIVE_MAX_SIZE = 1024
+"""Maximum size (in bytes) of the responses inspected for an empty list of results.
+"""
+CACHE_BUNDLE_FORMAT = 1
+"""Version of the format of the archives exported from (and imported into) the 
+cache.
+"""
+CACHE_BUNDLE_MANIFEST = 'manifest.json'
+"""Name of the manifest of the archives exported from the cache.
+"""
+CACHE_BUNDLE_DATA   = 'data'
+"""Directory of the cached responses in the archives exported from the cache.
+"""
+STATS_LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+"""Upper bounds (in seconds) of the buckets of the histograms of the latencies of 
+the requests kept per host (see :meth:`~happygisco.base._Service.stats`); a last
+bucket collects the latencies beyond.
+"""
@@ -39,15 +39,138 @@ metadata.update({
 #==============================================================================
 
 import unittest
+import time
+import os, io, tempfile, shutil
+import threading, asyncio
+import hashlib, urllib.parse, zipfile, json, pickle
+import http.server
+import importlib.util, contextlib
 
+from happygisco import settings
 from happygisco.settings import happyError
-from happygisco.base import _Decorator
+from happygisco.base import _Decorator, _Scheduler, _Retry, _MemoryCache, _CacheIndex, _Stats
+from happygisco.base import _Service, _RemoteFile, AIOHTTP_INSTALLED
+from happygisco.services import OSMService, GISCOService
 
 #==============================================================================
 # GLOBAL VARIABLES/METHODS
 #==============================================================================
 
 from . import runtest as _runtest
+
+_ZIP = io.BytesIO()
+with zipfile.ZipFile(_ZIP, 'w') as _zf:
+    for _i in range(4):
+        _zf.writestr('NUTS_LEVL_%s.geojson' % _i, '{"level": %s}' % _i)
+        
+# archive with large (stored) members, read through range requests
+_MEMBERS = {'m%s.bin' % i: hashlib.sha512(bytes([i])).digest() * 4096 for i in range(3)}
+_REMOTE_ZIP = io.BytesIO()
+with zipfile.ZipFile(_REMOTE_ZIP, 'w') as _zf:
+    for (_name, _member) in _MEMBERS.items():
+        _zf.writestr(_name, _member)
+
+# files served by the local server used by the tests of the services
+FILES = {'a.json':      b'{"a": 1}',
+         'b.json':      b'{"a": 1}', # same content as a.json
+         'empty.json':  b'{"results": []}',
+         'big.bin':     bytes(range(256)) * 1024,
+         'data.zip':    _ZIP.getvalue(),
+         'remote.zip':  _REMOTE_ZIP.getvalue()}
+
+#/****************************************************************************/
+# _Handler
+#/****************************************************************************/
+class _Handler(http.server.BaseHTTPRequestHandler):
+    # handler of the local server: the files above are served with validators
+    # and range requests, while the query may ask for a given status (status=),
+    # a number of transient failures (fail=) or a delay (delay=)
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, *args):
+        pass
+    def do_HEAD(self):
+        self.__reply(head=True)
+    def do_GET(self):
+        self.__reply()
+        
+    def __send(self, status, body=b'', head=False, **headers):
+        self.send_response(status)
+        for (k, v) in headers.items():
+            self.send_header(k.replace('_', '-'), v)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if head is False:
+            self.wfile.write(body)
+            
+    def __reply(self, head=False):
+        parts = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(parts.query))
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.attempts[self.path] = server.attempts.get(self.path, 0) + 1
+            attempt = server.attempts[self.path]
+        if 'delay' in query:
+            time.sleep(float(query['delay']))
+        if attempt <= int(query.get('fail', 0)):
+            return self.__send(503, b'busy', head, Retry_After=query.get('retry_after', '0'))
+        elif 'status' in query:
+            return self.__send(int(query['status']), query.get('body', 'error').encode(), head)
+        body = FILES.get(parts.path.lstrip('/'))
+        if body is None:
+            return self.__send(404, b'not found', head)
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            return self.__send(304, b'', head, ETag=etag)
+        rng = self.headers.get('Range')
+        if self.headers.get('If-Range') not in (None, etag):
+            rng = None # the resource was modified: it is sent entirely
+        if rng is not None and rng.startswith('bytes='):
+            start, end = rng[len('bytes='):].split('-')
+            start, end = int(start), min(int(end or len(body) - 1), len(body) - 1)
+            if start >= len(body):
+                return self.__send(416, b'', head, Content_Range='bytes */%s' % len(body))
+            return self.__send(206, body[start:end+1], head, ETag=etag, Accept_Ranges='bytes',
+                               Content_Range='bytes %s-%s/%s' % (start, end, len(body)))
+        self.__send(200, body, head, ETag=etag, Accept_Ranges='bytes')
+
+#/****************************************************************************/
+# _ServerTestCase
+#/****************************************************************************/
+class _ServerTestCase(unittest.TestCase):
+    """Base class of the tests run against a local HTTP server (see :data:`FILES`),
+    every test using its own cache directory.
+    """    
+    module = 'base'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.server.requests, cls.server.attempts = [], {}
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:%s/' % cls.server.server_address[1]
+        
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_store = tempfile.mkdtemp()
+        with self.server.lock:
+            self.server.requests[:], self.server.attempts = [], {}
+        _Service(cache_store=False).memory_cache.clear()
+        
+    def tearDown(self):
+        shutil.rmtree(self.cache_store, ignore_errors=True)
+        
+    def requests(self, path=None):
+        # number of requests received (for a given path)
+        return len([r for r in self.server.requests if path is None or r.startswith('/' + path)])
+        
         
 #/****************************************************************************/
 # _DecoratorTestCase
@@ -201,12 +324,1121 @@ class _DecoratorTestCase(unittest.TestCase):
         self.assertRaises(happyError,
                           new_func(year=2000))
 
+#/****************************************************************************/
+# _SchedulerTestCase
+#/****************************************************************************/
+class _SchedulerTestCase(unittest.TestCase):
+    """Class of tests for class :class:`_Scheduler`
+    """    
+    module = 'base'
+
+    #/************************************************************************/
+    def test_1_rate(self):
+        sched = _Scheduler(rate_limit={'dumb.com': 20})
+        self.assertEqual(sched.host('http://DUMB.com/path?q=1'), 'dumb.com')
+        self.assertEqual(sched.rate('dumb.com'), 20)
+        self.assertEqual(sched.rate('dumber.com'), None)
+        start = time.time()
+        for _ in range(5):
+            with sched.slot('http://dumb.com'):
+                pass
+        self.assertTrue(time.time() - start >= 0.15)
+        self.assertRaises(happyError, _Scheduler, max_per_host=-1)
+
+#/****************************************************************************/
+# _RetryTestCase
+#/****************************************************************************/
+class _RetryTestCase(unittest.TestCase):
+    """Class of tests for class :class:`_Retry`
+    """    
+    module = 'base'
+
+    #/************************************************************************/
+    def test_1_delay(self):
+        retry = _Retry(retry={503: 2, 'ConnectionError': 1}, backoff=1, max_backoff=3)
+        self.assertEqual(retry.retries(503), 2)
+        self.assertEqual(retry.retries(404), 0)
+        self.assertEqual(retry.retries(ConnectionResetError()), 1)
+        self.assertEqual(retry.retries(ValueError()), 0)
+        self.assertTrue(0 <= retry.delay(503, 1) <= 2)
+        self.assertEqual(retry.delay(503, 2), None)
+        self.assertEqual(retry.threshold('dumb.com'), None)
+        self.assertEqual(_Retry(retry=False).delay(503, 0), None)
+        self.assertRaises(happyError, _Retry, retry={503: -1})
+
+#/****************************************************************************/
+# _MemoryCacheTestCase
+#/****************************************************************************/
+class _MemoryCacheTestCase(unittest.TestCase):
+    """Class of tests for class :class:`_MemoryCache`
+    """    
+    module = 'base'
+
+    #/************************************************************************/
+    def test_1_lru(self):
+        cache = _MemoryCache(max_size=40)
+        cache.put('a', b'0123456789', 1)
+        cache.put('b', b'0123456789', 2)
+        self.assertEqual(cache.get('a'), (b'0123456789', 1))
+        cache.put('c', b'0123456789')
+        cache.put('d', b'0123456789')
+        cache.put('e', b'0123456789')
+        self.assertEqual(cache.get('b'), None) # least recently used
+        self.assertEqual((len(cache), cache.size), (4, 40))
+        cache.put('f', b'0'*11) # too large
+        self.assertEqual(cache.get('f'), None)
+        cache.clear(prefix='a')
+        self.assertEqual((len(cache), cache.size), (3, 30))
+
+#/****************************************************************************/
+# _CacheIndexTestCase
+#/****************************************************************************/
+class _CacheIndexTestCase(unittest.TestCase):
+    """Class of tests for class :class:`_CacheIndex`
+    """    
+    module = 'base'
+
+    #/************************************************************************/
+    def test_1_evict(self):
+        with tempfile.TemporaryDirectory() as cache_store:
+            for i, name in enumerate(('a', 'b', 'c')):
+                pathname = os.path.join(cache_store, name)
+                with open(pathname, 'wb') as f:
+                    f.write(b'0123456789')
+                os.utime(pathname, (1000 + i, 1000))
+            index = _CacheIndex(cache_store)
+            self.assertEqual((len(index), index.size), (3, 30))
+            index.touch(os.path.join(cache_store, 'a')) # 'a' is now the most recent
+            index.max_entries = 2
+            self.assertEqual(index.evict(), 1)
+            self.assertEqual(sorted(os.listdir(cache_store)), ['a', 'c'])
+            index.max_size = 5
+            self.assertEqual(index.evict(), 2)
+            self.assertEqual((len(index), index.size), (0, 0))
+
+    #/************************************************************************/
+    def test_2_collect(self):
+        with tempfile.TemporaryDirectory() as cache_store:
+            objdir = os.path.join(cache_store, settings.CACHE_OBJECTS_DIR, 'ab')
+            os.makedirs(objdir)
+            for name in ('ab01', 'ab02'):
+                with open(os.path.join(objdir, name), 'wb') as f:
+                    f.write(b'0123456789')
+            os.link(os.path.join(objdir, 'ab01'), os.path.join(cache_store, 'a'))
+            index = _CacheIndex(cache_store)
+            self.assertEqual((len(index), index.size), (1, 10)) # objects not indexed
+            self.assertEqual(index.collect(), 1)
+            self.assertEqual(os.listdir(objdir), ['ab01'])
+
+    #/************************************************************************/
+    def test_3_links(self):
+        # the entries hard-linked to the same body are accounted for once, and
+        # the least recently used entries are evicted first
+        with tempfile.TemporaryDirectory() as cache_store:
+            names = ['a', 'b', 'c', 'd']
+            with open(os.path.join(cache_store, 'a'), 'wb') as f:
+                f.write(b'0123456789')
+            for name in names:
+                pathname = os.path.join(cache_store, name)
+                if name in ('b', 'c'):
+                    os.link(os.path.join(cache_store, 'a'), pathname)
+                elif name == 'd':
+                    with open(pathname, 'wb') as f:
+                        f.write(b'01234')
+            for i, name in enumerate(names):
+                os.utime(os.path.join(cache_store, name), (1000 + i, 1000))
+            index = _CacheIndex(cache_store)
+            self.assertEqual((len(index), index.size), (4, 15))
+            index.discard(os.path.join(cache_store, 'b'))
+            self.assertEqual((len(index), index.size), (3, 15))
+            st = os.stat(os.path.join(cache_store, 'b'))
+            index.touch(os.path.join(cache_store, 'b'), 2000, st.st_mtime, st.st_size, (st.st_dev, st.st_ino))
+            index.touch(os.path.join(cache_store, 'd')) # 'd' is now the most recent
+            self.assertEqual((len(index), index.size), (4, 15))
+            # the body of 'a', 'b' and 'c' is freed once all of them are evicted
+            index.max_size = 5
+            self.assertEqual(index.evict(), 3)
+            self.assertEqual(sorted(os.listdir(cache_store)), ['d'])
+            self.assertEqual((len(index), index.size), (1, 5))
+
+#/****************************************************************************/
+# _StatsTestCase
+#/****************************************************************************/
+class _StatsTestCase(unittest.TestCase):
+    """Class of tests for class :class:`_Stats`
+    """    
+    module = 'base'
+
+    #/************************************************************************/
+    def test_1_count(self):
+        total = _Stats()
+        stats = _Stats(parent=total)
+        stats.count('disk_hits')
+        stats.count('bytes_read', 10)
+        stats.observe('host', 0.07)
+        stats.observe('host', 100, error=True)
+        counters = stats.snapshot()
+        self.assertEqual((counters['disk_hits'], counters['bytes_read']), (1, 10))
+        self.assertEqual((counters['network_requests'], counters['network_errors']), (2, 1))
+        buckets = dict(counters['latency']['host']['buckets'])
+        self.assertEqual((buckets[0.1], buckets[None]), (1, 1))
+        stats.reset()
+        self.assertEqual(stats.snapshot()['disk_hits'], 0)
+        self.assertEqual(total.snapshot()['disk_hits'], 1) # aggregate is kept
+
+#/****************************************************************************/
+# _ExecutorTestCase
+#/****************************************************************************/
+class _ExecutorTestCase(_ServerTestCase):
+    """Class of tests for the pool of threads of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_workers(self):
+        self.assertRaises(happyError, _Service, max_workers=-1)
+        self.assertRaises(happyError, _Service, max_workers='8')
+        serv = _Service(cache_store=False, max_workers=4)
+        urls = [self.url + 'a.json?delay=0.2&i=%s' % i for i in range(4)]
+        start = time.time()
+        self.assertEqual(serv.read_url(*urls), [{'a': 1}] * 4)
+        self.assertTrue(time.time() - start < 0.6) # sent in parallel
+        serv.close()
+
+#/****************************************************************************/
+# _AsynchronousTestCase
+#/****************************************************************************/
+@unittest.skipUnless(AIOHTTP_INSTALLED, 'aiohttp not installed')
+class _AsynchronousTestCase(_ServerTestCase):
+    """Class of tests for the asynchronous implementation of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_read(self):
+        serv = _Service(cache_store=self.cache_store, asynchronous=True)
+        self.assertEqual(serv.read_url(self.url + 'a.json'), {'a': 1})
+        self.assertEqual(serv.get_status(self.url + 'a.json', self.url + 'none.json'), [200, -1])
+        self.assertEqual(serv.read_url(self.url + 'big.bin', _caching_=False, ofmt='bytes'), FILES['big.bin'])
+        async def aread():
+            data = await serv.aread_url(self.url + 'b.json', ofmt='text')
+            await serv.aclose()
+            return data
+        self.assertEqual(asyncio.run(aread()), '{"a": 1}')
+        serv.close()
+        self.assertRaises(happyError, _Service, asynchronous=1)
+
+    #/************************************************************************/
+    def test_2_loop(self):
+        # the loop of the service is not installed in the calling thread
+        res = []
+        def run():
+            serv = _Service(cache_store=self.cache_store, asynchronous=True)
+            res.append(serv.read_url(self.url + 'a.json'))
+            try:
+                asyncio.get_event_loop()
+            except RuntimeError:
+                res.append(None)
+            serv.close()
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(res, [{'a': 1}, None])
+
+    #/************************************************************************/
+    def test_3_session(self):
+        # a session passed by the caller is not closed with the service
+        serv, closed = _Service(cache_store=False), []
+        session = type(serv.session)()
+        session.close = lambda: closed.append(True)
+        serv.session = session
+        serv.close()
+        self.assertEqual(closed, [])
+        self.assertEqual(serv.read_url(self.url + 'a.json'), {'a': 1})
+
+    #/************************************************************************/
+    def test_4_status(self):
+        # statuses are checked explicitly, so that transient failures are retried
+        # and error responses can be cached
+        serv = _Service(cache_store=self.cache_store, asynchronous=True, expire_negative=60)
+        self.assertEqual(serv.read_url(self.url + 'a.json?fail=2&retry_after=0'), {'a': 1})
+        self.assertEqual(self.requests('a.json'), 3)
+        for _ in range(2):
+            self.assertRaises(happyError, serv.read_url, self.url + 'none.json')
+        self.assertEqual(self.requests('none.json'), 1) # negative response cached
+        # partial downloads: a range beyond the size of the file (416 status)
+        # restarts the download, a valid one (206 status) resumes it
+        url, etag = self.url + 'big.bin', '"%s"' % hashlib.md5(FILES['big.bin']).hexdigest()
+        partname = _Service._Service__build_cache(url, self.cache_store) + settings.CACHE_PART_EXT
+        for offset in (len(FILES['big.bin']), 1000):
+            serv.clean_cache(url, expire_after=-1)
+            os.makedirs(os.path.dirname(partname), exist_ok=True)
+            with open(partname, 'wb') as f:
+                f.write(FILES['big.bin'][:offset])
+            with open(partname + settings.CACHE_META_EXT, 'w') as f:
+                f.write('{"ETag": %s}' % json.dumps(etag))
+            self.assertEqual(serv.read_url(url, ofmt='bytes'), FILES['big.bin'])
+        serv.close()
+
+#/****************************************************************************/
+# _MappedFileTestCase
+#/****************************************************************************/
+class _MappedFileTestCase(_ServerTestCase):
+    """Class of tests for the memory-mapped archives of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_formats(self):
+        serv = _Service(cache_store=self.cache_store)
+        url = self.url + 'data.zip'
+        names = ['NUTS_LEVL_%s.geojson' % i for i in range(4)]
+        self.assertEqual(serv.read_url(url, ofmt='zip', namelist=True), names)
+        nreq = self.requests('data.zip')
+        # cached archives are mapped, other formats are still loaded in memory
+        self.assertEqual(serv.read_url(url, ofmt='zip', namelist=True), names)
+        self.assertEqual(serv.read_url(url, ofmt='zip', read='NUTS_LEVL_1.geojson'), 
+                         b'{"level": 1}')
+        data = serv.read_url(url, ofmt='bytesio')
+        self.assertIsInstance(data, io.BytesIO)
+        self.assertEqual(data.getvalue(), FILES['data.zip'])
+        self.assertEqual(self.requests('data.zip'), nreq) # read from the cache
+        serv.close()
+
+#/****************************************************************************/
+# _PrefetchTestCase
+#/****************************************************************************/
+class _PrefetchTestCase(_ServerTestCase):
+    """Class of tests for the prefetching of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_report(self):
+        serv = _Service(cache_store=self.cache_store, expire_after=1)
+        urls = [self.url + 'a.json', self.url + 'big.bin', self.url + 'none.json']
+        report = serv.prefetch(*urls)
+        self.assertEqual((sorted(report['fetched']), report['failed']), (urls[:2], urls[2:]))
+        self.assertEqual(report['bytes'], len(FILES['a.json']) + len(FILES['big.bin']))
+        report = serv.prefetch(*urls[:2])
+        self.assertEqual((report['cached'], report['bytes']), (urls[:2], 0))
+        # expired responses are revalidated: nothing is transferred
+        time.sleep(1.1)
+        report = serv.prefetch(*urls[:2])
+        self.assertEqual((sorted(report['fetched']), report['bytes']), (urls[:2], 0))
+        # the budget is checked before every download
+        serv.close()
+        serv = _Service(cache_store=self.cache_store, max_workers=1)
+        report = serv.prefetch(self.url + 'big.bin?i=1', self.url + 'big.bin?i=2', 
+                               budget=1, _force_download_=True)
+        self.assertEqual(len(report['skipped']), 1)
+        self.assertRaises(happyError, serv.prefetch, urls[0], budget=-1)
+        serv.close()
+
+    #/************************************************************************/
+    @unittest.skipUnless(AIOHTTP_INSTALLED, 'aiohttp not installed')
+    def test_2_asynchronous(self):
+        serv = _Service(cache_store=self.cache_store, asynchronous=True)
+        urls = [self.url + 'a.json', self.url + 'big.bin', self.url + 'none.json']
+        report = serv.prefetch(*urls)
+        self.assertEqual((sorted(report['fetched']), report['failed']), (urls[:2], urls[2:]))
+        self.assertEqual(report['bytes'], len(FILES['a.json']) + len(FILES['big.bin']))
+        self.assertEqual(serv.is_cached(*urls[:2]), [True, True])
+        serv.close()
+
+#/****************************************************************************/
+# _ExpiryTestCase
+#/****************************************************************************/
+class _ExpiryTestCase(_ServerTestCase):
+    """Class of tests for the lifetimes of the responses cached by :class:`_Service`
+    """    
+
+    class _CategoryService(_Service):
+        # the datasets a.json are identified as 'nuts' requests
+        def url_category(self, url):
+            return 'nuts' if url is not None and 'a.json' in url else 'geocode'
+
+    #/************************************************************************/
+    def test_1_categories(self):
+        serv = self._CategoryService(cache_store=self.cache_store, 
+                                     expire_after={'nuts': settings.CACHE_NEVER_EXPIRE, 'default': 1})
+        urls = [self.url + 'a.json', self.url + 'b.json']
+        self.assertEqual(serv.read_url(*urls), [{'a': 1}] * 2)
+        time.sleep(1.1)
+        self.assertEqual(serv.is_cached(*urls), [True, False])
+        self.assertEqual(serv.read_url(*urls), [{'a': 1}] * 2)
+        self.assertEqual((self.requests('a.json'), self.requests('b.json')), (1, 2))
+        # pinned responses are kept when the cache is cleaned
+        time.sleep(1.1)
+        serv.clean_cache(*urls)
+        self.assertEqual(serv.is_cached(*urls), [True, False])
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_policies(self):
+        self.assertEqual(settings.CACHE_POLICIES, {'nuts_versioned': settings.CACHE_NEVER_EXPIRE, 
+                                                   'country_versioned': settings.CACHE_NEVER_EXPIRE})
+        self.assertRaises(happyError, _Service, expire_after=1.5)
+        self.assertRaises(happyError, _Service, expire_after={'none': 1})
+        policies = settings.CACHE_POLICIES
+        settings.CACHE_POLICIES = {'nuts': settings.CACHE_NEVER_EXPIRE}
+        try:
+            # the policies apply to the services with no explicit lifetime only
+            serv = self._CategoryService(cache_store=self.cache_store)
+            self.assertEqual(serv.expire_after, None)
+            self.assertEqual(serv._Service__expire_for(self.url + 'a.json', None), 
+                             settings.CACHE_NEVER_EXPIRE)
+            self.assertEqual(serv._Service__expire_for(self.url + 'a.json', 60), 60)
+            self.assertEqual(serv._Service__expire_for(self.url + 'a.json', {'default': 60}), 
+                             settings.CACHE_NEVER_EXPIRE)
+            self.assertEqual(serv._Service__expire_for(self.url + 'b.json', None), None)
+        finally:
+            settings.CACHE_POLICIES = policies
+        # the versioned datasets of GISCO are distinguished
+        serv = GISCOService(cache_store=False)
+        self.assertEqual(serv.url_category(serv.url_nuts(year=2013, level=1)), 'nuts_versioned')
+        self.assertEqual(serv.url_category(serv.url_nuts('nuts2json', level=2)), 'nuts_versioned')
+        self.assertEqual(serv.url_category(serv.url_country(year=2016)), 'country_versioned')
+        self.assertEqual(serv.url_category('https://%s/nuts/nuts-units.json' % serv.cache_url), 'nuts')
+        serv.close()
+
+    #/************************************************************************/
+    def test_3_pinned(self):
+        class _VersionedService(_Service):
+            # the datasets a.json are identified as versioned 'nuts' requests
+            def url_category(self, url):
+                return 'nuts_versioned' if url is not None and 'a.json' in url else 'geocode'
+        # the last response is returned with no validator
+        urls = [self.url + 'a.json', self.url + 'big.bin', self.url + 'a.json?status=200&body=1']
+        for backend in settings.CACHE_BACKENDS:
+            serv = _VersionedService(cache_store=self.cache_store, cache_backend=backend, 
+                                     expire_after={'default': 60})
+            self.assertEqual(serv.read_url(*urls, ofmt='bytes'), [FILES['a.json'], FILES['big.bin'], b'1'])
+            # the pinned responses survive the cleaning of the whole cache
+            serv.clean_cache()
+            self.assertEqual(serv.is_cached(*urls), [True, False, True])
+            serv.memory_cache.clear()
+            self.assertEqual(serv.read_url(urls[0], urls[2]), [{'a': 1}, 1])
+            # ... unless a lifetime is set explicitly
+            serv.clean_cache(expire_after=0)
+            self.assertEqual(serv.is_cached(*urls), [False, False, False])
+            self.assertFalse(os.path.exists(self.cache_store))
+            serv.close()
+        self.assertEqual((self.requests('a.json'), self.requests('big.bin')), (4, 2))
+
+#/****************************************************************************/
+# _RemoteZipTestCase
+#/****************************************************************************/
+class _RemoteZipTestCase(_ServerTestCase):
+    """Class of tests for the zip archives read remotely by :class:`_Service`
+    """    
+
+    def setUp(self):
+        super(_RemoteZipTestCase,self).setUp()
+        self.min_size, settings.REMOTE_ZIP_MIN_SIZE = settings.REMOTE_ZIP_MIN_SIZE, 0
+        
+    def tearDown(self):
+        settings.REMOTE_ZIP_MIN_SIZE = self.min_size
+        super(_RemoteZipTestCase,self).tearDown()
+
+    #/************************************************************************/
+    def test_1_members(self):
+        serv = _Service(cache_store=self.cache_store)
+        url = self.url + 'remote.zip'
+        self.assertEqual(serv.read_url(url, ofmt='zip', namelist=True), list(_MEMBERS.keys()))
+        self.assertEqual(self.requests('remote.zip'), 2) # HEAD, then the central directory
+        # every member is fetched in one request, whatever its size
+        self.server.requests[:] = []
+        self.assertEqual(serv.read_url(url, ofmt='zip', read=['m0.bin', 'm2.bin']), 
+                         [_MEMBERS['m0.bin'], _MEMBERS['m2.bin']])
+        self.assertEqual(self.requests('remote.zip'), 4)
+        self.assertFalse(serv.is_cached(url))
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_blocks(self):
+        # the blocks grow while the file is read sequentially
+        serv = _Service(cache_store=False)
+        remote = _RemoteFile(serv.session.get, self.url + 'big.bin', len(FILES['big.bin']))
+        self.assertEqual(remote.read(10), FILES['big.bin'][:10])
+        self.assertEqual(remote.read(), FILES['big.bin'][10:])
+        self.assertEqual((self.requests('big.bin'), remote.transferred), (3, len(FILES['big.bin'])))
+        remote.seek(-100, io.SEEK_END)
+        self.assertEqual(remote.read(10), FILES['big.bin'][-100:-90]) # from memory
+        self.assertEqual(self.requests('big.bin'), 3)
+        serv.close()
+
+#/****************************************************************************/
+# _CacheKeyTestCase
+#/****************************************************************************/
+class _CacheKeyTestCase(_ServerTestCase):
+    """Class of tests for the keys of the responses cached by :class:`_Service`
+    """    
+
+    # queries and their canonical forms
+    QUERIES = [('', ''),
+               ('a=1', 'a=1'),
+               ('b=2&a=1', 'a=1&b=2'),                       # reordering
+               ('a=2&b=1&a=1', 'a=2&a=1&b=1'),               # repeated parameters
+               ('k=&a=1', 'a=1&k='),                         # blank values
+               ('q=a%20b&p=%2F', 'p=%2F&q=a+b'),             # encoding
+               ('q=a+b&p=/', 'p=%2F&q=a+b'),
+               ('q=%C3%A9', 'q=%C3%A9'),
+               ('y=50.8&x=4.3000001', 'x=4.3&y=50.8'),       # rounding
+               ('lat=50.12345678&lon=4', 'lat=50.123457&lon=4.0'),
+               ('X=1.0000004', 'X=1.0'),
+               ('x=abc&z=1.0000004', 'x=abc&z=1.0000004')]
+
+    #/************************************************************************/
+    def test_1_queries(self):
+        for (query, canonical) in self.QUERIES:
+            self.assertEqual(_Service._Service__canonical_query(query), canonical, query)
+        precision, settings.CACHE_KEY_PRECISION = settings.CACHE_KEY_PRECISION, None
+        try:
+            self.assertEqual(_Service._Service__canonical_query('y=1.0000001&x=2'), 'x=2&y=1.0000001')
+        finally:
+            settings.CACHE_KEY_PRECISION = precision
+
+    #/************************************************************************/
+    def test_2_keys(self):
+        build = lambda u: _Service._Service__build_cache(u, self.cache_store)
+        self.assertEqual(build('HTTP://Host:80/p?b=1&x=4.3000001#top'), build('http://host/p?x=4.3&b=1'))
+        self.assertNotEqual(build('http://host/p?x=4.31'), build('http://host/p?x=4.3'))
+        # the queries are only made canonical in the keys of the cache: distinct
+        # requests are neither deduplicated nor coalesced
+        urls = [self.url + 'a.json?x=1.0000001', self.url + 'a.json?x=1.0000002']
+        self.assertEqual(_Service._Service__dedupe(urls + urls[:1]), (urls, [0, 1, 0]))
+        serv = _Service(cache_store=False)
+        self.assertEqual(serv.read_url(*urls), [{'a': 1}] * 2)
+        self.assertEqual(self.requests('a.json'), 2)
+        serv.close()
+
+#/****************************************************************************/
+# _ObjectStoreTestCase
+#/****************************************************************************/
+class _ObjectStoreTestCase(_ServerTestCase):
+    """Class of tests for the bodies stored once per content by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_freshness(self):
+        # a.json and b.json have the same content, hence the same body: every 
+        # entry keeps its own freshness nevertheless
+        serv = _Service(cache_store=self.cache_store, expire_after=2)
+        urls = [self.url + 'a.json', self.url + 'b.json']
+        build = lambda u: _Service._Service__build_cache(u, self.cache_store)
+        self.assertEqual(serv.read_url(urls[0]), {'a': 1})
+        time.sleep(1.1)
+        self.assertEqual(serv.read_url(urls[1]), {'a': 1})
+        self.assertEqual(os.stat(build(urls[0])).st_ino, os.stat(build(urls[1])).st_ino)
+        time.sleep(1)
+        self.assertEqual(serv.is_cached(*urls), [False, True]) # not refreshed by b.json
+        # a revalidated entry does not refresh the other one either
+        self.assertEqual(serv.read_url(urls[0]), {'a': 1})
+        self.assertEqual(self.requests('a.json'), 2)
+        time.sleep(1.1)
+        self.assertEqual(serv.is_cached(*urls), [True, False])
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_negative(self):
+        # negative responses are not linked to the bodies of other responses
+        serv = _Service(cache_store=self.cache_store, expire_negative=60)
+        urls = [self.url + 'none.json', self.url + 'missing.json']
+        for u in urls:
+            self.assertRaises(happyError, serv.read_url, u)
+            self.assertEqual(os.stat(_Service._Service__build_cache(u, self.cache_store)).st_nlink, 1)
+        serv.close()
+
+#/****************************************************************************/
+# _DecodedTestCase
+#/****************************************************************************/
+class _DecodedTestCase(_ServerTestCase):
+    """Class of tests for the decoded copies of the responses cached by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_signature(self):
+        # responses with no validator: the decoded copy remains valid after the
+        # cached file is accessed or linked to the body of another response
+        serv = _Service(cache_store=self.cache_store, cache_decoded=True)
+        urls = [self.url + '%s.json?status=200&body=%%7B%%22b%%22%%3A2%%7D' % n for n in 'ab']
+        self.assertEqual(serv.read_url(urls[0]), {'b': 2})
+        decoded = _Service._Service__build_cache(urls[0], self.cache_store) + settings.CACHE_DECODED_EXT
+        with open(decoded, 'rb') as f:
+            signature, _ = pickle.load(f)
+        with open(decoded, 'wb') as f:
+            pickle.dump((signature, {'b': 'decoded'}), f)
+        for u in urls + urls[:1]:
+            serv.memory_cache.clear()
+            serv.read_url(u)
+        self.assertEqual(serv.read_url(urls[0]), {'b': 'decoded'})
+        # the decoded copy is ignored once the response is downloaded again
+        self.assertEqual(serv.read_url(urls[0], _force_download_=True), {'b': 2})
+        serv.close()
+
+#/****************************************************************************/
+# _ReadTestCase
+#/****************************************************************************/
+class _ReadTestCase(_ServerTestCase):
+    """Class of tests for the fused fetch, check and decoding of :meth:`_Service.read_url`
+    """    
+
+    #/************************************************************************/
+    def test_1_read(self):
+        serv = _Service(cache_store=self.cache_store)
+        urls = [self.url + 'a.json', self.url + 'b.json']
+        self.assertEqual(serv.read_url(*urls), [{'a': 1}] * 2)
+        self.assertEqual(self.requests(), 2) # one single GET request per URL
+        self.assertEqual(serv.read_url(urls[0], ofmt='text'), '{"a": 1}')
+        self.assertEqual(serv.read_url(urls[0], ofmt='bytes'), b'{"a": 1}')
+        self.assertEqual(self.requests(), 2)
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_status(self):
+        # the status of the GET response itself is checked, and error responses
+        # are not cached
+        serv = _Service(cache_store=self.cache_store)
+        url = self.url + 'a.json?status=403'
+        for _ in range(2):
+            self.assertRaises(happyError, serv.read_url, url)
+        self.assertEqual(self.requests(), 2)
+        self.assertFalse(serv.is_cached(url))
+        serv.close()
+
+#/****************************************************************************/
+# _RevalidationTestCase
+#/****************************************************************************/
+class _RevalidationTestCase(_ServerTestCase):
+    """Class of tests for the revalidation of the responses cached by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_revalidate(self):
+        serv = _Service(cache_store=self.cache_store, expire_after=1)
+        url = self.url + 'big.bin'
+        pathname = _Service._Service__build_cache(url, self.cache_store)
+        self.assertEqual(serv.read_url(url, ofmt='bytes'), FILES['big.bin'])
+        with open(pathname + settings.CACHE_META_EXT) as f:
+            self.assertEqual(json.load(f)['ETag'], '"%s"' % hashlib.md5(FILES['big.bin']).hexdigest())
+        time.sleep(1.1)
+        self.assertFalse(serv.is_cached(url))
+        # the expired response is revalidated (304 status), not transferred again
+        written = serv.stats(process=False)['bytes_written']
+        self.assertEqual(serv.read_url(url, ofmt='bytes'), FILES['big.bin'])
+        counters = serv.stats(process=False)
+        self.assertEqual((counters['revalidations'], counters['bytes_written']), (1, written))
+        self.assertEqual(self.requests('big.bin'), 2)
+        self.assertTrue(serv.is_cached(url))
+        # the sidecar is removed with its entry
+        serv.clean_cache(url, expire_after=-1)
+        self.assertFalse(os.path.exists(pathname + settings.CACHE_META_EXT))
+        serv.close()
+
+#/****************************************************************************/
+# _ResumeTestCase
+#/****************************************************************************/
+class _ResumeTestCase(_ServerTestCase):
+    """Class of tests for the downloads streamed (and resumed) by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_resume(self):
+        serv = _Service(cache_store=self.cache_store)
+        url, body = self.url + 'big.bin', FILES['big.bin']
+        pathname = _Service._Service__build_cache(url, self.cache_store)
+        partname = pathname + settings.CACHE_PART_EXT
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        # a valid partial download is resumed, while a partial download of a 
+        # modified resource, or beyond its size, is restarted
+        for (offset, validator, written) in ((1000, etag, len(body) - 1000), 
+                                             (1000, '"modified"', len(body)),
+                                             (len(body) + 10, etag, len(body))):
+            serv.clean_cache(url, expire_after=-1)
+            serv.reset_stats()
+            os.makedirs(os.path.dirname(partname), exist_ok=True)
+            with open(partname, 'wb') as f:
+                f.write(body[:offset])
+            with open(partname + settings.CACHE_META_EXT, 'w') as f:
+                f.write('{"ETag": %s}' % json.dumps(validator))
+            self.assertEqual(serv.read_url(url, ofmt='bytes'), body)
+            self.assertEqual(serv.stats(process=False)['bytes_written'], written)
+            self.assertFalse(os.path.exists(partname))
+        serv.close()
+
+#/****************************************************************************/
+# _CoalescingTestCase
+#/****************************************************************************/
+class _CoalescingTestCase(_ServerTestCase):
+    """Class of tests for the coalescing of identical requests by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_batch(self):
+        # duplicated URLs are fetched once, results are returned in input order
+        serv = _Service(cache_store=False)
+        urls = [self.url + 'a.json', self.url + 'big.bin', self.url + 'a.json']
+        self.assertEqual(serv.read_url(*urls, ofmt='bytes'), [FILES['a.json'], FILES['big.bin'], FILES['a.json']])
+        self.assertEqual((self.requests('a.json'), self.requests('big.bin')), (1, 1))
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_threads(self):
+        # identical requests in flight in other threads (and services) are shared
+        url, res = self.url + 'a.json?delay=0.3', []
+        def run():
+            serv = _Service(cache_store=False)
+            res.append(serv.read_url(url))
+            serv.close()
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual((res, self.requests('a.json')), ([{'a': 1}] * 4, 1))
+        # so are the errors
+        url, errors = self.url + 'a.json?delay=0.3&status=403', []
+        def fail():
+            serv = _Service(cache_store=False)
+            try:
+                serv.read_url(url)
+            except happyError:
+                errors.append(True)
+            finally:
+                serv.close()
+        threads = [threading.Thread(target=fail) for _ in range(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual((errors, self.requests('a.json?delay=0.3&status')), ([True] * 4, 1))
+
+#/****************************************************************************/
+# _ShardingTestCase
+#/****************************************************************************/
+class _ShardingTestCase(_ServerTestCase):
+    """Class of tests for the layout and the locking of the cache of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_layout(self):
+        serv = _Service(cache_store=self.cache_store)
+        url = self.url + 'a.json'
+        pathname = _Service._Service__build_cache(url, self.cache_store)
+        key = os.path.basename(pathname)
+        self.assertEqual(os.path.dirname(pathname), os.path.join(self.cache_store, key[:settings.CACHE_SHARD_WIDTH]))
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        self.assertTrue(os.path.isfile(pathname))
+        self.assertEqual([f for f in os.listdir(os.path.dirname(pathname)) if f.endswith(settings.CACHE_PART_EXT)
+                          or f.endswith(settings.CACHE_TMP_EXT)], [])
+        # entries of the flat layout are moved into their shard
+        for ext in ('', settings.CACHE_META_EXT):
+            os.replace(pathname + ext, os.path.join(self.cache_store, key + ext))
+        serv.memory_cache.clear()
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        self.assertEqual(self.requests('a.json'), 1)
+        self.assertTrue(os.path.isfile(pathname) and not os.path.exists(os.path.join(self.cache_store, key)))
+        serv.clean_cache(url, expire_after=-1)
+        self.assertFalse(os.path.exists(pathname))
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_lock(self):
+        # distinct requests for the same entry are serialised: the response is
+        # downloaded once, then read from the cache
+        urls, res = [self.url + 'a.json?delay=0.3&x=1.0000001', self.url + 'a.json?delay=0.3&x=1.0000002'], []
+        def run(url):
+            serv = _Service(cache_store=self.cache_store)
+            res.append(serv.read_url(url))
+            serv.close()
+        threads = [threading.Thread(target=run, args=(u,)) for u in urls]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual((res, self.requests('a.json')), ([{'a': 1}] * 2, 1))
+
+#/****************************************************************************/
+# _PackStoreTestCase
+#/****************************************************************************/
+class _PackStoreTestCase(_ServerTestCase):
+    """Class of tests for the pack file backend of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_pack(self):
+        self.assertRaises(happyError, _Service, cache_backend='Redis')
+        serv = _Service(cache_store=self.cache_store, cache_backend='SQLite', expire_after=1)
+        urls = [self.url + 'a.json', self.url + 'big.bin']
+        build = lambda u: _Service._Service__build_cache(u, self.cache_store)
+        self.assertEqual(serv.read_url(*urls, ofmt='bytes'), [FILES['a.json'], FILES['big.bin']])
+        # small responses are packed, large ones remain files
+        self.assertTrue(os.path.exists(os.path.join(self.cache_store, settings.CACHE_PACK_NAME)))
+        self.assertEqual([os.path.exists(build(u)) for u in urls], [False, True])
+        self.assertEqual(serv.is_cached(*urls), [True, True])
+        serv.memory_cache.clear()
+        self.assertEqual(serv.read_url(urls[0]), {'a': 1})
+        self.assertEqual(self.requests('a.json'), 1)
+        # expired packed responses are revalidated, then packed again
+        time.sleep(1.1)
+        serv.memory_cache.clear()
+        self.assertEqual(serv.read_url(urls[0]), {'a': 1})
+        self.assertEqual((self.requests('a.json'), serv.stats(process=False)['revalidations']), (2, 1))
+        self.assertFalse(os.path.exists(build(urls[0])))
+        serv.clean_cache(urls[0], expire_after=-1)
+        self.assertFalse(serv.is_cached(urls[0]))
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_path(self):
+        serv = _Service(cache_store=self.cache_store, cache_backend='SQLite')
+        urls = [self.url + 'a.json', self.url + 'b.json']
+        build = lambda u: _Service._Service__build_cache(u, self.cache_store)
+        # the path of a response read from the pack, or from memory, exists
+        serv.read_url(urls[0])
+        self.assertFalse(os.path.exists(build(urls[0])))
+        for _ in range(2):
+            resp = serv.get_response(urls[0])
+            self.assertTrue(os.path.exists(resp._cache_path))
+            self.assertEqual(open(resp._cache_path, 'rb').read(), FILES['a.json'])
+        serv.memory_cache.clear()
+        self.assertTrue(os.path.exists(serv.get_response(urls[0])._cache_path))
+        # so is the path of a response downloaded, which is not packed
+        resp = serv.get_response(urls[1])
+        self.assertTrue(os.path.exists(resp._cache_path))
+        self.assertEqual(resp.json(), {'a': 1})
+        self.assertEqual(self.requests(), 2)
+        serv.close()
+
+#/****************************************************************************/
+# _LazyResponseTestCase
+#/****************************************************************************/
+class _LazyResponseTestCase(_ServerTestCase):
+    """Class of tests for the cached responses loaded lazily by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_lazy(self):
+        serv = _Service(cache_store=self.cache_store)
+        for _ in range(2): # downloaded, then cached
+            resp = serv.get_response(self.url + 'big.bin')
+            self.assertIs(resp._content, False) # body not read yet
+            self.assertEqual(resp.headers['Content-Length'], str(len(FILES['big.bin'])))
+            self.assertEqual(resp._cache_path, _Service._Service__build_cache(self.url + 'big.bin', self.cache_store))
+            self.assertEqual(resp.content, FILES['big.bin'])
+        # small responses are read right away, so as to be kept in memory
+        resp = serv.get_response(self.url + 'a.json')
+        self.assertEqual((resp._content, resp.json()), (FILES['a.json'], {'a': 1}))
+        self.assertEqual(self.requests(), 2)
+        serv.close()
+
+#/****************************************************************************/
+# _StaleTestCase
+#/****************************************************************************/
+class _StaleTestCase(_ServerTestCase):
+    """Class of tests for the stale-while-revalidate mode of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_stale(self):
+        self.assertRaises(happyError, _Service, stale_while_revalidate=-1)
+        serv = _Service(cache_store=self.cache_store, expire_after=1, stale_while_revalidate=1)
+        url = self.url + 'a.json?delay=0.5'
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        time.sleep(1.1)
+        # the stale response is returned at once, and refreshed in background
+        start = time.time()
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        self.assertTrue(time.time() - start < 0.4)
+        time.sleep(0.8)
+        self.assertEqual(self.requests('a.json'), 2)
+        self.assertTrue(serv.is_cached(url))
+        # responses stale for too long are downloaded again before being returned
+        time.sleep(2.1)
+        start = time.time()
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        self.assertTrue(time.time() - start >= 0.5)
+        self.assertEqual(self.requests('a.json'), 3)
+        serv.close()
+
+    #/************************************************************************/
+    @unittest.skipUnless(AIOHTTP_INSTALLED, 'aiohttp not installed')
+    def test_2_asynchronous(self):
+        serv = _Service(cache_store=self.cache_store, asynchronous=True, 
+                        expire_after=1, stale_while_revalidate=1)
+        url = self.url + 'a.json?delay=0.5'
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        time.sleep(1.1)
+        # the stale response is also refreshed in background in asynchronous mode
+        start = time.time()
+        self.assertEqual(serv.read_url(url), {'a': 1})
+        self.assertTrue(time.time() - start < 0.4)
+        time.sleep(0.8)
+        self.assertEqual(self.requests('a.json'), 2)
+        self.assertTrue(serv.is_cached(url))
+        serv.close()
+
+#/****************************************************************************/
+# _NegativeTestCase
+#/****************************************************************************/
+class _NegativeTestCase(_ServerTestCase):
+    """Class of tests for the negative responses cached by :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_errors(self):
+        self.assertRaises(happyError, _Service, expire_negative=-1)
+        serv = _Service(cache_store=self.cache_store, expire_negative=1)
+        url = self.url + 'none.json'
+        for _ in range(2):
+            self.assertRaises(happyError, serv.read_url, url)
+        self.assertEqual(self.requests('none.json'), 1) # error cached
+        time.sleep(1.1)
+        self.assertRaises(happyError, serv.read_url, url)
+        self.assertEqual(self.requests('none.json'), 2) # ... for a shorter time
+        serv.close()
+        # errors are not cached when no lifetime is set
+        serv = _Service(cache_store=self.cache_store, expire_negative=None)
+        for _ in range(2):
+            self.assertRaises(happyError, serv.read_url, self.url + 'missing.json')
+        self.assertEqual(self.requests('missing.json'), 2)
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_empty(self):
+        # empty lists of results are negative responses, not kept in memory
+        serv = _Service(cache_store=self.cache_store, expire_negative=1)
+        url = self.url + 'empty.json'
+        pathname = _Service._Service__build_cache(url, self.cache_store)
+        for _ in range(2):
+            self.assertEqual(serv.read_url(url), {'results': []})
+        self.assertEqual(self.requests('empty.json'), 1)
+        self.assertEqual(_Service._Service__read_negative(pathname), 200)
+        self.assertFalse(pathname in serv.memory_cache)
+        time.sleep(1.1)
+        self.assertEqual(serv.read_url(url), {'results': []})
+        self.assertEqual(self.requests('empty.json'), 2)
+        serv.close()
+
+#/****************************************************************************/
+# _BundleTestCase
+#/****************************************************************************/
+class _BundleTestCase(_ServerTestCase):
+    """Class of tests for the export and import of the cache of :class:`_Service`
+    """    
+
+    #/************************************************************************/
+    def test_1_roundtrip(self):
+        urls = [self.url + 'a.json', self.url + 'big.bin']
+        archive = os.path.join(self.cache_store, 'bundle.tar.gz')
+        source = os.path.join(self.cache_store, 'source')
+        serv = _Service(cache_store=source, cache_backend='SQLite')
+        serv.read_url(*urls, ofmt='bytes')
+        manifest = serv.export_cache(archive)
+        self.assertEqual(sorted([e['url'] for e in manifest['entries'].values()]), urls)
+        serv.close()
+        # the responses imported are served with their validators and their 
+        # time of download, without any request
+        target = os.path.join(self.cache_store, 'target')
+        serv = _Service(cache_store=target, expire_after=60)
+        self.assertEqual(serv.import_cache(archive), {'imported': 2, 'skipped': 0})
+        self.assertEqual(serv.import_cache(archive), {'imported': 0, 'skipped': 2})
+        serv.memory_cache.clear()
+        self.assertEqual(serv.read_url(*urls, ofmt='bytes'), [FILES['a.json'], FILES['big.bin']])
+        self.assertEqual(self.requests(), 2)
+        pathname = _Service._Service__build_cache(urls[1], target)
+        entry = manifest['entries'][os.path.basename(pathname)]
+        self.assertAlmostEqual(os.path.getmtime(pathname), entry['mtime'], places=3)
+        self.assertEqual(_Service._Service__read_meta(pathname)['ETag'], entry['meta']['ETag'])
+        # archives are validated before anything is imported
+        with open(archive, 'wb') as f:
+            f.write(b'not an archive')
+        self.assertRaises(happyError, serv.import_cache, archive)
+        serv.close()
+
+#/****************************************************************************/
+# _WarmCacheTestCase
+#/****************************************************************************/
+class _WarmCacheTestCase(_ServerTestCase):
+    """Class of tests for the warm-up of the cache with |GISCO| datasets, through
+    :meth:`GISCOService.warm_cache` and the command :literal:`bin/warm_cache.py`
+    """    
+    # the datasets of 2013 are served, those of 2016 are not
+    DATASETS = ['nuts/geojson/NUTS_RG_60M_2013_4326_LEVL_0.geojson',
+                'nuts/geojson/NUTS_RG_60M_2013_4326_LEVL_1.geojson',
+                'countries/countries-2013-units.json']
+
+    def setUp(self):
+        super(_WarmCacheTestCase, self).setUp()
+        # the URLs of the datasets are built against the local server
+        self.domain = settings.PROTOCOL, settings.GISCO_CACHEURL
+        settings.PROTOCOL, settings.GISCO_CACHEURL = 'http', self.url.split('://')[1].rstrip('/')
+        FILES.update({d: b'{"type": "FeatureCollection", "features": [0]}' for d in self.DATASETS})
+
+    def tearDown(self):
+        [FILES.pop(d) for d in self.DATASETS]
+        settings.PROTOCOL, settings.GISCO_CACHEURL = self.domain
+        super(_WarmCacheTestCase, self).tearDown()
+
+    #/************************************************************************/
+    def test_1_warm_cache(self):
+        for asynchronous in (False, AIOHTTP_INSTALLED):
+            serv = GISCOService(cache_store=self.cache_store, asynchronous=asynchronous)
+            # the cartesian product of the dimensions is prefetched
+            report = serv.warm_cache('nuts', year=[2013, 2016], level=[0, 1], _force_download_=True)
+            self.assertEqual(sorted(report['fetched']), [self.url + d for d in self.DATASETS[:2]])
+            self.assertEqual(len(report['failed']), 2)
+            self.assertTrue(all(['_2016_' in u for u in report['failed']]))
+            self.assertEqual(report['bytes'], 2 * len(FILES[self.DATASETS[0]]))
+            serv.close()
+        # both types of datasets are prefetched by default
+        serv = GISCOService(cache_store=self.cache_store)
+        report = serv.warm_cache(year=2013)
+        self.assertEqual(report['cached'], [self.url + self.DATASETS[0]])
+        self.assertEqual(report['fetched'], [self.url + self.DATASETS[2]])
+        self.assertRaises(happyError, serv.warm_cache, 'regions')
+        serv.close()
+        # no download starts once the budget is reached
+        serv = GISCOService(cache_store=self.cache_store, max_workers=1)
+        report = serv.warm_cache('nuts', year=2013, level=[0, 1], budget=1, _force_download_=True)
+        self.assertEqual((len(report['fetched']), len(report['skipped'])), (1, 1))
+        serv.close()
+
+    #/************************************************************************/
+    def test_2_command(self):
+        spec = importlib.util.spec_from_file_location('warm_cache', 
+                   os.path.join(os.path.dirname(__file__), os.pardir, 'bin', 'warm_cache.py'))
+        command = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(command)
+        self.assertEqual((command.parse_size('2K'), command.parse_size('1.5MB'), command.parse_size('10')), 
+                         (2048, 3 * 2**19, 10))
+        def main(*argv):
+            out, err = io.StringIO(), io.StringIO()
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                status = command.main(list(argv) + ['--cache', self.cache_store])
+            return status, out.getvalue(), err.getvalue()
+        # all datasets cached: success
+        status, out, _ = main('nuts', '--year', '2013', '--level', '0', '1')
+        self.assertEqual(status, 0)
+        self.assertIn('2 fetched', out)
+        # some datasets missing: the failed URLs are reported
+        status, out, err = main('--year', '2013', '2016')
+        self.assertEqual(status, 2)
+        self.assertIn('1 fetched', out)
+        self.assertIn('1 already cached', out)
+        self.assertIn('_2016_', err)
+        # the budget is passed with a unit
+        status, out, _ = main('nuts', '--year', '2013', '--level', '0', '1', '--force', 
+                              '--workers', '1', '--budget', '1B')
+        self.assertEqual(status, 0)
+        self.assertIn('1 skipped', out)
+        # wrong types of datasets are rejected
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertRaises(SystemExit, command.main, ['regions'])
+
+#/****************************************************************************/
+# _CoroutineTestCase
+#/****************************************************************************/
+@unittest.skipUnless(AIOHTTP_INSTALLED, 'aiohttp not installed')
+class _CoroutineTestCase(_ServerTestCase):
+    """Class of tests for the native coroutines of the geocoding services, run
+    against their synchronous counterparts
+    """    
+    # responses of the geocoding, NUTS finding and routing services
+    RESPONSES = {'search':              [{'lat': '48.8566', 'lon': '2.3515', 'display_name': 'Paris, France'}],
+                 'api':                 {'type': 'FeatureCollection', 
+                                         'features': [{'type': 'Feature', 
+                                                       'geometry': {'type': 'Point', 'coordinates': [2.3515, 48.8566]}, 
+                                                       'properties': {'osm_key': 'place', 'name': 'Paris', 
+                                                                      'city': 'Paris', 'country': 'France'}}]},
+                 'nuts/find-nuts.py':   {'results': [{'layerId': l, 'layerName': 'NUTS_%s' % l, 'value': 'FR101'[:l+2],
+                                                      'attributes': {'NUTS_ID': 'FR101'[:l+2], 'LEVL_CODE': str(l), 
+                                                                     'CNTR_CODE': 'FR', 'NUTS_NAME': 'Paris'}}
+                                                     for l in range(4)]},
+                 'route/v1/driving/48.8566,2.3515;52.517,13.3888':
+                                        {'code': 'Ok', 
+                                         'routes': [{'distance': 1054000.0, 'duration': 36000.0, 'geometry': 'abc'}],
+                                         'waypoints': [{'name': 'Paris', 'location': [2.3515, 48.8566]},
+                                                       {'name': 'Berlin', 'location': [13.3888, 52.517]}]}}
+
+    def setUp(self):
+        super(_CoroutineTestCase, self).setUp()
+        self.protocol, settings.PROTOCOL = settings.PROTOCOL, 'http'
+        FILES.update({k: json.dumps(v).encode() for (k, v) in self.RESPONSES.items()})
+        host = self.url.split('://')[1].rstrip('/')
+        self.osm = OSMService(cache_store=self.cache_store, domain=host)
+        self.gisco = GISCOService(cache_store=self.cache_store, rest_url=host)
+
+    def tearDown(self):
+        self.osm.close()
+        self.gisco.close()
+        [FILES.pop(k) for k in self.RESPONSES]
+        settings.PROTOCOL = self.protocol
+        super(_CoroutineTestCase, self).tearDown()
+
+    def arun(self, serv, coro):
+        # run a coroutine of a service, then close the session of the loop
+        async def run():
+            try:
+                return await coro
+            finally:
+                await serv.aclose()
+        return asyncio.run(run())
+
+    #/************************************************************************/
+    def test_1_place2coord(self):
+        for serv in (self.osm, self.gisco):
+            coord = serv.place2coord('Paris, France')
+            self.assertEqual(coord, [48.8566, 2.3515])
+            self.assertEqual(self.arun(serv, serv.aplace2coord('Paris, France')), coord)
+            self.assertEqual(self.arun(serv, serv.aplace2coord(place='Paris, France', order='Ll')), 
+                             serv.place2coord(place='Paris, France', order='Ll'))
+        self.assertEqual(self.arun(self.gisco, self.gisco._aplace2geom(['Paris, France'])), 
+                         list(self.gisco._place2geom(['Paris, France'])))
+
+    #/************************************************************************/
+    def test_2_coord2nuts(self):
+        serv = self.gisco
+        nuts = serv.coord2nuts([48.8566, 2.3515])
+        self.assertNotIn(nuts, (None, []))
+        self.assertEqual(self.arun(serv, serv.acoord2nuts([48.8566, 2.3515])), nuts)
+        self.assertEqual(self.arun(serv, serv.acoord2nuts(lat=48.8566, lon=2.3515, level=3)), 
+                         serv.coord2nuts(lat=48.8566, lon=2.3515, level=3))
+        self.assertEqual(self.arun(serv, serv.aplace2nuts('Paris, France')), serv.place2nuts('Paris, France'))
+        self.assertEqual(self.arun(serv, serv._acoord2nuts([[48.8566, 2.3515]], key='results')), 
+                         list(serv._coord2nuts([[48.8566, 2.3515]], key='results')))
+
+    #/************************************************************************/
+    def test_3_coord2route(self):
+        serv = self.gisco
+        coord = {'lat': [48.8566, 52.517], 'Lon': [2.3515, 13.3888]}
+        route, waypoints = serv.coord2route(**coord)
+        self.assertEqual((route['distance'], len(waypoints)), (1054000.0, 2))
+        self.assertEqual(self.arun(serv, serv.acoord2route(**coord)), (route, waypoints))
+
 #==============================================================================
 # MAIN METHOD AND TESTING AREA
 #==============================================================================
 
 def runtest():
     _runtest(_DecoratorTestCase)
+    _runtest(_SchedulerTestCase)
+    _runtest(_RetryTestCase)
+    _runtest(_MemoryCacheTestCase)
+    _runtest(_CacheIndexTestCase)
+    _runtest(_StatsTestCase)
+    _runtest(_ExecutorTestCase)
+    _runtest(_AsynchronousTestCase)
+    _runtest(_MappedFileTestCase)
+    _runtest(_PrefetchTestCase)
+    _runtest(_ExpiryTestCase)
+    _runtest(_RemoteZipTestCase)
+    _runtest(_CacheKeyTestCase)
+    _runtest(_ObjectStoreTestCase)
+    _runtest(_DecodedTestCase)
+    _runtest(_ReadTestCase)
+    _runtest(_RevalidationTestCase)
+    _runtest(_ResumeTestCase)
+    _runtest(_CoalescingTestCase)
+    _runtest(_ShardingTestCase)
+    _runtest(_PackStoreTestCase)
+    _runtest(_LazyResponseTestCase)
+    _runtest(_StaleTestCase)
+    _runtest(_NegativeTestCase)
+    _runtest(_BundleTestCase)
+    _runtest(_WarmCacheTestCase)
+    _runtest(_CoroutineTestCase)
     return
     
 if __name__ == '__main__':